@@ -0,0 +1,66 @@
+"""Backfill the `feed` attribute that the date-sorted GSIs are partitioned on.
+
+/api/jobs and /api/saved-jobs read from sparse GSIs, so rows written before
+the feeds existed are invisible until they carry `feed`. Run once per table
+after creating the indexes (safe to re-run):
+
+    python backfill_feed.py            # both tables
+    python backfill_feed.py --dry-run  # only count what would change
+"""
+import sys
+from typing import Any, Dict
+
+from botocore.exceptions import ClientError
+
+from main import JOBS_FEED, SAVED_JOBS_FEED, jobs_table, saved_jobs_table
+
+# (table, feed value, GSI sort key) for every paged list
+FEEDS = [
+    (jobs_table, JOBS_FEED, 'date'),
+    (saved_jobs_table, SAVED_JOBS_FEED, 'saved_date'),
+]
+
+
+def backfill_feed(table, feed: str, sort_key: str, dry_run: bool = False) -> Dict[str, Any]:
+    """Set feed on every item of table that lacks it; returns counts per outcome"""
+    counts = {'table': table.name, 'scanned': 0, 'updated': 0, 'already_set': 0, 'gone': 0, 'missing_sort_key': 0}
+    scan_kwargs = {
+        'ProjectionExpression': '#job_id, #feed, #sort_key',
+        'ExpressionAttributeNames': {'#job_id': 'job_id', '#feed': 'feed', '#sort_key': sort_key}
+    }
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            counts['scanned'] += 1
+            if item.get('feed') == feed:
+                counts['already_set'] += 1
+                continue
+            if not item.get(sort_key):
+                # Still left out of the index; nothing to sort it by
+                counts['missing_sort_key'] += 1
+            if dry_run:
+                counts['updated'] += 1
+                continue
+            try:
+                # Conditional, so a job saved or deleted since the scan is not recreated
+                table.update_item(
+                    Key={'job_id': item['job_id']},
+                    UpdateExpression='SET #feed = :feed',
+                    ConditionExpression='attribute_exists(job_id)',
+                    ExpressionAttributeNames={'#feed': 'feed'},
+                    ExpressionAttributeValues={':feed': feed}
+                )
+                counts['updated'] += 1
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+                counts['gone'] += 1
+        if 'LastEvaluatedKey' not in response:
+            return counts
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+if __name__ == "__main__":
+    dry_run = '--dry-run' in sys.argv[1:]
+    for table, feed, sort_key in FEEDS:
+        print(backfill_feed(table, feed, sort_key, dry_run=dry_run))
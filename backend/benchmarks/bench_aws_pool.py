@@ -0,0 +1,64 @@
+"""Request throughput vs concurrency for blocking boto3 calls, inline vs run_aws.
+
+A fake table sleeps for AWS_LATENCY_MS per call, standing in for a DynamoDB
+round trip. Inline calls (what the handlers did before run_aws) serialize on
+the event loop; run_aws overlaps them up to the size of the I/O pool.
+
+    python backend/benchmarks/bench_aws_pool.py
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import common  # noqa: F401  (sets up the import path and fake credentials)
+import main
+
+AWS_LATENCY_MS = float(os.getenv('AWS_LATENCY_MS', '20'))
+CALLS = int(os.getenv('BENCH_CALLS', '256'))
+CONCURRENCY = (1, 4, 16, 32, 64)
+POOL_SIZES = (4, main.AWS_IO_WORKERS)
+
+
+class SlowTable:
+    def get_item(self, Key):
+        time.sleep(AWS_LATENCY_MS / 1000)
+        return {'Item': {'job_id': Key['job_id']}}
+
+
+async def run_clients(call, concurrency):
+    """concurrency clients issue CALLS requests between them; returns requests/second"""
+    remaining = iter(range(CALLS))
+
+    async def client():
+        for i in remaining:
+            await call(f'job-{i}')
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return CALLS / (time.perf_counter() - start)
+
+
+async def main_bench():
+    table = SlowTable()
+
+    async def inline(job_id):
+        return table.get_item(Key={'job_id': job_id})
+
+    async def pooled(job_id):
+        return await main.run_aws(table.get_item, Key={'job_id': job_id})
+
+    print(f"{CALLS} calls at {AWS_LATENCY_MS:.0f} ms each, requests/second")
+    header = f"{'concurrency':>12} {'inline':>10}" + ''.join(f" {f'pool={n}':>10}" for n in POOL_SIZES)
+    print(header)
+    for concurrency in CONCURRENCY:
+        row = f"{concurrency:>12} {await run_clients(inline, concurrency):>10.0f}"
+        for size in POOL_SIZES:
+            main.aws_executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix='aws-io')
+            row += f" {await run_clients(pooled, concurrency):>10.0f}"
+            main.aws_executor.shutdown(wait=True)
+        print(row)
+
+
+if __name__ == "__main__":
+    asyncio.run(main_bench())
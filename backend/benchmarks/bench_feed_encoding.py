@@ -0,0 +1,82 @@
+"""Cost of turning a page of DynamoDB items into a response body, at 1k/10k/100k items.
+
+- response_model (before): raw items validated through the route's List[Job]
+  response_model and encoded by JSONResponse, plus the old ETag, which
+  dumped the page a second time with default=str
+- response_model (normalized): normalize_job + ETag, then the same pydantic
+  path; what FAST_JSON_RESPONSES=false serves
+- pre-encoded, stdlib json / orjson: normalize_job + dumps_json + ETag, the
+  default path; the body is cached with the page and returned as is
+
+    python backend/benchmarks/bench_feed_encoding.py
+"""
+import asyncio
+import hashlib
+import json
+import os
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+import common
+import main
+
+SIZES = [int(n) for n in os.getenv('BENCH_SIZES', '1000,10000,100000').split(',')]
+JOBS_ROUTE = next(route for route in main.app.routes if getattr(route, 'path', None) == '/api/jobs')
+
+
+def old_page_etag(jobs, next_cursor):
+    content = json.dumps([jobs, next_cursor], default=str, sort_keys=True, separators=(',', ':'))
+    return f'"{hashlib.sha1(content.encode("utf-8")).hexdigest()}"'
+
+
+def through_response_model(jobs):
+    content = asyncio.run(serialize_response(field=JOBS_ROUTE.response_field, response_content=jobs))
+    return JSONResponse(content).body
+
+
+def response_model_before(items):
+    old_page_etag(items, None)
+    return through_response_model(items)
+
+
+def response_model_normalized(items):
+    jobs = [main.normalize_job(item) for item in items]
+    main.page_etag(json.dumps(jobs, separators=(',', ':')).encode('utf-8'), None)
+    return through_response_model(jobs)
+
+
+def pre_encoded(items):
+    jobs = [main.normalize_job(item) for item in items]
+    body = main.dumps_json(jobs)
+    main.page_etag(body, None)
+    return body
+
+
+def pre_encoded_stdlib(items):
+    orjson, main.orjson = main.orjson, None
+    try:
+        return pre_encoded(items)
+    finally:
+        main.orjson = orjson
+
+
+PATHS = {
+    'response_model (before)': response_model_before,
+    'response_model (normalized)': response_model_normalized,
+    'pre-encoded, stdlib json': pre_encoded_stdlib,
+    'pre-encoded, orjson': pre_encoded,
+}
+
+
+if __name__ == "__main__":
+    if main.orjson is None:
+        del PATHS['pre-encoded, orjson']
+    print(f"{'path':<30}" + ''.join(f"{f'{n} items':>14}" for n in SIZES))
+    data = {n: common.make_items(n) for n in SIZES}
+    for name, path in PATHS.items():
+        row = f"{name:<30}"
+        for n in SIZES:
+            seconds = common.best_of(lambda: path(data[n]), repeat=3 if n < 100000 else 1)
+            row += f"{seconds * 1000:>11.1f} ms"
+        print(row)
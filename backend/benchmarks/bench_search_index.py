@@ -0,0 +1,84 @@
+"""JobSearchIndex build and query latency at 100k jobs, and search latency during a rebuild.
+
+The jobs table is an in-memory stand-in that returns scan pages of 1,000
+items after SCAN_PAGE_LATENCY_MS, roughly one DynamoDB 1 MB page.
+
+    python backend/benchmarks/bench_search_index.py
+    BENCH_JOBS=10000 python backend/benchmarks/bench_search_index.py
+"""
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+import common
+import main
+from job_search import JobSearchIndex
+
+JOBS = int(os.getenv('BENCH_JOBS', '100000'))
+SCAN_PAGE_SIZE = 1000
+SCAN_PAGE_LATENCY_MS = float(os.getenv('SCAN_PAGE_LATENCY_MS', '20'))
+
+QUERIES = {
+    'unfiltered': {},
+    'text': {'text': 'python'},
+    'text + place': {'text': 'engineer', 'places': ['Remote']},
+    'company + match range': {'companies': ['Company 7'], 'min_match': 50},
+    'date range, sort by match': {'date_from': '2024-03-01', 'date_to': '2024-06-30', 'sort': 'match'},
+}
+
+
+class ScanTable:
+    def __init__(self, items):
+        self.items = items
+
+    def scan(self, ExclusiveStartKey=None):
+        time.sleep(SCAN_PAGE_LATENCY_MS / 1000)
+        start = ExclusiveStartKey['offset'] if ExclusiveStartKey else 0
+        response = {'Items': self.items[start:start + SCAN_PAGE_SIZE]}
+        if start + SCAN_PAGE_SIZE < len(self.items):
+            response['LastEvaluatedKey'] = {'offset': start + SCAN_PAGE_SIZE}
+        return response
+
+
+def bench_index(items):
+    jobs = [main.normalize_job(item) for item in items]
+    build = common.best_of(lambda: JobSearchIndex(jobs), repeat=1)
+    index = JobSearchIndex(jobs)
+    print(f"build from {len(jobs)} normalized jobs: {build * 1000:.0f} ms")
+    for name, query in QUERIES.items():
+        seconds = common.best_of(lambda: index.search(**query), repeat=10)
+        print(f"  {name:<28} {seconds * 1000:7.1f} ms")
+
+
+async def bench_rebuild(items):
+    """Search latency while the stale index is rebuilt in the background"""
+    main.jobs_table = ScanTable(items)
+    async with httpx.AsyncClient(app=main.app, base_url='http://bench') as client:
+        start = time.perf_counter()
+        await client.get('/api/jobs/search', params={'q': 'python'})
+        print(f"first search (waits for the initial build): {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        main.search_index_built_at = 0.0  # expire the index
+        latencies = []
+        rebuild_started = time.perf_counter()
+        while True:
+            start = time.perf_counter()
+            response = await client.get('/api/jobs/search', params={'q': 'python', 'place': 'Remote'})
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200
+            if main.search_index_refresh is not None and main.search_index_refresh.done():
+                break
+            await asyncio.sleep(0.01)
+        rebuild = time.perf_counter() - rebuild_started
+    latencies.sort()
+    print(f"searches during a {rebuild * 1000:.0f} ms background rebuild: {len(latencies)}, "
+          f"p50 {statistics.median(latencies) * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    rows = common.make_items(JOBS)
+    bench_index(rows)
+    asyncio.run(bench_rebuild(rows))
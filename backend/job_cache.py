@@ -0,0 +1,168 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+COUNTER_SWEEP_EVERY = 1000  # increments between sweeps of expired counters
+
+
+class LocalCacheBackend:
+    """In-process LRU store with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # Counters live outside the LRU so generations are never evicted;
+        # ones given a TTL are swept once expired
+        self._counters: Dict[str, tuple] = {}
+        self._incrs = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _live_counter(self, key: str, now: float) -> int:
+        expires_at, value = self._counters.get(key, (None, 0))
+        return 0 if expires_at is not None and expires_at <= now else value
+
+    def get_counter(self, key: str) -> int:
+        with self._lock:
+            return self._live_counter(key, time.monotonic())
+
+    def incr(self, key: str, ttl: Optional[float] = None) -> int:
+        now = time.monotonic()
+        with self._lock:
+            value = self._live_counter(key, now) + 1
+            self._counters[key] = (now + ttl if ttl else None, value)
+            self._incrs += 1
+            if self._incrs % COUNTER_SWEEP_EVERY == 0:
+                expired = [k for k, (expires_at, _) in self._counters.items()
+                           if expires_at is not None and expires_at <= now]
+                for k in expired:
+                    del self._counters[k]
+            return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Shared store so every uvicorn worker sees the same entries and invalidations"""
+
+    def __init__(self, url: str, prefix: str = 'matchmemaybe:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("JOB_CACHE_REDIS_URL is set but the redis package is not installed")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        # Millisecond expiry, so a sub-second TTL doesn't round down to an invalid 0
+        self.client.set(self.prefix + key, pickle.dumps(value), px=int(ttl * 1000) if ttl else None)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def get_counter(self, key: str) -> int:
+        return int(self.client.get(self.prefix + key) or 0)
+
+    def incr(self, key: str, ttl: Optional[float] = None) -> int:
+        if not ttl:
+            return int(self.client.incr(self.prefix + key))
+        pipe = self.client.pipeline()
+        pipe.incr(self.prefix + key)
+        pipe.pexpire(self.prefix + key, int(ttl * 1000))
+        return int(pipe.execute()[0])
+
+
+class JobCache:
+    """Read-through cache for single jobs and job list pages.
+
+    List pages are keyed on a per-feed generation counter, so any write to a
+    feed invalidates all of its cached pages with a single increment. Jobs are
+    keyed on a per-job version the same way. Callers read the generation or
+    version before loading from DynamoDB and store under it, so a write that
+    lands during the load leaves the stale result under a key nobody reads.
+
+    Job versions expire after twice the entry TTL, so there is one counter per
+    recently changed job rather than per job ever changed. By the time a
+    version resets to 0, every entry stored under an older version has expired.
+    """
+
+    def __init__(self, backend, ttl: float = 30):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def _record(self, value: Optional[Any]) -> Optional[Any]:
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def generation(self, feed: str) -> int:
+        return self.backend.get_counter(f"gen:{feed}")
+
+    def job_version(self, job_id: str) -> int:
+        return self.backend.get_counter(f"ver:{job_id}")
+
+    def get_job(self, job_id: str, version: int) -> Optional[Dict[str, Any]]:
+        return self._record(self.backend.get(f"job:{job_id}:{version}"))
+
+    def set_job(self, job_id: str, version: int, job: Dict[str, Any]) -> None:
+        self.backend.set(f"job:{job_id}:{version}", job, self.ttl)
+
+    def invalidate_job(self, job_id: str) -> None:
+        version = self.backend.incr(f"ver:{job_id}", ttl=self.ttl * 2 if self.ttl else None)
+        self.backend.delete(f"job:{job_id}:{version - 1}")
+
+    def get_page(self, feed: str, generation: int, limit: int, cursor: Optional[str]) -> Optional[tuple]:
+        return self._record(self.backend.get(f"page:{feed}:{generation}:{limit}:{cursor or ''}"))
+
+    def set_page(self, feed: str, generation: int, limit: int, cursor: Optional[str], page: tuple) -> None:
+        self.backend.set(f"page:{feed}:{generation}:{limit}:{cursor or ''}", page, self.ttl)
+
+    def invalidate_feed(self, feed: str) -> None:
+        self.backend.incr(f"gen:{feed}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,161 @@
+import bisect
+import re
+from itertools import islice
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+BARE_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+MATCH_BUCKETS = [(0, 20), (20, 40), (40, 60), (60, 80), (80, 101)]
+MAX_FACET_VALUES = 20
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def normalize_facet(value: Optional[str]) -> str:
+    return (value or '').strip().lower()
+
+
+def end_of_day(date_to: Optional[str]) -> Optional[str]:
+    """Widen a bare YYYY-MM-DD upper bound to cover every timestamp on that day"""
+    if date_to and BARE_DATE_PATTERN.fullmatch(date_to):
+        # Sorts after any "T..." or " ..." time suffix stored on the same date
+        return date_to + '\uffff'
+    return date_to
+
+
+def match_bucket(score: float) -> str:
+    for low, high in MATCH_BUCKETS:
+        if low <= score < high:
+            return f"{low}-{min(high, 100)}"
+    return f"{MATCH_BUCKETS[-1][0]}-100"
+
+
+class JobSearchIndex:
+    """In-process inverted index over the jobs table.
+
+    Free text, place and company filters are answered from posting sets;
+    match_percentage and date ranges use sorted columns and bisect. Results
+    are ordered by date, match_percentage or vector_match_percentage
+    (similarity).
+    """
+
+    def __init__(self, jobs: Iterable[Dict[str, Any]]):
+        self.jobs: List[Dict[str, Any]] = []
+        self.doc_ids: Dict[str, int] = {}
+        self.alive: Set[int] = set()
+        self.terms: Dict[str, Set[int]] = defaultdict(set)
+        self.places: Dict[str, Set[int]] = defaultdict(set)
+        self.companies: Dict[str, Set[int]] = defaultdict(set)
+        self.match_scores: List[float] = []
+        self.similarity_scores: List[float] = []
+        self.dates: List[str] = []
+        # Facet labels per doc, so counting is a single Counter pass
+        self.place_labels: List[str] = []
+        self.company_labels: List[str] = []
+        self.bucket_labels: List[str] = []
+
+        for job in jobs:
+            doc = len(self.jobs)
+            self.jobs.append(job)
+            self.doc_ids[job['job_id']] = doc
+            self.alive.add(doc)
+            for token in set(tokenize(f"{job.get('title', '')} {job.get('description', '')}")):
+                self.terms[token].add(doc)
+            self.places[normalize_facet(job.get('place'))].add(doc)
+            self.companies[normalize_facet(job.get('company'))].add(doc)
+            self.match_scores.append(float(job.get('match_percentage') or 0))
+            self.similarity_scores.append(float(job.get('vector_match_percentage') or 0))
+            self.dates.append(job.get('date', ''))
+            self.place_labels.append(job.get('place') or 'UNKNOWN')
+            self.company_labels.append(job.get('company') or 'UNKNOWN')
+            self.bucket_labels.append(match_bucket(self.match_scores[-1]))
+
+        self._match_order = sorted(range(len(self.jobs)), key=self.match_scores.__getitem__)
+        self._match_sorted = [self.match_scores[doc] for doc in self._match_order]
+        self._date_order = sorted(range(len(self.jobs)), key=self.dates.__getitem__)
+        self._date_sorted = [self.dates[doc] for doc in self._date_order]
+        self._similarity_order = sorted(range(len(self.jobs)), key=self.similarity_scores.__getitem__)
+        # Ranking column and its presorted order per sort option
+        self._sort_columns = {
+            'date': (self.dates, self._date_order),
+            'match': (self.match_scores, self._match_order),
+            'similarity': (self.similarity_scores, self._similarity_order),
+        }
+
+    def __len__(self) -> int:
+        return len(self.alive)
+
+    def discard(self, job_id: str) -> None:
+        """Drop a job that was saved or deleted since the index was built"""
+        doc = self.doc_ids.get(job_id)
+        if doc is not None:
+            self.alive.discard(doc)
+
+    def _range(self, order: List[int], sorted_values: List[Any], low: Any, high: Any) -> Set[int]:
+        start = 0 if low is None else bisect.bisect_left(sorted_values, low)
+        end = len(sorted_values) if high is None else bisect.bisect_right(sorted_values, high)
+        return set(order[start:end])
+
+    def search(
+        self,
+        text: Optional[str] = None,
+        places: Optional[List[str]] = None,
+        companies: Optional[List[str]] = None,
+        min_match: Optional[float] = None,
+        max_match: Optional[float] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        sort: str = 'date',
+        limit: int = 50,
+        offset: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int, Dict[str, Any]]:
+        """Return one page of matching jobs, the total match count and facet counts"""
+        date_to = end_of_day(date_to)
+        postings: List[Set[int]] = []
+        for token in set(tokenize(text or '')):
+            postings.append(self.terms.get(token, set()))
+        if places:
+            postings.append(set().union(*(self.places.get(normalize_facet(p), set()) for p in places)))
+        if companies:
+            postings.append(set().union(*(self.companies.get(normalize_facet(c), set()) for c in companies)))
+
+        if postings:
+            postings.sort(key=len)
+            candidates = postings[0].intersection(*postings[1:])
+            if min_match is not None or max_match is not None:
+                candidates = {doc for doc in candidates
+                              if (min_match is None or self.match_scores[doc] >= min_match)
+                              and (max_match is None or self.match_scores[doc] <= max_match)}
+            if date_from or date_to:
+                candidates = {doc for doc in candidates
+                              if (not date_from or self.dates[doc] >= date_from)
+                              and (not date_to or self.dates[doc] <= date_to)}
+        else:
+            candidates = self.alive
+            if min_match is not None or max_match is not None:
+                candidates = candidates & self._range(self._match_order, self._match_sorted, min_match, max_match)
+            if date_from or date_to:
+                candidates = candidates & self._range(self._date_order, self._date_sorted, date_from or None, date_to or None)
+        candidates = candidates & self.alive
+
+        values, order = self._sort_columns.get(sort, self._sort_columns['date'])
+        if len(candidates) * 8 < len(order):
+            ranked = iter(sorted(candidates, key=values.__getitem__, reverse=True))
+        else:
+            # Large result sets walk the presorted column instead of sorting
+            ranked = (doc for doc in reversed(order) if doc in candidates)
+        page = [self.jobs[doc] for doc in islice(ranked, offset, offset + limit)]
+        return page, len(candidates), self._facets(candidates)
+
+    def _facets(self, docs: Set[int]) -> Dict[str, Any]:
+        places = Counter(map(self.place_labels.__getitem__, docs))
+        companies = Counter(map(self.company_labels.__getitem__, docs))
+        buckets = Counter(map(self.bucket_labels.__getitem__, docs))
+        return {
+            "place": dict(places.most_common(MAX_FACET_VALUES)),
+            "company": dict(companies.most_common(MAX_FACET_VALUES)),
+            "match_percentage": {match_bucket(low): buckets[match_bucket(low)] for low, _ in MATCH_BUCKETS}
+        }
@@ -1,17 +1,54 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
 import os
 from dotenv import load_dotenv
 import json
+import base64
+import binascii
+import asyncio
+import functools
+import time
+import hashlib
+import zlib
+import tempfile
+import logging
+from decimal import Decimal
+from job_cache import JobCache, LocalCacheBackend, RedisCacheBackend
+from job_search import JobSearchIndex
+from metrics import MetricsMiddleware, MetricsRegistry
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    aws_executor.shutdown(wait=True)
+
+app = FastAPI(lifespan=lifespan)
+metrics = MetricsRegistry()
 
 # Configure CORS
 app.add_middleware(
@@ -20,17 +57,82 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Per-route latency, request and error counts, served at /metrics
+app.add_middleware(MetricsMiddleware, registry=metrics)
+
+# boto3 is blocking, so every AWS call runs on a bounded thread pool sized to
+# match the HTTP connection pool; the event loop never waits on DynamoDB/S3.
+AWS_MAX_POOL_CONNECTIONS = int(os.getenv('AWS_MAX_POOL_CONNECTIONS', '32'))
+AWS_IO_WORKERS = int(os.getenv('AWS_IO_WORKERS', str(AWS_MAX_POOL_CONNECTIONS)))
+aws_config = Config(
+    max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+    tcp_keepalive=True,
+    retries={'max_attempts': 3, 'mode': 'standard'}
+)
+aws_executor = ThreadPoolExecutor(max_workers=AWS_IO_WORKERS, thread_name_prefix='aws-io')
+
 # Initialize DynamoDB
-dynamodb = boto3.resource('dynamodb')
+dynamodb = boto3.resource('dynamodb', config=aws_config)
 jobs_table = dynamodb.Table('jobs')
 saved_jobs_table = dynamodb.Table('saved_jobs')
 
 # Initialize S3 client
-s3_client = boto3.client('s3')
+s3_client = boto3.client('s3', config=aws_config)
+
+# Time every DynamoDB/S3 call and record consumed capacity
+metrics.instrument_client(dynamodb.meta.client)
+metrics.instrument_client(s3_client)
 S3_BUCKET_NAME = os.getenv('S3_BUCKET_NAME', 'matchmemaybe')
 
+# Job lists are served from GSIs partitioned on a constant `feed` attribute and
+# sorted by date, so a page is a single Query instead of a full-table Scan.
+JOBS_DATE_INDEX = os.getenv('JOBS_DATE_INDEX', 'feed-date-index')
+SAVED_JOBS_DATE_INDEX = os.getenv('SAVED_JOBS_DATE_INDEX', 'feed-saved_date-index')
+JOBS_FEED = 'JOBS'
+SAVED_JOBS_FEED = 'SAVED'
+# Attributes of a LastEvaluatedKey from each feed's GSI: table key plus index keys
+FEED_KEY_FIELDS = {
+    JOBS_FEED: {'job_id', 'feed', 'date'},
+    SAVED_JOBS_FEED: {'job_id', 'feed', 'saved_date'},
+}
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+NDJSON_FLUSH_EVERY = 100  # jobs per compressed chunk in streaming mode
+
+# List responses are normalized once when a page is loaded and returned as
+# pre-encoded JSON, skipping response_model re-validation of trusted store data.
+# Set FAST_JSON_RESPONSES=false to go back through pydantic.
+FAST_JSON_RESPONSES = os.getenv('FAST_JSON_RESPONSES', 'true').lower() in ('1', 'true', 'yes')
+
+# The scrape pipeline (python/ingest_progress.py) publishes its counters to this
+# file; the status stream watches it instead of polling DynamoDB.
+INGEST_PROGRESS_PATH = os.getenv(
+    'INGEST_PROGRESS_PATH',
+    os.path.join(tempfile.gettempdir(), 'matchmemaybe_ingest_progress.json')
+)
+PROGRESS_POLL_INTERVAL = 0.5  # seconds between local file checks
+PROGRESS_HEARTBEAT_INTERVAL = 15  # seconds between SSE keep-alive comments
+STATUS_FALLBACK_INTERVAL = 5  # seconds between DynamoDB checks when no progress is published
+
+# /api/jobs/search is answered from an in-process inverted index over the jobs
+# table, rebuilt from a full scan at most once per TTL
+SEARCH_INDEX_TTL_SECONDS = float(os.getenv('SEARCH_INDEX_TTL_SECONDS', '60'))
+
+# Read-through cache for job lookups and list pages. Set JOB_CACHE_REDIS_URL to
+# share entries and invalidations across uvicorn workers.
+JOB_CACHE_TTL_SECONDS = float(os.getenv('JOB_CACHE_TTL_SECONDS', '30'))
+JOB_CACHE_MAX_ENTRIES = int(os.getenv('JOB_CACHE_MAX_ENTRIES', '1024'))
+JOB_CACHE_REDIS_URL = os.getenv('JOB_CACHE_REDIS_URL')
+job_cache = JobCache(
+    RedisCacheBackend(JOB_CACHE_REDIS_URL) if JOB_CACHE_REDIS_URL
+    else LocalCacheBackend(max_entries=JOB_CACHE_MAX_ENTRIES),
+    ttl=JOB_CACHE_TTL_SECONDS
+)
+
 class Job(BaseModel):
     job_id: str
     title: str
@@ -44,96 +146,589 @@ class Job(BaseModel):
     key_requirements: Optional[List[str]] = None
     key_descriptions: Optional[List[str]] = None
     match_percentage: Optional[float] = None
+    # Embedding similarity to the current resume, rescored by the pipeline when the resume changes
+    vector_match_percentage: Optional[float] = None
     status: Optional[str] = None
     saved_date: Optional[str] = None
 
+JOB_FIELDS = tuple(Job.model_fields)
+
+# DynamoDB service limits for the batch endpoints
+BATCH_GET_MAX_KEYS = 100
+TRANSACT_MAX_ITEMS = 100
+MAX_BATCH_SIZE = 500
+BATCH_MAX_ATTEMPTS = 3
+BATCH_RETRY_DELAY = 0.05  # seconds, doubled on each attempt
+
+# Folded into every mutation so a missing job fails the write instead of
+# needing a separate get_item round trip
+JOB_EXISTS_CONDITION = 'attribute_exists(job_id)'
+
+class BatchJobRequest(BaseModel):
+    job_ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+class BatchStatusRequest(BatchJobRequest):
+    status: str
+
+class SearchResponse(BaseModel):
+    total: int
+    results: List[Job]
+    facets: Dict[str, Dict[str, int]]
+
+class BatchItemResult(BaseModel):
+    job_id: str
+    result: str
+    detail: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    results: List[BatchItemResult]
+
+async def run_aws(func, *args, **kwargs):
+    """Run a blocking boto3 call on the AWS I/O pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(aws_executor, functools.partial(func, *args, **kwargs))
+
+def encode_cursor(last_key: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Turn a DynamoDB LastEvaluatedKey into an opaque cursor string"""
+    if not last_key:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(last_key, default=str).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor: Optional[str], feed: str) -> Optional[Dict[str, Any]]:
+    """Turn an opaque cursor back into an ExclusiveStartKey for the feed's index"""
+    if not cursor:
+        return None
+    try:
+        last_key = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # DynamoDB rejects a start key that doesn't match the index key schema with a 500-worthy error
+    if (not isinstance(last_key, dict) or set(last_key) != FEED_KEY_FIELDS[feed]
+            or not all(isinstance(value, str) and value for value in last_key.values())
+            or last_key['feed'] != feed):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return last_key
+
+def query_feed_page(table, index_name: str, feed: str, limit: int,
+                    start_key: Optional[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Fetch one page of a feed, most recent first, and the cursor for the next page"""
+    query_kwargs = {
+        'IndexName': index_name,
+        'KeyConditionExpression': Key('feed').eq(feed),
+        'ScanIndexForward': False,
+        'Limit': limit
+    }
+    if start_key:
+        query_kwargs['ExclusiveStartKey'] = start_key
+
+    response = table.query(**query_kwargs)
+    return response.get('Items', []), encode_cursor(response.get('LastEvaluatedKey'))
+
+def page_etag(body: bytes, next_cursor: Optional[str]) -> str:
+    """Strong ETag over the encoded page, so it changes whenever any job does"""
+    digest = hashlib.sha1(body)
+    digest.update((next_cursor or '').encode('utf-8'))
+    return f'"{digest.hexdigest()}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return any((tag[2:] if tag.startswith('W/') else tag) == etag for tag in candidates)
+
+def plain_value(value: Any) -> Any:
+    """Convert DynamoDB Decimals (including inside lists and maps) to JSON numbers"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, list):
+        return [plain_value(v) for v in value]
+    if isinstance(value, dict):
+        return {k: plain_value(v) for k, v in value.items()}
+    return value
+
+def normalize_job(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Limit a store item to the public Job fields with plain JSON values"""
+    return {field: plain_value(item[field]) for field in JOB_FIELDS if field in item}
+
+def dumps_json(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+def load_feed_page(table, index_name: str, feed: str, limit: int,
+                   start_key: Optional[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Optional[str], str, bytes]:
+    """Query a page and encode it once: (jobs, next_cursor, etag, JSON body)"""
+    items, next_cursor = query_feed_page(table, index_name, feed, limit, start_key)
+    jobs = [normalize_job(item) for item in items]
+    body = dumps_json(jobs)
+    return jobs, next_cursor, page_etag(body, next_cursor), body
+
+async def get_feed_page(table, index_name: str, feed: str, limit: int,
+                        cursor: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str], str, bytes]:
+    """Serve an encoded feed page from the cache, querying DynamoDB on a miss"""
+    # Read before the query, so a write that lands during it makes this page unreachable
+    generation = job_cache.generation(feed)
+    page = job_cache.get_page(feed, generation, limit, cursor)
+    if page is None:
+        page = await run_aws(load_feed_page, table, index_name, feed, limit, decode_cursor(cursor, feed))
+        job_cache.set_page(feed, generation, limit, cursor, page)
+    return page
+
+def ndjson_lines(jobs: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """One JSON document per normalized job, emitted in batches"""
+    batch = []
+    for job in jobs:
+        batch.append(dumps_json(job))
+        if len(batch) >= NDJSON_FLUSH_EVERY:
+            yield b'\n'.join(batch) + b'\n'
+            batch = []
+    if batch:
+        yield b'\n'.join(batch) + b'\n'
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = {part.split(';')[0].strip().lower() for part in accept_encoding.split(',')}
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+def compress_chunks(chunks: Iterable[bytes], encoding: Optional[str]) -> Iterator[bytes]:
+    """Compress a chunk stream, flushing after each chunk so clients can decode incrementally"""
+    if encoding is None:
+        yield from chunks
+    elif encoding == 'br':
+        compressor = brotli.Compressor()
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+def feed_response(request: Request, response: Response,
+                  page: Tuple[List[Dict[str, Any]], Optional[str], str, bytes], stream: Optional[str]):
+    """Answer a list request with a 304, an NDJSON stream or the plain JSON list"""
+    jobs, next_cursor, etag, body = page
+    if stream == 'ndjson':
+        # A different representation of the same page needs its own validator
+        etag = etag[:-1] + '-ndjson"'
+    headers = {'ETag': etag}
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+
+    if stream == 'ndjson':
+        encoding = choose_encoding(request.headers.get('accept-encoding', ''))
+        headers['Vary'] = 'Accept-Encoding'
+        if encoding:
+            headers['Content-Encoding'] = encoding
+        return StreamingResponse(
+            compress_chunks(ndjson_lines(jobs), encoding),
+            media_type='application/x-ndjson',
+            headers=headers
+        )
+
+    if FAST_JSON_RESPONSES:
+        return Response(content=body, media_type='application/json', headers=headers)
+    response.headers.update(headers)
+    return jobs
+
 @app.get("/api/jobs", response_model=List[Job])
-async def get_jobs():
-    try:
-        response = jobs_table.scan()
-        jobs = response.get('Items', [])
-        
-        # Sort jobs by date (most recent first)
-        jobs.sort(key=lambda x: x.get('date', ''), reverse=True)
-        
-        return jobs
+async def get_jobs(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: Optional[str] = Query(None, alias='format', pattern='^ndjson$')
+):
+    # Validate outside the try so a bad cursor is a 400, not a 500
+    decode_cursor(cursor, JOBS_FEED)
+    try:
+        # Jobs come back sorted by date (most recent first) from the index
+        page = await get_feed_page(jobs_table, JOBS_DATE_INDEX, JOBS_FEED, limit, cursor)
+        return feed_response(request, response, page, stream)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+search_index: Optional[JobSearchIndex] = None
+search_index_built_at = 0.0
+search_index_lock = asyncio.Lock()
+search_index_refresh: Optional[asyncio.Task] = None
+# Jobs removed while a rebuild is scanning; dropped from the new index before it goes live
+search_index_pending_discards: Optional[set] = None
+
+def scan_all_jobs() -> List[Dict[str, Any]]:
+    """Read every job, following scan pages past the 1 MB limit"""
+    jobs = []
+    scan_kwargs = {}
+    while True:
+        response = jobs_table.scan(**scan_kwargs)
+        jobs.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return jobs
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def build_search_index() -> JobSearchIndex:
+    return JobSearchIndex(normalize_job(item) for item in scan_all_jobs())
+
+async def rebuild_search_index(discards: set) -> JobSearchIndex:
+    """Scan and index the jobs table on the AWS pool, then swap the new index in"""
+    global search_index, search_index_built_at, search_index_pending_discards
+    try:
+        index = await run_aws(build_search_index)
+        for job_id in discards:
+            index.discard(job_id)
+        search_index, search_index_built_at = index, time.monotonic()
+        return index
+    finally:
+        search_index_pending_discards = None
+
+def start_search_index_rebuild() -> set:
+    """Start collecting discards for a rebuild that is about to be scheduled"""
+    global search_index_pending_discards
+    search_index_pending_discards = set()
+    return search_index_pending_discards
+
+async def refresh_search_index(discards: set) -> None:
+    try:
+        await rebuild_search_index(discards)
+    except Exception as e:
+        # Keep serving the old index; the next search tries again
+        logger.error(f"Error rebuilding search index: {str(e)}")
+
+async def get_search_index() -> JobSearchIndex:
+    """The current index; a stale one keeps serving while its replacement builds in the background"""
+    global search_index_refresh
+    if search_index is None:
+        # Nothing to serve yet, so the first search waits for the first build
+        async with search_index_lock:
+            if search_index is None:
+                await rebuild_search_index(start_search_index_rebuild())
+    elif (time.monotonic() - search_index_built_at > SEARCH_INDEX_TTL_SECONDS
+          and (search_index_refresh is None or search_index_refresh.done())):
+        search_index_refresh = asyncio.create_task(refresh_search_index(start_search_index_rebuild()))
+    return search_index
+
+def discard_from_search_index(job_ids: Iterable[str]) -> None:
+    job_ids = list(job_ids)
+    if search_index is not None:
+        for job_id in job_ids:
+            search_index.discard(job_id)
+    if search_index_pending_discards is not None:
+        search_index_pending_discards.update(job_ids)
+
+@app.get("/api/jobs/search", response_model=SearchResponse)
+async def search_jobs(
+    q: Optional[str] = None,
+    place: Optional[List[str]] = Query(None),
+    company: Optional[List[str]] = Query(None),
+    min_match: Optional[float] = Query(None, ge=0, le=100),
+    max_match: Optional[float] = Query(None, ge=0, le=100),
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    sort: str = Query('date', pattern='^(date|match|similarity)$'),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
+):
+    try:
+        index = await get_search_index()
+        results, total, facets = index.search(
+            text=q,
+            places=place,
+            companies=company,
+            min_match=min_match,
+            max_match=max_match,
+            date_from=date_from,
+            date_to=date_to,
+            sort=sort,
+            limit=limit,
+            offset=offset
+        )
+        content = {"total": total, "results": results, "facets": facets}
+        if FAST_JSON_RESPONSES:
+            return Response(content=dumps_json(content), media_type='application/json')
+        return content
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def batch_get_jobs(table, job_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch jobs by id with BatchGetItem, chunked at the 100-key limit"""
+    found = {}
+    for start in range(0, len(job_ids), BATCH_GET_MAX_KEYS):
+        keys = [{'job_id': job_id} for job_id in job_ids[start:start + BATCH_GET_MAX_KEYS]]
+        request_items = {table.name: {'Keys': keys}}
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            for item in response.get('Responses', {}).get(table.name, []):
+                found[item['job_id']] = item
+            request_items = response.get('UnprocessedKeys')
+            if not request_items:
+                break
+            if attempt < BATCH_MAX_ATTEMPTS - 1:
+                time.sleep(BATCH_RETRY_DELAY * (2 ** attempt))
+        else:
+            raise RuntimeError(f"BatchGetItem left keys unprocessed after {BATCH_MAX_ATTEMPTS} attempts")
+    return found
+
+def pack_transactions(groups: List[Tuple[str, List[Dict[str, Any]]]]) -> List[List[Tuple[str, List[Dict[str, Any]]]]]:
+    """Pack whole write groups into chunks that fit the TransactWriteItems item limit"""
+    chunks, chunk, chunk_size = [], [], 0
+    for group in groups:
+        if chunk and chunk_size + len(group[1]) > TRANSACT_MAX_ITEMS:
+            chunks.append(chunk)
+            chunk, chunk_size = [], 0
+        chunk.append(group)
+        chunk_size += len(group[1])
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+def transact_write_groups(groups: List[Tuple[str, List[Dict[str, Any]]]]) -> Dict[str, Tuple[str, Optional[str]]]:
+    """Apply each job's write group atomically, packing groups into TransactWriteItems calls.
+
+    Returns job_id -> (result, detail). A group whose condition fails is reported
+    as not_found; groups cancelled because of a neighbour or a conflict are retried.
+    """
+    results = {}
+    pending = list(groups)
+    for attempt in range(BATCH_MAX_ATTEMPTS):
+        retry = []
+        for chunk in pack_transactions(pending):
+            try:
+                dynamodb.meta.client.transact_write_items(
+                    TransactItems=[item for _, items in chunk for item in items]
+                )
+                for job_id, _ in chunk:
+                    results[job_id] = ('ok', None)
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'TransactionCanceledException':
+                    for job_id, _ in chunk:
+                        results[job_id] = ('error', str(e))
+                    continue
+                # Cancellation reasons line up one-to-one with the submitted items
+                reasons = iter(e.response.get('CancellationReasons', []))
+                for job_id, items in chunk:
+                    codes = {next(reasons, {}).get('Code', 'None') for _ in items} - {'None'}
+                    if 'ConditionalCheckFailed' in codes:
+                        results[job_id] = ('not_found', None)
+                        continue
+                    results[job_id] = ('error', ', '.join(sorted(codes)) or 'Transaction cancelled')
+                    retry.append((job_id, items))
+        # No backoff after the last attempt; its failures are already in results
+        if not retry or attempt == BATCH_MAX_ATTEMPTS - 1:
+            break
+        pending = retry
+        time.sleep(BATCH_RETRY_DELAY * (2 ** attempt))
+    return results
+
+def unique_job_ids(job_ids: List[str]) -> List[str]:
+    """Drop duplicate ids, keeping request order; a transaction may not touch an item twice"""
+    return list(dict.fromkeys(job_ids))
+
+def build_batch_response(job_ids: List[str], results: Dict[str, Tuple[str, Optional[str]]],
+                         ok_result: str) -> BatchResponse:
+    items = []
+    for job_id in job_ids:
+        result, detail = results.get(job_id, ('error', 'Not processed'))
+        items.append(BatchItemResult(job_id=job_id, result=ok_result if result == 'ok' else result, detail=detail))
+    return BatchResponse(results=items)
+
+def save_job_writes(job_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Transaction items that move a job from jobs to saved_jobs in one step"""
+    return [
+        {'Put': {'TableName': saved_jobs_table.name, 'Item': job_data}},
+        {'Delete': {
+            'TableName': jobs_table.name,
+            'Key': {'job_id': job_data['job_id']},
+            'ConditionExpression': JOB_EXISTS_CONDITION
+        }}
+    ]
+
+def delete_job_write(table, job_id: str) -> Dict[str, Any]:
+    return {'Delete': {
+        'TableName': table.name,
+        'Key': {'job_id': job_id},
+        'ConditionExpression': JOB_EXISTS_CONDITION
+    }}
+
+def status_update_write(job_id: str, status: str) -> Dict[str, Any]:
+    return {'Update': {
+        'TableName': saved_jobs_table.name,
+        'Key': {'job_id': job_id},
+        'UpdateExpression': 'SET #status = :status',
+        'ConditionExpression': JOB_EXISTS_CONDITION,
+        'ExpressionAttributeNames': {'#status': 'status'},
+        'ExpressionAttributeValues': {':status': status}
+    }}
+
+def mark_saved(job_data: Dict[str, Any], saved_date: str) -> Dict[str, Any]:
+    job_data.update({'saved_date': saved_date, 'status': 'saved', 'feed': SAVED_JOBS_FEED})
+    return job_data
+
+def is_condition_failure(error: ClientError) -> bool:
+    """True when a write was rejected because its existence condition failed"""
+    code = error.response['Error']['Code']
+    if code == 'ConditionalCheckFailedException':
+        return True
+    if code == 'TransactionCanceledException':
+        return any(reason.get('Code') == 'ConditionalCheckFailed'
+                   for reason in error.response.get('CancellationReasons', []))
+    return False
+
+def batch_save_jobs(job_ids: List[str]) -> Dict[str, Tuple[str, Optional[str]]]:
+    jobs = batch_get_jobs(jobs_table, job_ids)
+    saved_date = datetime.now().isoformat()
+    groups = [
+        (job_id, save_job_writes(mark_saved(jobs[job_id], saved_date)))
+        for job_id in job_ids if job_id in jobs
+    ]
+    results = {job_id: ('not_found', None) for job_id in job_ids if job_id not in jobs}
+    results.update(transact_write_groups(groups))
+    return results
+
+def batch_delete_jobs(job_ids: List[str]) -> Dict[str, Tuple[str, Optional[str]]]:
+    return transact_write_groups([(job_id, [delete_job_write(jobs_table, job_id)]) for job_id in job_ids])
+
+def batch_update_status(job_ids: List[str], status: str) -> Dict[str, Tuple[str, Optional[str]]]:
+    return transact_write_groups([(job_id, [status_update_write(job_id, status)]) for job_id in job_ids])
+
+@app.post("/api/jobs/batch-save", response_model=BatchResponse)
+async def batch_save(request: BatchJobRequest):
+    job_ids = unique_job_ids(request.job_ids)
+    try:
+        results = await run_aws(batch_save_jobs, job_ids)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    for job_id in job_ids:
+        job_cache.invalidate_job(job_id)
+    job_cache.invalidate_feed(JOBS_FEED)
+    discard_from_search_index(job_id for job_id, (result, _) in results.items() if result == 'ok')
+    job_cache.invalidate_feed(SAVED_JOBS_FEED)
+    return build_batch_response(job_ids, results, 'saved')
+
+@app.delete("/api/jobs/batch", response_model=BatchResponse)
+async def batch_delete(request: BatchJobRequest):
+    job_ids = unique_job_ids(request.job_ids)
+    try:
+        results = await run_aws(batch_delete_jobs, job_ids)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    for job_id in job_ids:
+        job_cache.invalidate_job(job_id)
+    job_cache.invalidate_feed(JOBS_FEED)
+    discard_from_search_index(job_id for job_id, (result, _) in results.items() if result == 'ok')
+    return build_batch_response(job_ids, results, 'deleted')
+
+@app.patch("/api/saved-jobs/batch-status", response_model=BatchResponse)
+async def batch_status(request: BatchStatusRequest):
+    job_ids = unique_job_ids(request.job_ids)
+    try:
+        results = await run_aws(batch_update_status, job_ids, request.status)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    job_cache.invalidate_feed(SAVED_JOBS_FEED)
+    return build_batch_response(job_ids, results, 'updated')
+
 @app.get("/api/jobs/{job_id}", response_model=Job)
 async def get_job(job_id: str):
     try:
-        response = jobs_table.get_item(Key={'job_id': job_id})
-        job = response.get('Item')
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
+        version = job_cache.job_version(job_id)
+        job = job_cache.get_job(job_id, version)
+        if job is None:
+            response = await run_aws(jobs_table.get_item, Key={'job_id': job_id})
+            job = response.get('Item')
+            if not job:
+                raise HTTPException(status_code=404, detail="Job not found")
+            job_cache.set_job(job_id, version, job)
         return job
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.delete("/api/jobs/{job_id}")
 async def delete_job(job_id: str):
     try:
-        # Get the job first to ensure it exists
-        job = jobs_table.get_item(Key={'job_id': job_id})
-        if not job.get('Item'):
+        # The existence check is folded into the delete itself
+        await run_aws(
+            jobs_table.delete_item,
+            Key={'job_id': job_id},
+            ConditionExpression=JOB_EXISTS_CONDITION
+        )
+    except ClientError as e:
+        if is_condition_failure(e):
             raise HTTPException(status_code=404, detail="Job not found")
-        
-        # Delete from jobs table
-        jobs_table.delete_item(Key={'job_id': job_id})
-        return {"message": "Job deleted successfully"}
+        raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    job_cache.invalidate_job(job_id)
+    job_cache.invalidate_feed(JOBS_FEED)
+    discard_from_search_index([job_id])
+    return {"message": "Job deleted successfully"}
+
 @app.post("/api/jobs/{job_id}/save")
 async def save_job(job_id: str):
     try:
         # Get the job from jobs table
-        job = jobs_table.get_item(Key={'job_id': job_id})
+        job = await run_aws(jobs_table.get_item, Key={'job_id': job_id})
         if not job.get('Item'):
             raise HTTPException(status_code=404, detail="Job not found")
-        
-        job_data = job['Item']
-        # Add saved date and status
-        job_data['saved_date'] = datetime.now().isoformat()
-        job_data['status'] = 'saved'
-        
-        # Save to saved_jobs table
-        saved_jobs_table.put_item(Item=job_data)
-        
-        # Delete from jobs table
-        jobs_table.delete_item(Key={'job_id': job_id})
-        
-        return {"message": "Job saved successfully"}
+
+        # Add saved date and status, then move it to saved_jobs atomically. The
+        # delete is conditional, so a concurrent save or delete surfaces as a 404.
+        job_data = mark_saved(job['Item'], datetime.now().isoformat())
+        await run_aws(dynamodb.meta.client.transact_write_items, TransactItems=save_job_writes(job_data))
+    except HTTPException:
+        raise
+    except ClientError as e:
+        if is_condition_failure(e):
+            raise HTTPException(status_code=404, detail="Job not found")
+        raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    job_cache.invalidate_job(job_id)
+    job_cache.invalidate_feed(JOBS_FEED)
+    discard_from_search_index([job_id])
+    job_cache.invalidate_feed(SAVED_JOBS_FEED)
+    return {"message": "Job saved successfully"}
+
 @app.get("/api/saved-jobs", response_model=List[Job])
-async def get_saved_jobs():
-    try:
-        response = saved_jobs_table.scan()
-        print(response)
-        jobs = response.get('Items', [])
-        
-        # Sort jobs by saved date (most recent first)
-        jobs.sort(key=lambda x: x.get('saved_date', ''), reverse=True)
-        
-        return jobs
+async def get_saved_jobs(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: Optional[str] = Query(None, alias='format', pattern='^ndjson$')
+):
+    # Validate outside the try so a bad cursor is a 400, not a 500
+    decode_cursor(cursor, SAVED_JOBS_FEED)
+    try:
+        # Saved jobs come back sorted by saved date (most recent first) from the index
+        page = await get_feed_page(
+            saved_jobs_table, SAVED_JOBS_DATE_INDEX, SAVED_JOBS_FEED, limit, cursor
+        )
+        return feed_response(request, response, page, stream)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.patch("/api/saved-jobs/{job_id}/status")
 async def update_job_status(job_id: str, status_update: dict):
     try:
-        # Get the job first to ensure it exists
-        job = saved_jobs_table.get_item(Key={'job_id': job_id})
-        if not job.get('Item'):
-            raise HTTPException(status_code=404, detail="Job not found")
-        
-        # Update the status
-        saved_jobs_table.update_item(
+        # Update the status only if the saved job exists
+        await run_aws(
+            saved_jobs_table.update_item,
             Key={'job_id': job_id},
             UpdateExpression="SET #status = :status",
+            ConditionExpression=JOB_EXISTS_CONDITION,
             ExpressionAttributeNames={
                 "#status": "status"
             },
@@ -141,38 +736,114 @@ async def update_job_status(job_id: str, status_update: dict):
                 ":status": status_update['status']
             }
         )
-        
-        return {"message": "Job status updated successfully"}
+    except ClientError as e:
+        if is_condition_failure(e):
+            raise HTTPException(status_code=404, detail="Job not found")
+        raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    job_cache.invalidate_feed(SAVED_JOBS_FEED)
+    return {"message": "Job status updated successfully"}
+
 @app.delete("/api/saved-jobs/{job_id}")
 async def delete_saved_job(job_id: str):
     try:
-        # Get the job first to ensure it exists
-        job = saved_jobs_table.get_item(Key={'job_id': job_id})
-        if not job.get('Item'):
+        # The existence check is folded into the delete itself
+        await run_aws(
+            saved_jobs_table.delete_item,
+            Key={'job_id': job_id},
+            ConditionExpression=JOB_EXISTS_CONDITION
+        )
+    except ClientError as e:
+        if is_condition_failure(e):
             raise HTTPException(status_code=404, detail="Job not found")
-        
-        # Delete from saved_jobs table
-        saved_jobs_table.delete_item(Key={'job_id': job_id})
-        return {"message": "Job deleted successfully"}
+        raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    job_cache.invalidate_feed(SAVED_JOBS_FEED)
+    return {"message": "Job deleted successfully"}
+
+def read_ingest_progress() -> Optional[Dict[str, Any]]:
+    try:
+        with open(INGEST_PROGRESS_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+async def jobs_table_status() -> Dict[str, Any]:
+    """Coarse status for when the pipeline publishes no progress"""
+    # Scan the jobs table with a limit of 1 to check if there are any items
+    response = await run_aws(jobs_table.scan, Limit=1)
+    # Report completed if there are any items in the table
+    if len(response.get('Items', [])) > 0:
+        return {"status": "completed"}
+    return {"status": "processing"}
+
 @app.get("/api/jobs_status")
 async def get_job_processing_status():
+    progress = read_ingest_progress()
+    if progress:
+        return progress
     try:
-        # Scan the jobs table with a limit of 1 to check if there are any items
-        response = jobs_table.scan(Limit=1)
-        # Return true if there are any items in the table
-        if len(response.get('Items', [])) > 0:
-            return {"status": "completed"}
-        else:
-            return {"status": "processing"}
+        return await jobs_table_status()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/jobs_status/stream")
+async def stream_job_processing_status(request: Request):
+    """Server-sent events with scrape progress, pushed whenever the pipeline publishes"""
+    async def events():
+        last_mtime = None
+        last_sent = last_fallback = 0.0
+        while not await request.is_disconnected():
+            now = time.monotonic()
+            try:
+                mtime = os.stat(INGEST_PROGRESS_PATH).st_mtime_ns
+            except OSError:
+                mtime = None
+
+            payload = None
+            if mtime is not None and mtime != last_mtime:
+                last_mtime = mtime
+                payload = read_ingest_progress()
+            elif mtime is None and now - last_fallback >= STATUS_FALLBACK_INTERVAL:
+                last_fallback = now
+                try:
+                    payload = await jobs_table_status()
+                except Exception as e:
+                    payload = {"status": "error", "message": str(e)}
+
+            if payload:
+                last_sent = now
+                yield f"data: {json.dumps(payload)}\n\n"
+                if payload.get('status') in ('completed', 'failed', 'error'):
+                    return
+            elif now - last_sent >= PROGRESS_HEARTBEAT_INTERVAL:
+                last_sent = now
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(PROGRESS_POLL_INTERVAL)
+
+    return StreamingResponse(events(), media_type='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+@app.get("/api/cache_stats")
+async def get_cache_stats():
+    return job_cache.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    cache_stats = job_cache.stats()
+    cache_lines = [
+        "# HELP job_cache_hits_total Job cache lookups served from the cache",
+        "# TYPE job_cache_hits_total counter",
+        f"job_cache_hits_total {cache_stats['hits']}",
+        "# HELP job_cache_misses_total Job cache lookups that went to DynamoDB",
+        "# TYPE job_cache_misses_total counter",
+        f"job_cache_misses_total {cache_stats['misses']}"
+    ]
+    return PlainTextResponse(metrics.render(cache_lines), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
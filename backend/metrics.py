@@ -0,0 +1,186 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# DynamoDB operations that accept ReturnConsumedCapacity
+CAPACITY_OPERATIONS = {
+    'GetItem', 'PutItem', 'UpdateItem', 'DeleteItem', 'Query', 'Scan',
+    'BatchGetItem', 'BatchWriteItem', 'TransactGetItems', 'TransactWriteItems'
+}
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{escaped}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[tuple(label_values)] += amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{format_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        key = tuple(label_values)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._sums[key] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, counts in sorted(self._counts.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    labels = format_labels(self.labels + ('le',), key + (le,))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = format_labels(self.labels, key)
+                lines.append(f"{self.name}_sum{labels} {self._sums[key]}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Request and AWS call metrics, rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self.request_duration = Histogram(
+            'http_request_duration_seconds', 'HTTP request latency by route', ['method', 'route'])
+        self.requests = Counter(
+            'http_requests_total', 'HTTP requests by route and status', ['method', 'route', 'status'])
+        self.request_errors = Counter(
+            'http_request_errors_total', 'HTTP requests that ended in a 5xx', ['method', 'route'])
+        self.aws_duration = Histogram(
+            'aws_call_duration_seconds', 'AWS API call latency', ['service', 'operation'])
+        self.aws_errors = Counter(
+            'aws_call_errors_total', 'AWS API calls that returned an error', ['service', 'operation', 'code'])
+        self.consumed_capacity = Counter(
+            'dynamodb_consumed_capacity_units_total', 'DynamoDB capacity units consumed', ['table', 'operation'])
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        self.request_duration.observe(seconds, method, route)
+        self.requests.inc(method, route, str(status))
+        if status >= 500:
+            self.request_errors.inc(method, route)
+
+    def instrument_client(self, client) -> None:
+        """Time every call made by a botocore client and record DynamoDB consumed capacity"""
+        events = client.meta.events
+        service = client.meta.service_model.service_name
+        if service == 'dynamodb':
+            events.register('provide-client-params.dynamodb.*', self._request_capacity)
+        events.register(f'before-call.{service}.*', self._before_call)
+        events.register(f'after-call.{service}.*', self._after_call)
+        events.register(f'after-call-error.{service}.*', self._after_call_error)
+
+    def _request_capacity(self, params, model, **kwargs):
+        if model.name in CAPACITY_OPERATIONS:
+            params.setdefault('ReturnConsumedCapacity', 'TOTAL')
+
+    def _before_call(self, model, context, **kwargs):
+        # after-call-error only receives the context, so everything it needs goes in here
+        context['metrics_service'] = model.service_model.service_name
+        context['metrics_operation'] = model.name
+        context['metrics_start'] = time.perf_counter()
+
+    def _observe_duration(self, context) -> Tuple[str, str]:
+        service = context.get('metrics_service', 'unknown')
+        operation = context.get('metrics_operation', 'unknown')
+        start = context.get('metrics_start')
+        if start is not None:
+            self.aws_duration.observe(time.perf_counter() - start, service, operation)
+        return service, operation
+
+    def _after_call(self, http_response, parsed, model, context, **kwargs):
+        service, operation = self._observe_duration(context)
+        error = parsed.get('Error') if isinstance(parsed, dict) else None
+        if error:
+            self.aws_errors.inc(service, operation, error.get('Code', 'Unknown'))
+        if isinstance(parsed, dict) and 'ConsumedCapacity' in parsed:
+            capacities = parsed['ConsumedCapacity']
+            for capacity in capacities if isinstance(capacities, list) else [capacities]:
+                self.consumed_capacity.inc(
+                    capacity.get('TableName', 'unknown'), operation, amount=capacity.get('CapacityUnits', 0))
+
+    def _after_call_error(self, **kwargs):
+        # Fired with only exception and context, for failures that never got a response
+        service, operation = self._observe_duration(kwargs.get('context', {}))
+        exception = kwargs.get('exception')
+        self.aws_errors.inc(service, operation, type(exception).__name__ if exception else 'Unknown')
+
+    def render(self, extra_lines: Sequence[str] = ()) -> str:
+        lines = []
+        for metric in (self.request_duration, self.requests, self.request_errors,
+                       self.aws_duration, self.aws_errors, self.consumed_capacity):
+            lines.extend(metric.render())
+        lines.extend(extra_lines)
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each request until its last body chunk is sent"""
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router records the matched route on the shared scope
+            route = getattr(scope.get('route'), 'path', 'unmatched')
+            self.registry.observe_request(scope['method'], route, status, time.perf_counter() - start)
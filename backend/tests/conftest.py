@@ -0,0 +1,171 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+from botocore.exceptions import ClientError
+
+# main.py creates its boto3 resources at import time; no call reaches AWS here
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from job_cache import JobCache, LocalCacheBackend  # noqa: E402
+
+
+def condition_failed(operation):
+    return ClientError({'Error': {'Code': 'ConditionalCheckFailedException', 'Message': ''}}, operation)
+
+
+class FakeTable:
+    """In-memory stand-in for a boto3 Table with DynamoDB's paging behaviour.
+
+    Query reads a sparse GSI partitioned on `feed`, and both Query and Scan stop
+    after `page_size` items with a LastEvaluatedKey, like the 1 MB page limit.
+    """
+
+    def __init__(self, name, sort_key, items=(), page_size=None):
+        self.name = name
+        self.sort_key = sort_key
+        self.page_size = page_size
+        self.items = {item['job_id']: dict(item) for item in items}
+        self.calls = []
+
+    def _page(self, items, limit, start_key, key_fields):
+        if start_key:
+            start = next(i for i, item in enumerate(items) if item['job_id'] == start_key['job_id']) + 1
+            items = items[start:]
+        limits = [n for n in (limit, self.page_size) if n]
+        page = items[:min(limits)] if limits else items
+        response = {'Items': [dict(item) for item in page], 'Count': len(page)}
+        if page and len(page) < len(items):
+            response['LastEvaluatedKey'] = {field: page[-1][field] for field in key_fields}
+        return response
+
+    def query(self, IndexName, KeyConditionExpression, ScanIndexForward=True, Limit=None,
+              ExclusiveStartKey=None):
+        self.calls.append('query')
+        feed = KeyConditionExpression.get_expression()['values'][1]
+        # Sparse index: rows without the partition or sort key are not in it
+        items = [item for item in self.items.values()
+                 if item.get('feed') == feed and item.get(self.sort_key)]
+        items.sort(key=lambda item: (item[self.sort_key], item['job_id']), reverse=not ScanIndexForward)
+        return self._page(items, Limit, ExclusiveStartKey, ('job_id', 'feed', self.sort_key))
+
+    def scan(self, Limit=None, ExclusiveStartKey=None, **kwargs):
+        self.calls.append('scan')
+        items = sorted(self.items.values(), key=lambda item: item['job_id'])
+        return self._page(items, Limit, ExclusiveStartKey, ('job_id',))
+
+    def get_item(self, Key):
+        self.calls.append('get_item')
+        item = self.items.get(Key['job_id'])
+        return {'Item': dict(item)} if item else {}
+
+    def delete_item(self, Key, ConditionExpression=None):
+        self.calls.append('delete_item')
+        if Key['job_id'] not in self.items:
+            if ConditionExpression:
+                raise condition_failed('DeleteItem')
+            return {}
+        del self.items[Key['job_id']]
+        return {}
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeNames, ExpressionAttributeValues,
+                    ConditionExpression=None):
+        self.calls.append('update_item')
+        item = self.items.get(Key['job_id'])
+        if item is None:
+            if ConditionExpression:
+                raise condition_failed('UpdateItem')
+            item = self.items[Key['job_id']] = dict(Key)
+        assignments = UpdateExpression[len('SET '):].split(', ')
+        for assignment in assignments:
+            name, value = (part.strip() for part in assignment.split('='))
+            item[ExpressionAttributeNames.get(name, name)] = ExpressionAttributeValues[value]
+        return {}
+
+
+class FakeDynamo:
+    """Stand-in for the boto3 resource's BatchGetItem and TransactWriteItems over FakeTables.
+
+    Ids in `unprocessed` come back as UnprocessedKeys from their next batch get;
+    ids in `conflicts` cancel the next transaction they are in with a
+    TransactionConflict, as a concurrent write would.
+    """
+
+    def __init__(self, *tables):
+        self.tables = {table.name: table for table in tables}
+        self.meta = SimpleNamespace(client=self)
+        self.unprocessed = set()
+        self.conflicts = set()
+        self.transactions = []
+
+    def batch_get_item(self, RequestItems):
+        responses, unprocessed = {}, {}
+        for name, request in RequestItems.items():
+            table = self.tables[name]
+            for key in request['Keys']:
+                if key['job_id'] in self.unprocessed:
+                    self.unprocessed.discard(key['job_id'])
+                    unprocessed.setdefault(name, {'Keys': []})['Keys'].append(key)
+                elif key['job_id'] in table.items:
+                    responses.setdefault(name, []).append(dict(table.items[key['job_id']]))
+        return {'Responses': responses, 'UnprocessedKeys': unprocessed}
+
+    def transact_write_items(self, TransactItems):
+        self.transactions.append(TransactItems)
+        codes = [self._check(operation) for operation in TransactItems]
+        if any(code != 'None' for code in codes):
+            raise ClientError({
+                'Error': {'Code': 'TransactionCanceledException', 'Message': ''},
+                'CancellationReasons': [{'Code': code} for code in codes],
+            }, 'TransactWriteItems')
+        for operation in TransactItems:
+            self._apply(*next(iter(operation.items())))
+        return {}
+
+    def _check(self, operation):
+        params = next(iter(operation.values()))
+        job_id = params.get('Key', params.get('Item'))['job_id']
+        if job_id in self.conflicts:
+            self.conflicts.discard(job_id)
+            return 'TransactionConflict'
+        if params.get('ConditionExpression') and job_id not in self.tables[params['TableName']].items:
+            return 'ConditionalCheckFailed'
+        return 'None'
+
+    def _apply(self, kind, params):
+        table = self.tables[params['TableName']]
+        if kind == 'Put':
+            table.items[params['Item']['job_id']] = dict(params['Item'])
+        elif kind == 'Delete':
+            del table.items[params['Key']['job_id']]
+        else:
+            table.update_item(params['Key'], params['UpdateExpression'],
+                              params['ExpressionAttributeNames'], params['ExpressionAttributeValues'])
+
+
+def make_jobs(count, feed=main.JOBS_FEED):
+    return [
+        {
+            'job_id': f'job-{i:04d}',
+            'title': f'Engineer {i}',
+            'company': 'Acme',
+            'description': 'Build things',
+            'date': f'2024-01-01T00:{i // 60:02d}:{i % 60:02d}',
+            'place': 'Remote',
+            'link': f'https://example.com/{i}',
+            'feed': feed,
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    cache = JobCache(LocalCacheBackend(max_entries=1024), ttl=30)
+    monkeypatch.setattr(main, 'job_cache', cache)
+    return cache
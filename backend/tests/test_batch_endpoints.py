@@ -0,0 +1,121 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from conftest import FakeDynamo, FakeTable, make_jobs
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def store(fresh_cache, monkeypatch):
+    jobs = FakeTable('jobs', 'date', make_jobs(5))
+    saved = FakeTable('saved_jobs', 'saved_date', make_jobs(2, feed=main.SAVED_JOBS_FEED))
+    dynamo = FakeDynamo(jobs, saved)
+    sleeps = []
+    monkeypatch.setattr(main, 'jobs_table', jobs)
+    monkeypatch.setattr(main, 'saved_jobs_table', saved)
+    monkeypatch.setattr(main, 'dynamodb', dynamo)
+    monkeypatch.setattr(main.time, 'sleep', sleeps.append)
+    return dynamo, jobs, saved, sleeps
+
+
+def results(response):
+    assert response.status_code == 200
+    return {item['job_id']: (item['result'], item['detail']) for item in response.json()['results']}
+
+
+def test_batch_save_moves_found_jobs_and_reports_missing(client, store):
+    dynamo, jobs, saved, _ = store
+
+    response = client.post('/api/jobs/batch-save', json={'job_ids': ['job-0003', 'missing', 'job-0003', 'job-0004']})
+
+    assert results(response) == {
+        'job-0003': ('saved', None),
+        'missing': ('not_found', None),
+        'job-0004': ('saved', None),
+    }
+    assert [item['job_id'] for item in response.json()['results']] == ['job-0003', 'missing', 'job-0004']
+    assert set(jobs.items) == {'job-0000', 'job-0001', 'job-0002'}
+    assert saved.items['job-0003']['status'] == 'saved'
+    assert saved.items['job-0003']['feed'] == main.SAVED_JOBS_FEED
+    assert len(dynamo.transactions) == 1
+
+
+def test_batch_save_packs_whole_groups_under_the_item_limit(client, store):
+    dynamo, jobs, _, _ = store
+    jobs.items.update({job['job_id']: job for job in make_jobs(60)})
+
+    response = client.post('/api/jobs/batch-save', json={'job_ids': sorted(jobs.items)})
+
+    assert set(result for result, _ in results(response).values()) == {'saved'}
+    # 60 put+delete pairs: 50 fit in the first transaction, 10 in the second
+    assert [len(items) for items in dynamo.transactions] == [100, 20]
+    assert not jobs.items
+
+
+def test_failed_condition_cancels_only_its_group_and_neighbours_are_retried(client, store):
+    dynamo, jobs, _, sleeps = store
+    del jobs.items['job-0002']
+
+    response = client.request('DELETE', '/api/jobs/batch',
+                              json={'job_ids': ['job-0001', 'job-0002', 'job-0003']})
+
+    assert results(response) == {
+        'job-0001': ('deleted', None),
+        'job-0002': ('not_found', None),
+        'job-0003': ('deleted', None),
+    }
+    assert set(jobs.items) == {'job-0000', 'job-0004'}
+    # The whole transaction is cancelled once, then only the neighbours go again
+    assert [[op['Delete']['Key']['job_id'] for op in items] for items in dynamo.transactions] == [
+        ['job-0001', 'job-0002', 'job-0003'],
+        ['job-0001', 'job-0003'],
+    ]
+    assert sleeps == [main.BATCH_RETRY_DELAY]
+
+
+def test_conflicting_write_is_retried(client, store):
+    dynamo, _, saved, _ = store
+    dynamo.conflicts.add('job-0001')
+
+    response = client.patch('/api/saved-jobs/batch-status',
+                            json={'job_ids': ['job-0000', 'job-0001', 'missing'], 'status': 'applied'})
+
+    assert results(response) == {
+        'job-0000': ('updated', None),
+        'job-0001': ('updated', None),
+        'missing': ('not_found', None),
+    }
+    assert {job['status'] for job in saved.items.values()} == {'applied'}
+    assert 'missing' not in saved.items
+
+
+def test_persistent_conflict_gives_up_without_a_final_backoff(store):
+    dynamo, jobs, _, sleeps = store
+
+    class AlwaysConflicting(set):
+        def discard(self, value):
+            pass
+
+    dynamo.conflicts = AlwaysConflicting({'job-0001'})
+
+    results = main.batch_delete_jobs(['job-0001'])
+
+    assert results == {'job-0001': ('error', 'TransactionConflict')}
+    assert len(dynamo.transactions) == main.BATCH_MAX_ATTEMPTS
+    assert sleeps == [main.BATCH_RETRY_DELAY * 2 ** attempt for attempt in range(main.BATCH_MAX_ATTEMPTS - 1)]
+    assert 'job-0001' in jobs.items
+
+
+def test_batch_get_retries_unprocessed_keys(store):
+    dynamo, jobs, _, sleeps = store
+    dynamo.unprocessed.update({'job-0001', 'job-0003'})
+
+    found = main.batch_get_jobs(jobs, ['job-0000', 'job-0001', 'job-0003', 'missing'])
+
+    assert set(found) == {'job-0000', 'job-0001', 'job-0003'}
+    assert sleeps == [main.BATCH_RETRY_DELAY]
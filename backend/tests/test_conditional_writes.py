@@ -0,0 +1,95 @@
+import pytest
+from botocore.exceptions import ClientError
+from fastapi.testclient import TestClient
+
+import main
+from conftest import FakeDynamo, FakeTable, make_jobs
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def store(fresh_cache, monkeypatch):
+    jobs = FakeTable('jobs', 'date', make_jobs(3))
+    saved = FakeTable('saved_jobs', 'saved_date', make_jobs(1, feed=main.SAVED_JOBS_FEED))
+    dynamo = FakeDynamo(jobs, saved)
+    monkeypatch.setattr(main, 'jobs_table', jobs)
+    monkeypatch.setattr(main, 'saved_jobs_table', saved)
+    monkeypatch.setattr(main, 'dynamodb', dynamo)
+    return dynamo, jobs, saved
+
+
+def throttled(*args, **kwargs):
+    raise ClientError({'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': ''}}, 'Write')
+
+
+def test_save_job_moves_the_job_in_one_transaction(client, store):
+    dynamo, jobs, saved = store
+
+    assert client.post('/api/jobs/job-0002/save').status_code == 200
+
+    assert 'job-0002' not in jobs.items
+    assert saved.items['job-0002']['status'] == 'saved'
+    assert [list(op) for op in dynamo.transactions[0]] == [['Put'], ['Delete']]
+
+
+def test_save_job_removed_after_the_read_is_a_404(client, store, monkeypatch):
+    _, jobs, saved = store
+    get_item = jobs.get_item
+
+    def read_then_lose_the_race(Key):
+        response = get_item(Key)
+        del jobs.items[Key['job_id']]
+        return response
+
+    monkeypatch.setattr(jobs, 'get_item', read_then_lose_the_race)
+
+    response = client.post('/api/jobs/job-0002/save')
+
+    assert response.status_code == 404
+    # The cancelled transaction wrote nothing to saved_jobs either
+    assert 'job-0002' not in saved.items
+
+
+def test_save_missing_job_is_a_404_without_a_transaction(client, store):
+    dynamo, _, _ = store
+    assert client.post('/api/jobs/missing/save').status_code == 404
+    assert not dynamo.transactions
+
+
+def test_save_job_conflict_is_a_500(client, store):
+    dynamo, jobs, _ = store
+    dynamo.conflicts.add('job-0001')
+    response = client.post('/api/jobs/job-0001/save')
+    assert response.status_code == 500
+    assert 'job-0001' in jobs.items
+
+
+@pytest.mark.parametrize('method, path, table_attr', [
+    ('DELETE', '/api/jobs/{}', 'jobs_table'),
+    ('DELETE', '/api/saved-jobs/{}', 'saved_jobs_table'),
+    ('PATCH', '/api/saved-jobs/{}/status', 'saved_jobs_table'),
+])
+def test_conditional_mutations(client, store, method, path, table_attr, monkeypatch):
+    table = getattr(main, table_attr)
+    body = {'json': {'status': 'applied'}} if method == 'PATCH' else {}
+
+    assert client.request(method, path.format('job-0000'), **body).status_code == 200
+    # The existence check is the write's condition, not a separate read
+    assert 'get_item' not in table.calls
+
+    assert client.request(method, path.format('missing'), **body).status_code == 404
+    assert 'missing' not in table.items
+
+    operation = 'update_item' if method == 'PATCH' else 'delete_item'
+    monkeypatch.setattr(table, operation, throttled)
+    assert client.request(method, path.format('job-0000'), **body).status_code == 500
+
+
+def test_deleted_job_is_evicted_from_the_cache(client, store):
+    assert client.get('/api/jobs/job-0001').status_code == 200
+    assert client.delete('/api/jobs/job-0001').status_code == 200
+    assert client.get('/api/jobs/job-0001').status_code == 404
@@ -0,0 +1,130 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from backfill_feed import backfill_feed
+from conftest import FakeTable, make_jobs
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+def fetch_all(client, path, limit):
+    ids, cursor, pages = [], None, 0
+    while True:
+        params = {'limit': limit}
+        if cursor:
+            params['cursor'] = cursor
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        ids.extend(job['job_id'] for job in response.json())
+        pages += 1
+        cursor = response.headers.get(main.NEXT_CURSOR_HEADER)
+        if not cursor:
+            return ids, pages
+
+
+def test_query_feed_page_follows_cursor_across_pages():
+    table = FakeTable('jobs', 'date', make_jobs(120))
+    ids, cursor = [], None
+    while True:
+        items, cursor = main.query_feed_page(table, main.JOBS_DATE_INDEX, main.JOBS_FEED, 50,
+                                             main.decode_cursor(cursor, main.JOBS_FEED))
+        ids.extend(item['job_id'] for item in items)
+        if not cursor:
+            break
+    assert ids == [f'job-{i:04d}' for i in reversed(range(120))]
+
+
+def test_jobs_endpoint_pages_a_table_larger_than_one_page(client, fresh_cache, monkeypatch):
+    # The store caps pages below the requested limit, as the 1 MB response cap does
+    table = FakeTable('jobs', 'date', make_jobs(130), page_size=40)
+    monkeypatch.setattr(main, 'jobs_table', table)
+
+    ids, pages = fetch_all(client, '/api/jobs', limit=50)
+
+    assert ids == [f'job-{i:04d}' for i in reversed(range(130))]
+    assert pages == 4
+    assert 'scan' not in table.calls
+
+
+def test_saved_jobs_endpoint_pages_by_saved_date(client, fresh_cache, monkeypatch):
+    saved = make_jobs(75, feed=main.SAVED_JOBS_FEED)
+    for i, job in enumerate(saved):
+        # Saved in the reverse order they were posted
+        job['saved_date'] = f'2024-02-01T00:{(74 - i) // 60:02d}:{(74 - i) % 60:02d}'
+    table = FakeTable('saved_jobs', 'saved_date', saved)
+    monkeypatch.setattr(main, 'saved_jobs_table', table)
+
+    ids, pages = fetch_all(client, '/api/saved-jobs', limit=50)
+
+    assert ids == [f'job-{i:04d}' for i in range(75)]
+    assert pages == 2
+
+
+def test_invalid_cursor_is_rejected(client, fresh_cache):
+    response = client.get('/api/jobs', params={'cursor': 'not-a-cursor'})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('last_key', [
+    {'job_id': 'job-0001'},
+    {'job_id': 'job-0001', 'feed': 'JOBS', 'date': '2024-01-01', 'extra': 'x'},
+    {'job_id': 'job-0001', 'feed': 'SAVED', 'date': '2024-01-01'},
+    {'job_id': 1, 'feed': 'JOBS', 'date': '2024-01-01'},
+    ['job-0001'],
+])
+def test_cursor_not_matching_the_index_key_schema_is_rejected(client, fresh_cache, monkeypatch, last_key):
+    table = FakeTable('jobs', 'date', make_jobs(3))
+    monkeypatch.setattr(main, 'jobs_table', table)
+
+    response = client.get('/api/jobs', params={'cursor': main.encode_cursor(last_key)})
+
+    assert response.status_code == 400
+    assert 'query' not in table.calls
+
+
+def test_saved_jobs_cursor_is_not_valid_for_jobs(client, fresh_cache, monkeypatch):
+    saved = make_jobs(3, feed=main.SAVED_JOBS_FEED)
+    for job in saved:
+        job['saved_date'] = job['date']
+    monkeypatch.setattr(main, 'saved_jobs_table', FakeTable('saved_jobs', 'saved_date', saved))
+    cursor = client.get('/api/saved-jobs', params={'limit': 1}).headers[main.NEXT_CURSOR_HEADER]
+
+    assert client.get('/api/saved-jobs', params={'cursor': cursor}).status_code == 200
+    assert client.get('/api/jobs', params={'cursor': cursor}).status_code == 400
+
+
+def test_backfill_makes_pre_feed_rows_visible(client, fresh_cache, monkeypatch):
+    legacy = make_jobs(90)
+    for job in legacy:
+        del job['feed']
+    table = FakeTable('jobs', 'date', legacy, page_size=25)
+    monkeypatch.setattr(main, 'jobs_table', table)
+    assert fetch_all(client, '/api/jobs', limit=50)[0] == []
+
+    counts = backfill_feed(table, main.JOBS_FEED, 'date')
+    assert counts['scanned'] == 90
+    assert counts['updated'] == 90
+
+    fresh_cache.invalidate_feed(main.JOBS_FEED)
+    ids, _ = fetch_all(client, '/api/jobs', limit=50)
+    assert len(ids) == 90
+
+    # Re-running is a no-op
+    assert backfill_feed(table, main.JOBS_FEED, 'date')['already_set'] == 90
+
+
+def test_backfill_dry_run_writes_nothing():
+    legacy = make_jobs(10)
+    for job in legacy:
+        del job['feed']
+    table = FakeTable('jobs', 'date', legacy, page_size=3)
+
+    counts = backfill_feed(table, main.JOBS_FEED, 'date', dry_run=True)
+
+    assert counts['updated'] == 10
+    assert 'update_item' not in table.calls
+    assert all('feed' not in item for item in table.items.values())
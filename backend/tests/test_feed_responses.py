@@ -0,0 +1,103 @@
+import json
+import zlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from conftest import FakeDynamo, FakeTable, make_jobs
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def jobs_table(fresh_cache, monkeypatch):
+    table = FakeTable('jobs', 'date', make_jobs(250))
+    saved = FakeTable('saved_jobs', 'saved_date')
+    monkeypatch.setattr(main, 'jobs_table', table)
+    monkeypatch.setattr(main, 'saved_jobs_table', saved)
+    monkeypatch.setattr(main, 'dynamodb', FakeDynamo(table, saved))
+    return table
+
+
+def ndjson_ids(body):
+    return [json.loads(line)['job_id'] for line in body.splitlines()]
+
+
+def test_matching_etag_is_a_304(client, jobs_table):
+    first = client.get('/api/jobs', params={'limit': 10})
+    etag = first.headers['ETag']
+
+    response = client.get('/api/jobs', params={'limit': 10}, headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response.headers['ETag'] == etag
+    assert response.headers[main.NEXT_CURSOR_HEADER] == first.headers[main.NEXT_CURSOR_HEADER]
+
+    for if_none_match in (f'W/{etag}', f'"other", {etag}', '*'):
+        assert client.get('/api/jobs', params={'limit': 10},
+                          headers={'If-None-Match': if_none_match}).status_code == 304
+    assert client.get('/api/jobs', params={'limit': 10},
+                      headers={'If-None-Match': '"other"'}).status_code == 200
+
+
+@pytest.mark.parametrize('mutate', [
+    lambda client: client.delete('/api/jobs/job-0249'),
+    lambda client: client.post('/api/jobs/job-0245/save'),
+])
+def test_etag_changes_after_a_mutation(client, jobs_table, mutate):
+    etag = client.get('/api/jobs', params={'limit': 10}).headers['ETag']
+
+    assert mutate(client).status_code == 200
+
+    response = client.get('/api/jobs', params={'limit': 10}, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_ndjson_has_its_own_etag(client, jobs_table):
+    json_etag = client.get('/api/jobs', params={'limit': 10}).headers['ETag']
+    response = client.get('/api/jobs', params={'limit': 10, 'format': 'ndjson'},
+                          headers={'If-None-Match': json_etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != json_etag
+    assert client.get('/api/jobs', params={'limit': 10, 'format': 'ndjson'},
+                      headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+
+
+def ndjson_stream(client, accept_encoding):
+    """Response headers and the undecoded body as it went over the wire"""
+    with client.stream('GET', '/api/jobs', params={'limit': 200, 'format': 'ndjson'},
+                       headers={'Accept-Encoding': accept_encoding}) as response:
+        assert response.status_code == 200
+        assert response.headers['Content-Type'] == 'application/x-ndjson'
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        return response.headers, b''.join(response.iter_raw())
+
+
+EXPECTED_IDS = [f'job-{i:04d}' for i in reversed(range(50, 250))]
+
+
+def test_ndjson_is_gzip_encoded_when_accepted(client, jobs_table):
+    headers, raw = ndjson_stream(client, 'gzip')
+
+    assert headers['Content-Encoding'] == 'gzip'
+    assert ndjson_ids(zlib.decompress(raw, 16 + zlib.MAX_WBITS)) == EXPECTED_IDS
+
+
+def test_ndjson_is_brotli_encoded_when_accepted(client, jobs_table):
+    brotli = pytest.importorskip('brotli')
+    headers, raw = ndjson_stream(client, 'gzip, br')
+
+    assert headers['Content-Encoding'] == 'br'
+    assert ndjson_ids(brotli.decompress(raw)) == EXPECTED_IDS
+
+
+def test_ndjson_is_uncompressed_without_accept_encoding(client, jobs_table):
+    headers, raw = ndjson_stream(client, 'identity')
+
+    assert 'Content-Encoding' not in headers
+    assert ndjson_ids(raw) == EXPECTED_IDS
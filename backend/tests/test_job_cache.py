@@ -0,0 +1,108 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import job_cache
+import main
+from job_cache import JobCache, LocalCacheBackend
+from conftest import FakeTable, make_jobs
+
+
+class RacingTable(FakeTable):
+    """Runs on_read in the middle of every read, like a write landing during the DynamoDB call"""
+
+    def __init__(self, *args, on_read=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_read = on_read
+
+    def query(self, *args, **kwargs):
+        response = super().query(*args, **kwargs)
+        if self.on_read:
+            self.on_read()
+        return response
+
+    def get_item(self, Key):
+        response = super().get_item(Key)
+        if self.on_read:
+            self.on_read()
+        return response
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+def test_page_loaded_across_an_invalidation_is_not_served(client, fresh_cache, monkeypatch):
+    table = RacingTable('jobs', 'date', make_jobs(3))
+    monkeypatch.setattr(main, 'jobs_table', table)
+
+    def delete_during_read():
+        table.on_read = None
+        del table.items['job-0002']
+        fresh_cache.invalidate_feed(main.JOBS_FEED)
+
+    table.on_read = delete_during_read
+    stale = client.get('/api/jobs').json()
+    assert 'job-0002' in [job['job_id'] for job in stale]
+
+    fresh = client.get('/api/jobs').json()
+    assert [job['job_id'] for job in fresh] == ['job-0001', 'job-0000']
+
+
+def test_job_loaded_across_an_invalidation_is_not_cached(client, fresh_cache, monkeypatch):
+    table = RacingTable('jobs', 'date', make_jobs(1))
+    monkeypatch.setattr(main, 'jobs_table', table)
+
+    def delete_during_read():
+        table.on_read = None
+        del table.items['job-0000']
+        fresh_cache.invalidate_job('job-0000')
+
+    table.on_read = delete_during_read
+    assert client.get('/api/jobs/job-0000').status_code == 200
+    assert client.get('/api/jobs/job-0000').status_code == 404
+
+
+def test_unchanged_job_is_served_from_cache(client, fresh_cache, monkeypatch):
+    table = FakeTable('jobs', 'date', make_jobs(1))
+    monkeypatch.setattr(main, 'jobs_table', table)
+
+    for _ in range(3):
+        assert client.get('/api/jobs/job-0000').status_code == 200
+
+    assert table.calls.count('get_item') == 1
+    assert fresh_cache.stats()['hits'] == 2
+
+
+def test_job_versions_expire_after_the_entries_they_guard(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(job_cache.time, 'monotonic', lambda: now[0])
+    cache = JobCache(LocalCacheBackend(), ttl=10)
+
+    cache.set_job('job-1', cache.job_version('job-1'), {'job_id': 'job-1'})
+    cache.invalidate_job('job-1')
+    assert cache.job_version('job-1') == 1
+
+    now[0] += 19
+    assert cache.job_version('job-1') == 1
+    now[0] += 2
+    assert cache.job_version('job-1') == 0
+    # Anything stored under version 0 expired long before the version did
+    assert cache.get_job('job-1', 0) is None
+
+
+def test_expired_versions_are_swept(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(job_cache.time, 'monotonic', lambda: now[0])
+    backend = LocalCacheBackend()
+    cache = JobCache(backend, ttl=10)
+
+    for i in range(job_cache.COUNTER_SWEEP_EVERY - 1):
+        cache.invalidate_job(f'job-{i}')
+    cache.invalidate_feed(main.JOBS_FEED)
+    now[0] += 21
+    for i in range(job_cache.COUNTER_SWEEP_EVERY):
+        cache.invalidate_job('job-new')
+
+    # Feed generations never expire; only the live job version is left beside them
+    assert set(backend._counters) == {f'gen:{main.JOBS_FEED}', 'ver:job-new'}
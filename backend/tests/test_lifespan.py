@@ -0,0 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+def test_aws_executor_is_shut_down_with_the_app(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(main, 'aws_executor', executor)
+
+    with TestClient(main.app):
+        assert executor.submit(lambda: 1).result() == 1
+
+    assert executor._shutdown
@@ -0,0 +1,33 @@
+import socket
+
+import boto3
+import pytest
+from botocore.config import Config
+from botocore.exceptions import EndpointConnectionError
+
+from metrics import MetricsRegistry
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def unreachable_dynamodb():
+    config = Config(retries={'max_attempts': 1, 'mode': 'standard'}, connect_timeout=1, read_timeout=1)
+    return boto3.resource('dynamodb', endpoint_url=f'http://127.0.0.1:{closed_port()}', config=config)
+
+
+def test_connection_error_surfaces_and_is_counted(unreachable_dynamodb):
+    registry = MetricsRegistry()
+    registry.instrument_client(unreachable_dynamodb.meta.client)
+
+    with pytest.raises(EndpointConnectionError):
+        unreachable_dynamodb.Table('jobs').get_item(Key={'job_id': 'job-1'})
+
+    rendered = registry.render()
+    assert ('aws_call_errors_total{service="dynamodb",operation="GetItem",code="EndpointConnectionError"} 1'
+            in rendered)
+    assert 'aws_call_duration_seconds_count{service="dynamodb",operation="GetItem"} 1' in rendered
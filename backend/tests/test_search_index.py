@@ -0,0 +1,123 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from job_search import JobSearchIndex
+from conftest import FakeTable, make_jobs
+
+
+class BlockingScanTable(FakeTable):
+    """Scan waits until the test releases it, holding a rebuild open"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.release = threading.Event()
+
+    def scan(self, **kwargs):
+        self.release.wait(timeout=5)
+        return super().scan(**kwargs)
+
+
+@pytest.fixture
+def search_state(monkeypatch):
+    for name, value in (('search_index', None), ('search_index_built_at', 0.0),
+                        ('search_index_refresh', None), ('search_index_pending_discards', None)):
+        monkeypatch.setattr(main, name, value)
+
+
+def test_stale_index_keeps_serving_while_rebuilding(search_state, monkeypatch):
+    async def scenario():
+        table = BlockingScanTable('jobs', 'date', make_jobs(3))
+        monkeypatch.setattr(main, 'jobs_table', table)
+        table.release.set()
+        old = await main.get_search_index()
+        assert len(old) == 3
+
+        table.release.clear()
+        table.items.update({job['job_id']: job for job in make_jobs(5)})
+        main.search_index_built_at = 0.0
+
+        # Returns at once with the old index while the scan is still blocked
+        assert await main.get_search_index() is old
+        assert not main.search_index_refresh.done()
+        assert await main.get_search_index() is old
+
+        # A delete during the rebuild is applied to the new index as well
+        main.discard_from_search_index(['job-0004'])
+        table.release.set()
+        await main.search_index_refresh
+
+        new = await main.get_search_index()
+        assert new is not old
+        assert len(new) == 4
+        assert 'job-0004' not in [job['job_id'] for job in new.search(limit=10)[0]]
+
+    asyncio.run(scenario())
+
+
+def test_failed_rebuild_keeps_the_old_index(search_state, monkeypatch):
+    async def scenario():
+        table = FakeTable('jobs', 'date', make_jobs(2))
+        monkeypatch.setattr(main, 'jobs_table', table)
+        old = await main.get_search_index()
+
+        def broken_scan(**kwargs):
+            raise RuntimeError('scan failed')
+
+        monkeypatch.setattr(table, 'scan', broken_scan)
+        main.search_index_built_at = 0.0
+        assert await main.get_search_index() is old
+        await main.search_index_refresh
+        assert main.search_index is old
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize('text', [None, 'engineer'])
+def test_bare_date_to_includes_the_whole_day(text):
+    index = JobSearchIndex([
+        {'job_id': 'early', 'title': 'Engineer', 'date': '2024-03-01T00:00:00'},
+        {'job_id': 'late', 'title': 'Engineer', 'date': '2024-03-01T23:59:59.999999'},
+        {'job_id': 'spaced', 'title': 'Engineer', 'date': '2024-03-01 18:30'},
+        {'job_id': 'next-day', 'title': 'Engineer', 'date': '2024-03-02T00:00:00'},
+    ])
+
+    jobs, total, _ = index.search(text=text, date_from='2024-03-01', date_to='2024-03-01')
+    assert {job['job_id'] for job in jobs} == {'early', 'late', 'spaced'}
+    assert total == 3
+
+    # A full timestamp bound is still exact
+    ids = {job['job_id'] for job in index.search(text=text, date_to='2024-03-01T12:00:00')[0]}
+    assert 'early' in ids
+    assert not ids & {'late', 'next-day'}
+
+
+def test_similarity_sort_orders_by_vector_match_percentage():
+    jobs = [
+        {'job_id': f'job-{i}', 'title': 'Engineer', 'date': f'2024-01-0{i + 1}',
+         'match_percentage': 90 - i, 'vector_match_percentage': score}
+        for i, score in enumerate([20, 75, 40])
+    ]
+    jobs.append({'job_id': 'unscored', 'title': 'Engineer', 'date': '2024-01-09'})
+    index = JobSearchIndex(jobs)
+
+    for text in (None, 'engineer'):
+        ranked = [job['job_id'] for job in index.search(text=text, sort='similarity')[0]]
+        assert ranked == ['job-1', 'job-2', 'job-0', 'unscored']
+        assert [job['job_id'] for job in index.search(text=text, sort='match')[0]][0] == 'job-0'
+
+
+def test_search_endpoint_returns_vector_match_percentage(search_state, monkeypatch):
+    jobs = make_jobs(3)
+    for job, score in zip(jobs, [10, 80, 50]):
+        job['vector_match_percentage'] = score
+    monkeypatch.setattr(main, 'jobs_table', FakeTable('jobs', 'date', jobs))
+    client = TestClient(main.app)
+
+    results = client.get('/api/jobs/search', params={'sort': 'similarity'}).json()['results']
+
+    assert [(job['job_id'], job['vector_match_percentage']) for job in results] == [
+        ('job-0001', 80), ('job-0002', 50), ('job-0000', 10)]
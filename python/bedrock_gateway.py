@@ -0,0 +1,235 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from dotenv import load_dotenv
+
+# Get the path to the parent directory (where .env is located)
+parent_dir = Path(__file__).parent.parent
+env_path = parent_dir / '.env'
+
+# Load environment variables from .env file
+load_dotenv(dotenv_path=env_path)
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# AWS Configuration
+AWS_REGION = os.getenv('AWS_REGION', 'us-west-2')
+BEDROCK_MAX_POOL_CONNECTIONS = int(os.getenv('BEDROCK_MAX_POOL_CONNECTIONS', '16'))
+BEDROCK_REQUESTS_PER_SECOND = float(os.getenv('BEDROCK_REQUESTS_PER_SECOND', '4'))
+BEDROCK_BURST = int(os.getenv('BEDROCK_BURST', '8'))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv('BEDROCK_BREAKER_FAILURES', '5'))
+BREAKER_RESET_SECONDS = float(os.getenv('BEDROCK_BREAKER_RESET_SECONDS', '30'))
+BACKOFF_BASE = 1  # seconds
+BACKOFF_MAX = 20  # seconds
+THROTTLING_CODES = {'ThrottlingException', 'TooManyRequestsException', 'ServiceQuotaExceededException'}
+
+# Retries are owned by the callers so throttling stays visible to them
+bedrock_config = Config(
+    max_pool_connections=BEDROCK_MAX_POOL_CONNECTIONS,
+    connect_timeout=5,
+    read_timeout=60,
+    tcp_keepalive=True,
+    retries={'max_attempts': 1, 'mode': 'standard'}
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Bedrock while the circuit breaker is open"""
+
+
+def is_throttling_error(error: Exception) -> bool:
+    return isinstance(error, ClientError) and error.response.get('Error', {}).get('Code') in THROTTLING_CODES
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE) -> float:
+    """Full-jitter exponential backoff for the given zero-based attempt"""
+    return random.uniform(0, min(BACKOFF_MAX, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """Requests-per-second quota shared by every thread in the process"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a token is available and return the time spent waiting"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class CircuitBreaker:
+    """Fails fast after repeated errors, letting one trial call through after reset_seconds"""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> None:
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at >= self.reset_seconds and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return
+        raise CircuitOpenError("Bedrock circuit breaker is open")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """End a half-open trial that proved nothing (e.g. throttled) so the next call can try again"""
+        with self._lock:
+            self.trial_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Count a failure; returns True if it opened the circuit"""
+        with self._lock:
+            self.failures += 1
+            reopened = self.trial_in_flight
+            self.trial_in_flight = False
+            if reopened or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+
+class BedrockGateway:
+    """Single bedrock-runtime client shared by the scoring and enrichment code.
+
+    The client is created on first use. Every call passes through a shared
+    token bucket and circuit breaker, and its latency and token usage are
+    recorded per caller.
+    """
+
+    def __init__(self):
+        self._client = None
+        self._client_lock = threading.Lock()
+        self.bucket = TokenBucket(BEDROCK_REQUESTS_PER_SECOND, BEDROCK_BURST)
+        self.breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS)
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = defaultdict(lambda: {
+            "calls": 0, "errors": 0, "throttled": 0, "short_circuited": 0,
+            "input_tokens": 0, "output_tokens": 0,
+            "latency_total": 0.0, "latency_max": 0.0, "quota_wait_total": 0.0
+        })
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    session = boto3.Session(
+                        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+                        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+                        aws_session_token=os.getenv('AWS_SESSION_TOKEN'),
+                        region_name=AWS_REGION
+                    )
+                    self._client = session.client('bedrock-runtime', region_name=AWS_REGION, config=bedrock_config)
+                    logger.info("Successfully initialized AWS Bedrock client")
+        return self._client
+
+    def invoke(self, model_id: str, prompt: str, max_tokens: int, temperature: float = 0.1,
+               caller: str = 'default', client=None) -> Tuple[str, Dict[str, Any]]:
+        """Make one Anthropic messages call and return its text and token usage.
+
+        Errors propagate so the caller decides whether and when to retry.
+        """
+        stats = self._caller_stats(caller)
+        try:
+            self.breaker.allow()
+        except CircuitOpenError:
+            with self._stats_lock:
+                stats["short_circuited"] += 1
+            raise
+        waited = self.bucket.acquire()
+
+        start = time.perf_counter()
+        try:
+            response = (client or self.client).invoke_model(
+                modelId=model_id,
+                body=json.dumps({
+                    'messages': [{
+                        'role': 'user',
+                        'content': prompt
+                    }],
+                    'max_tokens': max_tokens,
+                    'temperature': temperature,
+                    'anthropic_version': 'bedrock-2023-05-31'
+                })
+            )
+            response_body = json.loads(response['body'].read())
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            throttled = is_throttling_error(e)
+            # Throttling is the quota's job; only real failures count toward opening the circuit
+            if throttled:
+                self.breaker.release_trial()
+            elif self.breaker.record_failure():
+                logger.error(f"Bedrock circuit breaker opened after {self.breaker.failures} failures")
+            self._record(stats, elapsed, waited, {}, error=not throttled, throttled=throttled)
+            raise
+
+        self.breaker.record_success()
+        usage = response_body.get('usage', {})
+        self._record(stats, time.perf_counter() - start, waited, usage)
+        return response_body['content'][0]['text'], usage
+
+    def _caller_stats(self, caller: str) -> Dict[str, float]:
+        with self._stats_lock:
+            return self._stats[caller]
+
+    def _record(self, stats, elapsed: float, waited: float, usage: Dict[str, Any],
+                error: bool = False, throttled: bool = False) -> None:
+        with self._stats_lock:
+            stats["calls"] += 1
+            stats["errors"] += int(error)
+            stats["throttled"] += int(throttled)
+            stats["input_tokens"] += usage.get('input_tokens', 0)
+            stats["output_tokens"] += usage.get('output_tokens', 0)
+            stats["latency_total"] += elapsed
+            stats["latency_max"] = max(stats["latency_max"], elapsed)
+            stats["quota_wait_total"] += waited
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._stats_lock:
+            report = {caller: dict(values) for caller, values in self._stats.items()}
+        for values in report.values():
+            values["latency_avg"] = values["latency_total"] / values["calls"] if values["calls"] else 0.0
+        return report
+
+
+gateway = BedrockGateway()
@@ -0,0 +1,138 @@
+"""Bulk indexing and versioned-alias costs against a real OpenSearch, e.g. a local container.
+
+- per-document index_job calls (sampled) vs bulk_index_jobs at each BENCH_WORKERS setting
+- filtered search latency through the alias vs the concrete index behind it
+- reindex_to_version: copy into the next version and swap the alias
+
+Every index is created under BENCH_ALIAS and deleted at the end; the jobs
+alias is never touched.
+
+    docker run -p 9200:9200 -e discovery.type=single-node -e DISABLE_SECURITY_PLUGIN=true \\
+        opensearchproject/opensearch:2.11.1
+    OPENSEARCH_URL=http://localhost:9200 python python/benchmarks/bench_opensearch_bulk.py
+"""
+import logging
+import os
+import statistics
+import sys
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from opensearchpy import OpenSearch  # noqa: E402
+
+import opensearch_client  # noqa: E402
+from opensearch_client import OpenSearchClient, versioned_index_name  # noqa: E402
+from search_query import JobQuery  # noqa: E402
+
+OPENSEARCH_URL = os.getenv('OPENSEARCH_URL', 'http://localhost:9200')
+BENCH_ALIAS = os.getenv('BENCH_ALIAS', 'bench_jobs')
+BENCH_DOCS = int(os.getenv('BENCH_DOCS', '20000'))
+SINGLE_DOCS = int(os.getenv('BENCH_SINGLE_DOCS', '500'))  # one request per doc is slow, so sampled
+WORKERS = [int(n) for n in os.getenv('BENCH_WORKERS', '1,4').split(',')]
+QUERIES = int(os.getenv('BENCH_QUERIES', '200'))
+
+INDUSTRIES = ['TECH', 'FINANCE', 'MEDICAL', 'RETAIL', 'SOCIAL']
+JOB_TYPES = ['FULL_TIME', 'CONTRACT', 'PART_TIME', 'INTERNSHIP']
+EXP_LEVELS = ['ENTRY', 'MID', 'SENIOR']
+
+
+class UnsignedOpenSearchClient(OpenSearchClient):
+    """OpenSearchClient for an endpoint without SigV4 signing, such as a local container"""
+
+    def __init__(self, url):
+        self.url = url
+        super().__init__(urlparse(url).hostname)
+
+    def _create_client(self):
+        return OpenSearch(
+            hosts=[self.url],
+            pool_maxsize=opensearch_client.OPENSEARCH_POOL_MAXSIZE,
+            http_compress=opensearch_client.OPENSEARCH_HTTP_COMPRESS,
+            timeout=opensearch_client.OPENSEARCH_TIMEOUT
+        )
+
+
+def make_docs(count):
+    """Documents shaped like transform_job_data output"""
+    return [
+        {
+            'job_id': f'job-{i:07d}',
+            'title': f'Senior Python Engineer {i % 97}',
+            'company': f'Company {i % 211}',
+            'location': ['Remote', 'Seattle, WA', 'New York, NY', 'Austin, TX'][i % 4],
+            'description': 'Build and operate data pipelines on AWS with Python, FastAPI and DynamoDB. ' * 8,
+            'posted_date': f'2024-{1 + i % 12:02d}-{1 + i % 28:02d}T12:00:00',
+            'job_type': JOB_TYPES[i % len(JOB_TYPES)],
+            'exp_level': EXP_LEVELS[i % len(EXP_LEVELS)],
+            'industry': INDUSTRIES[i % len(INDUSTRIES)],
+            'link': f'https://example.com/jobs/{i}',
+            'company_link': f'https://example.com/company/{i % 211}',
+            'company_img_link': '',
+            'processed_at': '2024-06-01T00:00:00',
+            'variants': [],
+        }
+        for i in range(count)
+    ]
+
+
+def search_latency(client, index, query):
+    """Median and p95 of QUERIES searches, in seconds"""
+    times = []
+    for _ in range(QUERIES):
+        start = time.perf_counter()
+        client.search_jobs(index, query)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), statistics.quantiles(times, n=20)[18]
+
+
+def run(client, docs, created):
+    print(f"{BENCH_DOCS} documents against {OPENSEARCH_URL}")
+
+    index = f'{BENCH_ALIAS}_single'
+    created.append(index)
+    client.create_index(index)
+    start = time.perf_counter()
+    for doc in docs[:SINGLE_DOCS]:
+        client.index_job(index, doc)
+    client.refresh(index)
+    seconds = time.perf_counter() - start
+    print(f"{'index_job, one request per doc':<36}{SINGLE_DOCS / seconds:>10.0f} docs/s")
+
+    for workers in WORKERS:
+        index = f'{BENCH_ALIAS}_bulk{workers}'
+        created.append(index)
+        client.create_index(index)
+        opensearch_client.BULK_MAX_WORKERS = workers
+        summary = client.bulk_index_jobs(index, docs)
+        print(f"{f'bulk_index_jobs, {workers} worker(s)':<36}{summary['succeeded'] / summary['seconds']:>10.0f} docs/s"
+              f"  ({summary['failed']} failed)")
+
+    created.extend(versioned_index_name(BENCH_ALIAS, version) for version in (1, 2))
+    client.ensure_index(BENCH_ALIAS, version=1)
+    client.bulk_index_jobs(BENCH_ALIAS, docs)
+    query = JobQuery(industry=['TECH'], exp_level=['SENIOR'], page_size=50)
+    for label, target in (('alias', BENCH_ALIAS), ('concrete index', versioned_index_name(BENCH_ALIAS, 1))):
+        median, p95 = search_latency(client, target, query)
+        print(f"{f'search via {label}':<36}{median * 1000:>10.1f} ms p50 {p95 * 1000:>8.1f} ms p95")
+
+    start = time.perf_counter()
+    client.reindex_to_version(BENCH_ALIAS, 2, delete_old=True)
+    seconds = time.perf_counter() - start
+    count = client.client.count(index=BENCH_ALIAS)['count']
+    print(f"{'reindex_to_version + alias swap':<36}{seconds:>10.1f} s  ({count} docs behind the alias)")
+    median, p95 = search_latency(client, BENCH_ALIAS, query)
+    print(f"{'search via alias after the swap':<36}{median * 1000:>10.1f} ms p50 {p95 * 1000:>8.1f} ms p95")
+
+
+if __name__ == "__main__":
+    # Per-request info logs would dominate the per-document baseline
+    logging.getLogger('opensearch_client').setLevel(logging.WARNING)
+    client = UnsignedOpenSearchClient(OPENSEARCH_URL)
+    created = []
+    try:
+        run(client, make_docs(BENCH_DOCS), created)
+    finally:
+        for index in created:
+            client.client.indices.delete(index=index, ignore=[404])
@@ -0,0 +1,38 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from sqlite_cache import SQLiteStore, normalize_text
+
+CLASSIFICATION_CACHE_PATH = os.getenv(
+    'CLASSIFICATION_CACHE_PATH', str(Path(__file__).parent / 'classification_cache.sqlite3'))
+CLASSIFICATION_CACHE_MAX_ENTRIES = int(os.getenv('CLASSIFICATION_CACHE_MAX_ENTRIES', '20000'))
+CLASSIFICATION_CACHE_EVICTION = os.getenv('CLASSIFICATION_CACHE_EVICTION', 'lru')  # 'lru' or 'fifo'
+
+
+def classification_key(description: str, title: str, model_id: str) -> str:
+    content = f"{normalize_text(title)}\x1f{normalize_text(description)}\x1f{model_id}"
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class ClassificationCache:
+    """Persistent job_type/exp_level/industry results keyed on normalized content,
+    shared by every scraper process that points at the same file"""
+
+    def __init__(self, path: str = CLASSIFICATION_CACHE_PATH,
+                 max_entries: int = CLASSIFICATION_CACHE_MAX_ENTRIES,
+                 eviction: str = CLASSIFICATION_CACHE_EVICTION):
+        self.store = SQLiteStore(path, 'classifications', 'details', max_entries, eviction=eviction)
+
+    def get(self, description: str, title: str, model_id: str) -> Optional[Dict[str, str]]:
+        return self.store.get(classification_key(description, title, model_id))
+
+    def put(self, description: str, title: str, model_id: str, details: Dict[str, str]) -> None:
+        self.store.put(classification_key(description, title, model_id), details)
+
+    def stats(self) -> Dict[str, float]:
+        return self.store.stats()
+
+    def close(self) -> None:
+        self.store.close()
@@ -0,0 +1,181 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bedrock_gateway import backoff_delay, is_throttling_error
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SCORING_MAX_CONCURRENCY = int(os.getenv('SCORING_MAX_CONCURRENCY', '8'))
+SCORING_INITIAL_CONCURRENCY = int(os.getenv('SCORING_INITIAL_CONCURRENCY', '2'))
+MAX_RETRIES = 3
+RETRY_DELAY = 1  # seconds, base of the jittered exponential backoff
+
+# Returned when every attempt failed; flagged so it is never cached as a real verdict
+FAILED_VERDICT = {
+    "keep": False,
+    "match_percentage": 0,
+    "scoring_failed": True
+}
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit: halve on throttling, grow by one per window of successes"""
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 16):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, throttled: bool = False):
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit / 2)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class ConcurrentScorer:
+    """Runs a keep/reject scoring function on a bounded pool with adaptive concurrency.
+
+    Throttled calls shrink the limit and are retried after a jittered backoff
+    that is spent outside the limiter, so other calls keep flowing. With a
+    batch_fn, jobs are grouped into batch_size calls and any job the batch
+    does not return a verdict for is re-scored on its own with score_fn.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]],
+        max_concurrency: int = SCORING_MAX_CONCURRENCY,
+        initial_concurrency: int = SCORING_INITIAL_CONCURRENCY,
+        max_retries: int = MAX_RETRIES,
+        retry_delay: float = RETRY_DELAY,
+        batch_fn: Optional[Callable[[List[Dict[str, Any]], Dict[str, Any]], Dict[str, Dict[str, Any]]]] = None,
+        batch_size: int = 1
+    ):
+        self.score_fn = score_fn
+        self.batch_fn = batch_fn
+        self.batch_size = batch_size if batch_fn else 1
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.limiter = AdaptiveLimiter(initial_concurrency, 1, max_concurrency)
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='scorer')
+        self._pending = set()
+        self._batch: List[Tuple[Dict[str, Any], Optional[Callable]]] = []
+        self._batch_resume = None
+        self._lock = threading.Lock()
+        # Separate from _lock because batches are dispatched while _lock is held
+        self._pending_lock = threading.Lock()
+        self.stats = {"submitted": 0, "scored": 0, "errors": 0, "throttled": 0}
+
+    def submit(self, job: Dict[str, Any], resume: Dict[str, Any],
+               callback: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None):
+        """Queue a job for scoring; callback(job, verdict) runs on the worker thread"""
+        with self._lock:
+            self.stats["submitted"] += 1
+        if self.batch_size <= 1:
+            self._dispatch(self._score, job, resume, callback)
+            return
+
+        with self._lock:
+            if self._batch and self._batch_resume is not resume:
+                self._flush_locked()
+            self._batch.append((job, callback))
+            self._batch_resume = resume
+            if len(self._batch) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self):
+        """Dispatch a partially filled batch"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self._dispatch(self._score_batch, batch, self._batch_resume)
+
+    def _dispatch(self, fn, *args) -> Future:
+        future = self.executor.submit(fn, *args)
+        with self._pending_lock:
+            self._pending.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future: Future):
+        with self._pending_lock:
+            self._pending.discard(future)
+
+    def _deliver(self, job, verdict, callback):
+        if callback:
+            try:
+                callback(job, verdict)
+            except Exception as e:
+                logger.error(f"Error handling verdict for job {job.get('job_id', 'UNKNOWN')}: {str(e)}")
+
+    def _score(self, job, resume, callback):
+        verdict = self._call_with_retries(self.score_fn, job, resume, dict(FAILED_VERDICT))
+        self._deliver(job, verdict, callback)
+        return verdict
+
+    def _score_batch(self, batch, resume):
+        jobs = [job for job, _ in batch]
+        verdicts = self._call_with_retries(self.batch_fn, jobs, resume, {})
+        for job, callback in batch:
+            verdict = verdicts.get(job['job_id'])
+            if verdict is None:
+                verdict = self._call_with_retries(self.score_fn, job, resume, dict(FAILED_VERDICT))
+            self._deliver(job, verdict, callback)
+
+    def _call_with_retries(self, fn, item, resume, fallback):
+        for attempt in range(self.max_retries):
+            self.limiter.acquire()
+            try:
+                result = fn(item, resume)
+            except Exception as e:
+                throttled = is_throttling_error(e)
+                self.limiter.release(throttled=throttled)
+                with self._lock:
+                    self.stats["throttled" if throttled else "errors"] += 1
+                logger.warning(f"Scoring attempt {attempt + 1} failed: {str(e)}")
+                if attempt == self.max_retries - 1:
+                    logger.error(f"Failed to score after {self.max_retries} attempts")
+                    return fallback
+                time.sleep(backoff_delay(attempt, self.retry_delay))
+                continue
+            self.limiter.release()
+            with self._lock:
+                self.stats["scored"] += 1
+            return result
+
+    def drain(self):
+        """Block until every submitted job has been scored and handled"""
+        self.flush()
+        while True:
+            with self._pending_lock:
+                pending = list(self._pending)
+            if not pending:
+                return
+            for future in pending:
+                future.exception()
+
+    def shutdown(self):
+        self.drain()
+        self.executor.shutdown(wait=True)
+        logger.info(f"Scoring finished: {self.stats}, final concurrency limit {self.limiter.limit:.1f}")
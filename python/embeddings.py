@@ -0,0 +1,91 @@
+import logging
+import os
+import zlib
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+from lexical_prefilter import STOP_WORDS, TOKEN_PATTERN
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'hashing')
+EMBEDDING_DIM = int(os.getenv('EMBEDDING_DIM', '384'))
+EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', '256'))
+
+
+class HashingEmbedder:
+    """Offline embedder: signed feature hashing of unigrams and bigrams.
+
+    Deterministic across processes and runs, so vectors written today stay
+    comparable with vectors computed later for a resume or query.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def _features(self, text: str):
+        tokens = [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOP_WORDS]
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        hashes = np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.int64, count=len(grams))
+        # Low bits pick the column, one higher bit picks the sign so collisions tend to cancel
+        return hashes % self.dim, np.where(hashes & (1 << 31), -1.0, 1.0).astype(np.float32)
+
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts into an (n, dim) float32 matrix of L2-normalized rows"""
+        rows, cols, signs = [], [], []
+        for row, text in enumerate(texts):
+            columns, sign = self._features(text or '')
+            rows.append(np.full(len(columns), row, dtype=np.int64))
+            cols.append(columns)
+            signs.append(sign)
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        if rows:
+            np.add.at(matrix, (np.concatenate(rows), np.concatenate(cols)), np.concatenate(signs))
+        # Sublinear term frequency, keeping the sign of each bucket
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+EMBEDDING_BACKENDS: Dict[str, Callable[[int], object]] = {
+    'hashing': HashingEmbedder
+}
+
+_engine = None
+
+
+def register_backend(name: str, factory: Callable[[int], object]) -> None:
+    """Make another embedder (anything with dim and embed_batch) selectable via EMBEDDING_BACKEND"""
+    EMBEDDING_BACKENDS[name] = factory
+
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        if EMBEDDING_BACKEND not in EMBEDDING_BACKENDS:
+            raise ValueError(f"Unknown embedding backend: {EMBEDDING_BACKEND}")
+        _engine = EMBEDDING_BACKENDS[EMBEDDING_BACKEND](EMBEDDING_DIM)
+        logger.info(f"Using {EMBEDDING_BACKEND} embeddings with {EMBEDDING_DIM} dimensions")
+    return _engine
+
+
+def embed_texts(texts: Sequence[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> np.ndarray:
+    """Embed any number of texts, batch_size at a time"""
+    engine = get_engine()
+    if not texts:
+        return np.zeros((0, engine.dim), dtype=np.float32)
+    batches = [engine.embed_batch(texts[start:start + batch_size]) for start in range(0, len(texts), batch_size)]
+    return np.vstack(batches).astype(np.float32, copy=False)
+
+
+def job_text(job: Dict) -> str:
+    return f"{job.get('title', '')} {job.get('description', '')}"
+
+
+def vector_to_list(vector: np.ndarray) -> List[float]:
+    """Plain floats for JSON, rounded to what float32 actually holds"""
+    return [float(f"{value:.6g}") for value in vector.astype(np.float32)]
@@ -0,0 +1,130 @@
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '200'))
+PIPELINE_TRANSFORM_WORKERS = int(os.getenv('PIPELINE_TRANSFORM_WORKERS', '4'))
+PIPELINE_FLUSH_SIZE = int(os.getenv('PIPELINE_FLUSH_SIZE', '100'))
+PIPELINE_FLUSH_SECONDS = float(os.getenv('PIPELINE_FLUSH_SECONDS', '10'))
+
+_STOP = object()
+
+
+class StreamingPipeline:
+    """scrape -> transform -> sink with bounded queues between the stages.
+
+    submit() blocks when the transform queue is full, and transform workers
+    block when the sink queue is full, so a slow sink throttles everything
+    upstream instead of letting memory grow. The sink receives batches of
+    up to flush_size items, or whatever has arrived after flush_seconds.
+    """
+
+    def __init__(
+        self,
+        transform_fn: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+        sink_fn: Callable[[List[Dict[str, Any]]], None],
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        transform_workers: int = PIPELINE_TRANSFORM_WORKERS,
+        flush_size: int = PIPELINE_FLUSH_SIZE,
+        flush_seconds: float = PIPELINE_FLUSH_SECONDS
+    ):
+        self.transform_fn = transform_fn
+        self.sink_fn = sink_fn
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self.raw_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.sink_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self.stats = {
+            "submitted": 0, "transformed": 0, "dropped": 0, "sunk": 0,
+            "flushes": 0, "sink_errors": 0, "blocked_seconds": 0.0
+        }
+        self._workers = [
+            threading.Thread(target=self._transform_loop, name=f'transform-{i}', daemon=True)
+            for i in range(transform_workers)
+        ]
+        self._sink_thread = threading.Thread(target=self._sink_loop, name='sink', daemon=True)
+        for worker in self._workers:
+            worker.start()
+        self._sink_thread.start()
+
+    def _count(self, key: str, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def submit(self, item: Dict[str, Any]) -> None:
+        """Queue a raw item for transformation, blocking while the pipeline is saturated"""
+        start = time.perf_counter()
+        self.raw_queue.put(item)
+        self._count("submitted")
+        self._count("blocked_seconds", time.perf_counter() - start)
+
+    def submit_transformed(self, item: Dict[str, Any]) -> None:
+        """Queue an item that needs no transformation straight to the sink"""
+        self.sink_queue.put(item)
+
+    def _transform_loop(self):
+        while True:
+            item = self.raw_queue.get()
+            if item is _STOP:
+                return
+            try:
+                transformed = self.transform_fn(item)
+            except Exception as e:
+                logger.error(f"Error transforming item {item.get('job_id', 'UNKNOWN')}: {str(e)}")
+                transformed = None
+            if transformed is None:
+                self._count("dropped")
+                continue
+            self._count("transformed")
+            self.sink_queue.put(transformed)
+
+    def _sink_loop(self):
+        batch: List[Dict[str, Any]] = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.sink_queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                self._flush(batch)
+                return
+            if item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_seconds
+            if len(batch) >= self.flush_size or (deadline is not None and time.monotonic() >= deadline):
+                self._flush(batch)
+                batch, deadline = [], None
+
+    def _flush(self, batch: List[Dict[str, Any]]):
+        if not batch:
+            return
+        try:
+            self.sink_fn(batch)
+            self._count("sunk", len(batch))
+        except Exception as e:
+            # The batch is lost but the pipeline keeps running for the rest of the scrape
+            logger.error(f"Error flushing {len(batch)} items: {str(e)}")
+            self._count("sink_errors")
+        self._count("flushes")
+
+    def close(self) -> Dict[str, Any]:
+        """Drain both stages, flush the final batch and return the run's stats"""
+        for _ in self._workers:
+            self.raw_queue.put(_STOP)
+        for worker in self._workers:
+            worker.join()
+        self.sink_queue.put(_STOP)
+        self._sink_thread.join()
+        with self._lock:
+            return dict(self.stats)
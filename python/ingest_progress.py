@@ -0,0 +1,85 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# The backend watches this file and pushes every change to waiting clients
+INGEST_PROGRESS_PATH = os.getenv(
+    'INGEST_PROGRESS_PATH',
+    os.path.join(tempfile.gettempdir(), 'matchmemaybe_ingest_progress.json')
+)
+PUBLISH_INTERVAL = 0.5  # seconds between routine progress writes
+
+
+class IngestProgress:
+    """Counters for one scrape run, published atomically to a local JSON file"""
+
+    def __init__(self, path: str = INGEST_PROGRESS_PATH, publish_interval: float = PUBLISH_INTERVAL):
+        self.path = path
+        self.publish_interval = publish_interval
+        self._lock = threading.Lock()
+        self._last_publish = 0.0
+        self.state = self._fresh_state(0)
+
+    @staticmethod
+    def _fresh_state(queries_total: int) -> Dict[str, Any]:
+        return {
+            "status": "processing",
+            "queries_total": queries_total,
+            "queries_done": 0,
+            "jobs_scraped": 0,
+            "jobs_scored": 0,
+            "jobs_prefiltered": 0,
+            "jobs_deduplicated": 0,
+            "jobs_kept": 0,
+            "started_at": datetime.now().isoformat(),
+            "updated_at": datetime.now().isoformat()
+        }
+
+    def reset(self, queries_total: int = 0):
+        """Start a new run and announce it to listeners"""
+        with self._lock:
+            self.state = self._fresh_state(queries_total)
+        self.publish(force=True)
+
+    def increment(self, counter: str, amount: int = 1):
+        with self._lock:
+            self.state[counter] += amount
+        self.publish()
+
+    def finish(self, status: str = "completed"):
+        with self._lock:
+            self.state["status"] = status
+        self.publish(force=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.state)
+
+    def publish(self, force: bool = False):
+        """Write the current counters, rate limited unless forced"""
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_publish < self.publish_interval:
+                return
+            self._last_publish = now
+            self.state["updated_at"] = datetime.now().isoformat()
+            payload = json.dumps(self.state)
+
+        try:
+            directory = os.path.dirname(self.path) or '.'
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.ingest_progress_')
+            with os.fdopen(fd, 'w') as f:
+                f.write(payload)
+            # Readers never see a half-written file
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Error publishing ingest progress: {str(e)}")
@@ -0,0 +1,123 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from job_transformer import normalize_company, normalize_title
+from lexical_prefilter import STOP_WORDS, TOKEN_PATTERN
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SIMHASH_MAX_DISTANCE = int(os.getenv('SIMHASH_MAX_DISTANCE', '6'))  # differing bits out of 64
+SHINGLE_SIZE = 3
+BIT_POSITIONS = np.arange(64, dtype=np.uint64)
+
+# Fields kept for each duplicate attached to its representative
+VARIANT_FIELDS = ('job_id', 'place', 'date', 'link')
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over word shingles; near-identical texts differ in few bits"""
+    tokens = [t for t in TOKEN_PATTERN.findall((text or '').lower()) if t not in STOP_WORDS]
+    shingles = {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(max(1, len(tokens) - SHINGLE_SIZE + 1))}
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little') for s in shingles],
+        dtype=np.uint64
+    )
+    bits = (hashes[:, None] >> BIT_POSITIONS) & np.uint64(1)
+    votes = bits.sum(axis=0).astype(np.int64) * 2 - len(hashes)
+    return int(np.packbits((votes > 0)[::-1].astype(np.uint8)).view('>u8')[0])
+
+
+def cluster_key(job: Dict[str, Any]) -> str:
+    return f"{normalize_title(job.get('title') or '')}|{normalize_company(job.get('company') or '')}"
+
+
+def variant_summary(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: job.get(field) for field in VARIANT_FIELDS}
+
+
+class DuplicateDetector:
+    """Groups reposts of the same role so only one representative per cluster is scored.
+
+    Candidates share a normalized title and company; within that group a job
+    joins the first cluster whose description SimHash is within max_distance bits.
+    """
+
+    def __init__(self, max_distance: int = SIMHASH_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self._groups: Dict[str, List[tuple]] = defaultdict(list)  # cluster_key -> [(simhash, rep_id)]
+        self._clusters: Dict[str, tuple] = {}  # rep_id -> (cluster_key, simhash)
+        self._pending: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._verdicts: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"jobs": 0, "clusters": 0, "duplicates": 0}
+
+    def assign(self, job: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Return (representative job_id, its verdict if already known).
+
+        A job that starts a new cluster is its own representative. Otherwise,
+        while the representative has no verdict, the duplicate is queued on it
+        in the same step, so it cannot be lost to a representative that is
+        dropped in between. Only these waiting duplicates are held; resolve()
+        hands them off.
+        """
+        key = cluster_key(job)
+        fingerprint = simhash(job.get('description') or '')
+        with self._lock:
+            self.stats["jobs"] += 1
+            for other, rep_id in self._groups[key]:
+                if bin(fingerprint ^ other).count('1') <= self.max_distance:
+                    self.stats["duplicates"] += 1
+                    verdict = self._verdicts.get(rep_id)
+                    if verdict is None:
+                        self._pending[rep_id].append(job)
+                    return rep_id, verdict
+            self._groups[key].append((fingerprint, job['job_id']))
+            self._clusters[job['job_id']] = (key, fingerprint)
+            self.stats["clusters"] += 1
+            return job['job_id'], None
+
+    def promote_next(self, rep_id: str) -> Optional[Dict[str, Any]]:
+        """Give up on a representative that could not be processed.
+
+        The first duplicate still waiting on it becomes the cluster's
+        representative and is returned, so the caller can process it instead.
+        If none is waiting, the cluster is dissolved and later copies start a new one.
+        """
+        with self._lock:
+            key, fingerprint = self._clusters.pop(rep_id)
+            entries = self._groups[key]
+            index = entries.index((fingerprint, rep_id))
+            pending = self._pending.pop(rep_id, [])
+            if not pending:
+                del entries[index]
+                self.stats["clusters"] -= 1
+                return None
+            promoted = pending[0]
+            new_id = promoted['job_id']
+            entries[index] = (fingerprint, new_id)
+            self._clusters[new_id] = (key, fingerprint)
+            self._pending[new_id] = pending[1:]
+            self.stats["duplicates"] -= 1
+            return promoted
+
+    def resolve(self, rep_id: str, verdict: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Store the representative's verdict and return duplicates that arrived before it"""
+        with self._lock:
+            self._verdicts[rep_id] = verdict
+            return self._pending.pop(rep_id, [])
+
+    def report(self) -> Dict[str, int]:
+        with self._lock:
+            report = dict(self.stats)
+        # Every duplicate is one scoring call and one stored document that did not happen
+        report["llm_calls_saved"] = report["duplicates"]
+        report["documents_saved"] = report["duplicates"]
+        return report
@@ -1,14 +1,14 @@
-import boto3
 import json
 import logging
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import re
-from botocore.exceptions import ClientError
 import time
 import os
+import threading
 from pathlib import Path
 from dotenv import load_dotenv
+from bedrock_gateway import gateway, backoff_delay
 
 # Get the path to the parent directory (where .env is located)
 parent_dir = Path(__file__).parent.parent
@@ -27,23 +27,88 @@ AWS_REGION = os.getenv('AWS_REGION', 'us-west-2')
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # seconds
 
-# Initialize AWS clients with error handling
-try:
-    session = boto3.Session(
-        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-        aws_session_token=os.getenv('AWS_SESSION_TOKEN'),
-        region_name=AWS_REGION
-    )
-    bedrock = session.client('bedrock-runtime', region_name=AWS_REGION)
-    logger.info("Successfully initialized AWS Bedrock client")
-except ClientError as e:
-    logger.error(f"AWS initialization error: {str(e)}")
-    raise
+KEEP_OR_REJECT_MODEL_ID = 'anthropic.claude-3-5-sonnet-20241022-v2:0'
+KEEP_OR_REJECT_BATCH_SIZE = int(os.getenv('KEEP_OR_REJECT_BATCH_SIZE', '5'))
+MAX_TOKENS_PER_VERDICT = 200
+REJECT_VERDICT = {
+    "keep": False,
+    "match_percentage": 0
+}
 
-def keep_or_reject(job: Dict[str, Any], resume: Dict[str, Any]) -> Dict[str, Any]:
-    """Use Bedrock to determine if a job should be kept based on its description"""
-    prompt = f"""Here is a job description: {json.dumps(job)}\n
+class UsageStats:
+    """Bedrock calls and tokens spent on keep/reject scoring, and what batching saved"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {
+            "calls": 0,
+            "batch_calls": 0,
+            "jobs_scored": 0,
+            "batched_jobs": 0,
+            "fallback_jobs": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "input_tokens_saved": 0
+        }
+
+    def record(self, usage: Dict[str, Any], jobs: int = 1, tokens_saved: int = 0, batch: bool = False):
+        with self._lock:
+            self.counts["calls"] += 1
+            self.counts["batch_calls"] += int(batch)
+            self.counts["jobs_scored"] += jobs
+            self.counts["batched_jobs"] += jobs if batch else 0
+            self.counts["input_tokens"] += usage.get('input_tokens', 0)
+            self.counts["output_tokens"] += usage.get('output_tokens', 0)
+            self.counts["input_tokens_saved"] += tokens_saved
+
+    def record_fallback(self, jobs: int = 1):
+        with self._lock:
+            self.counts["fallback_jobs"] += jobs
+
+    def report(self) -> Dict[str, int]:
+        with self._lock:
+            report = dict(self.counts)
+        # Jobs verdicted inside a batch would otherwise each have been a call
+        report["calls_saved"] = report["batched_jobs"] - report["batch_calls"]
+        return report
+
+usage_stats = UsageStats()
+
+def validate_verdict(verdict: Any) -> Optional[Dict[str, Any]]:
+    """Return a normalized verdict, or None if the model's answer is unusable"""
+    if not isinstance(verdict, dict) or not isinstance(verdict.get('keep'), bool):
+        return None
+    match_percentage = verdict.get('match_percentage')
+    if isinstance(match_percentage, bool) or not isinstance(match_percentage, (int, float)):
+        return None
+    if not 0 <= match_percentage <= 100:
+        return None
+    # DynamoDB rejects Python floats, and the prompt asks for a whole percentage anyway
+    match_percentage = int(round(match_percentage))
+    if not verdict['keep']:
+        return {"keep": False, "match_percentage": match_percentage}
+
+    lists = {}
+    for field in ('key_requirements', 'key_descriptions'):
+        values = verdict.get(field)
+        if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+            return None
+        lists[field] = values[:5]
+    return {"keep": True, "match_percentage": match_percentage, **lists}
+
+def extract_json(content: str) -> Optional[str]:
+    json_start = content.find('{')
+    json_end = content.rfind('}') + 1
+    if json_start == -1 or json_end == 0:
+        return None
+    return content[json_start:json_end]
+
+def invoke_claude(prompt: str, max_tokens: int, client=None) -> Tuple[str, Dict[str, Any]]:
+    """Send one prompt to the keep/reject model and return its text and token usage"""
+    return gateway.invoke(KEEP_OR_REJECT_MODEL_ID, prompt, max_tokens, caller='keep_or_reject', client=client)
+
+def build_keep_or_reject_prompt(job: Dict[str, Any], resume: Dict[str, Any]) -> str:
+    return f"""Here is a job description: {json.dumps(job)}\n
     Here is a user's resume: {json.dumps(resume)}\n
     You are being used by a job search engine to determine if this job should be kept in the database, you must ONLY return a JSON object.
     Based on the job description and the user's resume, determine whether the user has a good chance of getting an interview.
@@ -63,43 +128,99 @@ def keep_or_reject(job: Dict[str, Any], resume: Dict[str, Any]) -> Dict[str, Any
     You must ONLY return a JSON object, do not return anything else.
     """
 
+def build_batch_prompt(jobs: List[Dict[str, Any]], resume: Dict[str, Any]) -> str:
+    return f"""Here is a user's resume: {json.dumps(resume)}\n
+    Here are {len(jobs)} job descriptions, each identified by its job_id: {json.dumps(jobs)}\n
+    You are being used by a job search engine to determine which of these jobs should be kept in the database, you must ONLY return a JSON object.
+    For EACH job, based on the job description and the user's resume, determine whether the user has a good chance of getting an interview.
+    Consider the user's skills, experience, activities, projects, and education (especially whether they are still in school).
+    Return ONLY a JSON object with one entry per job_id. Use this form for a job the user has a good chance at:
+    "<job_id>": {{
+        "keep": true,
+        "key_requirements": [list of key requirements for the job, keep it to 5 max],
+        "key_descriptions": [list of key descriptions of the job, keep it to 5 max],
+        "match_percentage": 0-100 (how well the user's resume matches the job description)
+    }}
+    and this form for a job the user does not have a good chance at:
+    "<job_id>": {{
+        "keep": false,
+        "match_percentage": 0-100
+    }}
+    Every job_id must appear exactly once. You must ONLY return a JSON object, do not return anything else.
+    """
+
+def request_verdict(job: Dict[str, Any], resume: Dict[str, Any], client=None) -> Dict[str, Any]:
+    """Make a single keep/reject call to Bedrock; errors propagate to the caller"""
+    content, usage = invoke_claude(build_keep_or_reject_prompt(job, resume), MAX_TOKENS_PER_VERDICT, client)
+    usage_stats.record(usage)
+
+    # Find the JSON object in the response
+    json_str = extract_json(content)
+    if json_str is None:
+        # Raised rather than rejected, so the scorer retries and never caches it
+        raise ValueError(f"No JSON in verdict for job {job.get('job_id', 'UNKNOWN')}")
+    verdict = validate_verdict(json.loads(json_str))
+    if verdict is None:
+        raise ValueError(f"Malformed verdict for job {job.get('job_id', 'UNKNOWN')}")
+    return verdict
+
+def request_verdicts(jobs: List[Dict[str, Any]], resume: Dict[str, Any], client=None) -> Dict[str, Dict[str, Any]]:
+    """Score several jobs against one copy of the resume in a single call.
+
+    Returns verdicts only for the jobs whose entries validated; callers fall
+    back to request_verdict for the rest. Transport errors propagate.
+    """
+    prompt = build_batch_prompt(jobs, resume)
+    content, usage = invoke_claude(prompt, MAX_TOKENS_PER_VERDICT * len(jobs), client)
+
+    # Estimate what the resume and instructions would have cost once per extra job
+    job_chars = len(json.dumps(jobs))
+    shared_share = 1 - job_chars / len(prompt) if prompt else 0
+    tokens_saved = int(usage.get('input_tokens', 0) * shared_share * (len(jobs) - 1))
+    usage_stats.record(usage, jobs=len(jobs), tokens_saved=tokens_saved, batch=True)
+
+    json_str = extract_json(content)
+    try:
+        entries = json.loads(json_str) if json_str else {}
+    except json.JSONDecodeError:
+        logger.warning("Could not parse batch verdicts, falling back to single-job calls")
+        entries = {}
+    if not isinstance(entries, dict):
+        entries = {}
+
+    verdicts = {}
+    for job in jobs:
+        verdict = validate_verdict(entries.get(str(job['job_id'])))
+        if verdict is None:
+            logger.warning(f"Malformed or missing batch verdict for job {job['job_id']}")
+            continue
+        verdicts[job['job_id']] = verdict
+    usage_stats.record_fallback(len(jobs) - len(verdicts))
+    return verdicts
+
+def keep_or_reject(job: Dict[str, Any], resume: Dict[str, Any]) -> Dict[str, Any]:
+    """Use Bedrock to determine if a job should be kept based on its description"""
     for attempt in range(MAX_RETRIES):
         try:
-            response = bedrock.invoke_model(
-                modelId='anthropic.claude-3-5-sonnet-20241022-v2:0',
-                body=json.dumps({
-                    'messages': [{
-                        'role': 'user',
-                        'content': prompt
-                    }],
-                    'max_tokens': 200,
-                    'temperature': 0.1,
-                    'anthropic_version': 'bedrock-2023-05-31'
-                })
-            )
-            
-            response_body = json.loads(response['body'].read())
-            # Extract just the JSON part from the response
-            content = response_body['content'][0]['text']
-            # Find the JSON object in the response
-            json_start = content.find('{')
-            json_end = content.rfind('}') + 1
-            if json_start != -1 and json_end != -1:
-                json_str = content[json_start:json_end]
-                return json.loads(json_str)
-            else:
-                logger.error("Could not find JSON in response")
-                return {
-                    "keep": False,
-                    "match_percentage": 0
-                }
-            
+            return request_verdict(job, resume)
         except Exception as e:
             logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
             if attempt == MAX_RETRIES - 1:
                 logger.error(f"Failed to infer job details after {MAX_RETRIES} attempts")
-                return {
-                    "keep": False,
-                    "match_percentage": 0
-                }
-            time.sleep(RETRY_DELAY * (attempt + 1))
+                return dict(REJECT_VERDICT)
+            time.sleep(backoff_delay(attempt, RETRY_DELAY))
+
+def keep_or_reject_batch(jobs: List[Dict[str, Any]], resume: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Batch version of keep_or_reject: one call per chunk, single-job calls for malformed entries"""
+    verdicts = {}
+    for start in range(0, len(jobs), KEEP_OR_REJECT_BATCH_SIZE):
+        chunk = jobs[start:start + KEEP_OR_REJECT_BATCH_SIZE]
+        try:
+            verdicts.update(request_verdicts(chunk, resume))
+        except Exception as e:
+            logger.error(f"Batch scoring failed, falling back to single-job calls: {str(e)}")
+            usage_stats.record_fallback(len(chunk))
+        for job in chunk:
+            if job['job_id'] not in verdicts:
+                verdicts[job['job_id']] = keep_or_reject(job, resume)
+    return verdicts
@@ -0,0 +1,147 @@
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RULES_MIN_CONFIDENCE = float(os.getenv('RULES_MIN_CONFIDENCE', '0.75'))
+TITLE_WEIGHT = 3  # a keyword in the title outweighs several in the description
+MIN_EVIDENCE = 2.0  # weighted hits needed before a label can be fully confident
+LABELED_JOBS_PATH = Path(__file__).parent / 'fixtures' / 'labeled_jobs.jsonl'  # default benchmark sample
+
+# (field, label, weight, keywords); keywords are matched as whole words, with
+# hyphens treated as separators ('Software-Engineer' hits 'software' and
+# 'engineer') except inside a hyphenated keyword such as 'non-profit'
+RULES: List[Tuple[str, str, float, List[str]]] = [
+    ('job_type', 'FULL_TIME', 1, ['full-time', 'full time', 'permanent']),
+    ('job_type', 'CONTRACT', 1, ['contract', 'contractor', 'temporary', 'temp', 'contract-to-hire']),
+    ('job_type', 'PART_TIME', 1, ['part-time', 'part time']),
+    ('job_type', 'INTERNSHIP', 2, ['intern', 'interns', 'internship', 'co-op']),
+
+    ('exp_level', 'SENIOR', 1, ['senior', 'sr', 'lead', 'principal']),
+    ('exp_level', 'MID', 1, ['mid-level', 'mid level', 'intermediate']),
+    ('exp_level', 'ENTRY', 1, ['entry', 'entry-level', 'entry level', 'junior', 'jr', 'graduate',
+                               'new grad', 'intern', 'internship']),
+
+    # Tech roles win regardless of the company's industry, so they weigh double
+    ('industry', 'TECH', 2, ['software', 'developer', 'engineer', 'engineering', 'programming', 'technology',
+                             'tech', 'data', 'information technology', 'computer', 'systems', 'devops',
+                             'cloud', 'infrastructure', 'automation', 'test engineering', 'feature development',
+                             'machine learning', 'backend', 'frontend', 'full stack', 'full-stack']),
+    ('industry', 'MEDICAL', 1, ['healthcare', 'medical', 'clinical', 'health', 'hospital', 'patient', 'patients',
+                                'doctor', 'nurse', 'nursing', 'pharmacy', 'pharmaceutical', 'clinical research']),
+    ('industry', 'FINANCE', 1, ['bank', 'banking', 'finance', 'financial', 'investment', 'accounting', 'insurance']),
+    ('industry', 'SOCIAL', 1, ['education', 'teaching', 'teacher', 'school', 'non-profit', 'nonprofit']),
+    ('industry', 'RETAIL', 1, ['retail', 'store', 'sales', 'customer service']),
+    ('industry', 'MANUFACTURING', 1, ['manufacturing', 'production', 'factory', 'supply chain']),
+    ('industry', 'CONSULTING', 1, ['consulting', 'consultant']),
+    ('industry', 'MARKETING', 1, ['marketing', 'advertising', 'public relations']),
+    ('industry', 'LEGAL', 1, ['law', 'legal', 'attorney', 'paralegal', 'compliance']),
+]
+
+FIELDS = ('job_type', 'exp_level', 'industry')
+
+
+class RuleResult(NamedTuple):
+    details: Dict[str, str]
+    confidence: Dict[str, float]
+
+    @property
+    def confident(self) -> bool:
+        return min(self.confidence.values()) >= RULES_MIN_CONFIDENCE
+
+
+def _compile_rules():
+    keyword_labels: Dict[str, List[Tuple[str, str, float]]] = defaultdict(list)
+    for field, label, weight, keywords in RULES:
+        for keyword in keywords:
+            keyword_labels[keyword].append((field, label, weight))
+    # Longest first so a hyphenated keyword like 'contract-to-hire' is consumed
+    # whole before 'contract' can match its first part
+    alternation = '|'.join(re.escape(k) for k in sorted(keyword_labels, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{alternation})(?!\w)"), dict(keyword_labels)
+
+
+RULE_PATTERN, KEYWORD_LABELS = _compile_rules()
+
+
+def classify_with_rules(description: str, title: str) -> RuleResult:
+    """Classify a job in one regex pass over the title and one over the description"""
+    scores: Dict[str, Dict[str, float]] = {field: defaultdict(float) for field in FIELDS}
+    for text, multiplier in ((title or '', TITLE_WEIGHT), (description or '', 1)):
+        for match in RULE_PATTERN.finditer(text.lower()):
+            for field, label, weight in KEYWORD_LABELS[match.group(0)]:
+                scores[field][label] += weight * multiplier
+
+    details, confidence = {}, {}
+    for field in FIELDS:
+        if not scores[field]:
+            details[field], confidence[field] = 'UNKNOWN', 0.0
+            continue
+        label, top = max(scores[field].items(), key=lambda item: item[1])
+        share = top / sum(scores[field].values())
+        details[field] = label
+        confidence[field] = round(share * min(1.0, top / MIN_EVIDENCE), 3)
+    return RuleResult(details, confidence)
+
+
+def load_labeled(path=LABELED_JOBS_PATH) -> List[Dict[str, str]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def benchmark(samples: List[Dict[str, str]], llm: bool = True) -> Dict[str, float]:
+    """Compare rules and the LLM against labeled samples ({title, description, job_type, exp_level, industry}).
+
+    With llm=False only the rules are scored, without any Bedrock calls.
+    """
+    if llm:
+        from job_transformer import classify_job_details
+
+    report = defaultdict(float)
+    for sample in samples:
+        def correct(details):
+            return sum(details[f] == sample[f] for f in FIELDS) / len(FIELDS)
+
+        start = time.perf_counter()
+        rules = classify_with_rules(sample['description'], sample['title'])
+        report['rules_seconds'] += time.perf_counter() - start
+        report['rules_accuracy'] += correct(rules.details)
+        if rules.confident:
+            report['rules_confident'] += 1
+            report['confident_accuracy'] += correct(rules.details)
+        if not llm:
+            continue
+
+        start = time.perf_counter()
+        llm_details = classify_job_details(sample['description'], sample['title'])
+        report['llm_seconds'] += time.perf_counter() - start
+        report['llm_accuracy'] += correct(llm_details)
+        # What infer_job_details would have answered with the confidence gate
+        report['hybrid_accuracy'] += correct(rules.details if rules.confident else llm_details)
+
+    total = len(samples)
+    if total:
+        for key in ('rules_accuracy', 'llm_accuracy', 'hybrid_accuracy'):
+            if key in report:
+                report[key] /= total
+        if report['rules_confident']:
+            report['confident_accuracy'] /= report['rules_confident']
+        report['llm_calls_avoided'] = report['rules_confident']
+        report['samples'] = total
+    return dict(report)
+
+
+if __name__ == "__main__":
+    # Usage: python job_rules.py [labeled_jobs.jsonl] [--rules-only]
+    args = [arg for arg in sys.argv[1:] if arg != '--rules-only']
+    labeled = load_labeled(args[0] if args else LABELED_JOBS_PATH)
+    logger.info(f"Rule classifier benchmark: {benchmark(labeled, llm='--rules-only' not in sys.argv)}")
@@ -1,15 +1,16 @@
-import boto3
 import json
 import logging
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 import re
-from botocore.exceptions import ClientError
 import time
-from functools import lru_cache
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from bedrock_gateway import gateway, backoff_delay
+from classification_cache import ClassificationCache
+from embeddings import embed_texts, job_text, vector_to_list
+from job_rules import classify_with_rules
 
 # Get the path to the parent directory (where .env is located)
 parent_dir = Path(__file__).parent.parent
@@ -27,19 +28,8 @@ AWS_REGION = os.getenv('AWS_REGION', 'us-west-2')
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # seconds
 
-# Initialize AWS clients with error handling
-try:
-    session = boto3.Session(
-        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-        aws_session_token=os.getenv('AWS_SESSION_TOKEN'),
-        region_name=AWS_REGION
-    )
-    bedrock = session.client('bedrock-runtime', region_name=AWS_REGION)
-    logger.info("Successfully initialized AWS Bedrock client")
-except ClientError as e:
-    logger.error(f"AWS initialization error: {str(e)}")
-    raise
+INFER_DETAILS_MODEL_ID = 'anthropic.claude-3-5-sonnet-20241022-v2:0'
+classification_cache = ClassificationCache()
 
 def validate_text_length(text: str, max_length: int = 8000) -> str:
     """Truncate text if it exceeds maximum length"""
@@ -49,9 +39,19 @@ def validate_text_length(text: str, max_length: int = 8000) -> str:
     return text
 
 def get_bedrock_embedding(text: str) -> List[float]:
-    """Placeholder for embedding generation - returns empty list for now"""
-    # TODO: Implement actual embedding generation
-    return []
+    """Embed a single text with the configured embedding backend"""
+    return vector_to_list(embed_texts([text])[0])
+
+def embed_jobs(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fill search_embedding for transformed jobs, embedding them in batches"""
+    vectors = embed_texts([job_text(job) for job in jobs])
+    for job, vector in zip(jobs, vectors):
+        if vector.any():
+            job['search_embedding'] = vector_to_list(vector)
+        else:
+            # knn_vector rejects empty arrays and cosine is undefined for a zero vector
+            job.pop('search_embedding', None)
+    return jobs
 
 def validate_job_details(details: Dict[str, str]) -> Dict[str, str]:
     """Validate and normalize job details"""
@@ -68,8 +68,7 @@ def validate_job_details(details: Dict[str, str]) -> Dict[str, str]:
         'industry': details.get('industry', 'UNKNOWN').upper() if details.get('industry', 'UNKNOWN').upper() in valid_industries else 'UNKNOWN'
     }
 
-@lru_cache(maxsize=100)
-def infer_job_details(description: str, title: str) -> Dict[str, str]:
+def classify_job_details(description: str, title: str) -> Dict[str, str]:
     """Use Bedrock to infer job type, experience level, and industry"""
     try:
         description = validate_text_length(description)
@@ -108,21 +107,8 @@ Assistant: I'll analyze the job posting and return the categorization in the req
         
         for attempt in range(MAX_RETRIES):
             try:
-                response = bedrock.invoke_model(
-                    modelId='anthropic.claude-3-5-sonnet-20241022-v2:0',
-                    body=json.dumps({
-                        'messages': [{
-                            'role': 'user',
-                            'content': prompt
-                        }],
-                        'max_tokens': 200,
-                        'temperature': 0.1,
-                        'anthropic_version': 'bedrock-2023-05-31'
-                    })
-                )
-                
-                response_body = json.loads(response['body'].read())
-                completion_text = response_body.get('content', [{}])[0].get('text', '{}').strip()
+                completion_text, _ = gateway.invoke(INFER_DETAILS_MODEL_ID, prompt, 200, caller='infer_job_details')
+                completion_text = completion_text.strip()
                 
                 # Clean up the response text to ensure it's valid JSON
                 completion_text = re.sub(r'^[^{]*', '', completion_text)  # Remove any text before {
@@ -149,57 +135,10 @@ Assistant: I'll analyze the job posting and return the categorization in the req
                 validated_details = validate_job_details(details)
                 logger.info(f"Validated job details: {validated_details}")
                 
-                # If all fields are UNKNOWN, try keyword-based inference as fallback
+                # If all fields are UNKNOWN, fall back to the keyword rules
                 if all(v == 'UNKNOWN' for v in validated_details.values()):
                     logger.warning("All fields are UNKNOWN, using keyword-based inference")
-                    text_lower = f"{title} {description}".lower()
-                    
-                    # Job type inference
-                    if any(word in text_lower for word in ['full-time', 'full time', 'permanent']):
-                        validated_details['job_type'] = 'FULL_TIME'
-                    elif any(word in text_lower for word in ['contract', 'temporary', 'temp']):
-                        validated_details['job_type'] = 'CONTRACT'
-                    elif any(word in text_lower for word in ['part-time', 'part time']):
-                        validated_details['job_type'] = 'PART_TIME'
-                    elif any(word in text_lower for word in ['intern', 'internship']):
-                        validated_details['job_type'] = 'INTERNSHIP'
-                    
-                    # Experience level inference
-                    if any(word in text_lower for word in ['senior', 'lead', 'principal']):
-                        validated_details['exp_level'] = 'SENIOR'
-                    elif any(word in text_lower for word in ['mid-level', 'mid level', 'intermediate']):
-                        validated_details['exp_level'] = 'MID'
-                    elif any(word in text_lower for word in ['entry', 'junior', 'graduate', 'intern']):
-                        validated_details['exp_level'] = 'ENTRY'
-                    
-                    # Industry inference with priority for tech roles
-                    if any(word in text_lower for word in [
-                        'software', 'developer', 'engineer', 'programming', 'technology', 'tech',
-                        'data', 'it', 'information technology', 'computer', 'systems', 'devops',
-                        'cloud', 'infrastructure', 'automation', 'test engineering', 'feature development'
-                    ]):
-                        validated_details['industry'] = 'TECH'
-                    elif any(word in text_lower for word in [
-                        'healthcare', 'medical', 'clinical', 'health', 'hospital', 'patient',
-                        'doctor', 'nurse', 'pharmacy', 'pharmaceutical', 'healthcare staffing',
-                        'medical staffing', 'clinical research', 'healthcare sales'
-                    ]) and not any(word in text_lower for word in ['software', 'developer', 'engineer', 'data', 'it']):
-                        validated_details['industry'] = 'MEDICAL'
-                    elif any(word in text_lower for word in ['bank', 'finance', 'investment', 'accounting']):
-                        validated_details['industry'] = 'FINANCE'
-                    elif any(word in text_lower for word in ['education', 'teaching', 'school']):
-                        validated_details['industry'] = 'SOCIAL'
-                    elif any(word in text_lower for word in ['retail', 'store', 'sales']):
-                        validated_details['industry'] = 'RETAIL'
-                    elif any(word in text_lower for word in ['manufacturing', 'production', 'factory']):
-                        validated_details['industry'] = 'MANUFACTURING'
-                    elif any(word in text_lower for word in ['consulting', 'consultant']):
-                        validated_details['industry'] = 'CONSULTING'
-                    elif any(word in text_lower for word in ['marketing', 'advertising', 'pr']):
-                        validated_details['industry'] = 'MARKETING'
-                    elif any(word in text_lower for word in ['law', 'legal', 'attorney']):
-                        validated_details['industry'] = 'LEGAL'
-                    
+                    validated_details = classify_with_rules(description, title).details
                     logger.info(f"Keyword-based inference results: {validated_details}")
                 
                 return validated_details
@@ -213,7 +152,7 @@ Assistant: I'll analyze the job posting and return the categorization in the req
                         'exp_level': 'UNKNOWN',
                         'industry': 'UNKNOWN'
                     }
-                time.sleep(RETRY_DELAY * (attempt + 1))
+                time.sleep(backoff_delay(attempt, RETRY_DELAY))
     except Exception as e:
         logger.error(f"Error in job details inference: {str(e)}")
         return {
@@ -222,6 +161,20 @@ Assistant: I'll analyze the job posting and return the categorization in the req
             'industry': 'UNKNOWN'
         }
 
+def infer_job_details(description: str, title: str) -> Dict[str, str]:
+    """Classify a job with the keyword rules, asking Bedrock only when they are not confident"""
+    rules = classify_with_rules(description, title)
+    if rules.confident:
+        return rules.details
+    cached = classification_cache.get(description, title, INFER_DETAILS_MODEL_ID)
+    if cached is not None:
+        return cached
+    details = classify_job_details(description, title)
+    # All-UNKNOWN is what failures return, so leave those to be retried next time
+    if any(value != 'UNKNOWN' for value in details.values()):
+        classification_cache.put(description, title, INFER_DETAILS_MODEL_ID, details)
+    return details
+
 def normalize_title(title: str) -> str:
     """Normalize job title for GSI1SK"""
     # Remove common suffixes and special characters
@@ -255,6 +208,10 @@ def normalize_title(title: str) -> str:
     
     return title
 
+def normalize_company(company: str) -> str:
+    """Normalize company name for GSI1PK"""
+    return company.upper().replace(' ', '_')
+
 def transform_job_data(raw_job_json: Dict[str, Any]) -> Dict[str, Any]:
     """Transform raw job data into the desired format"""
     try:
@@ -264,9 +221,6 @@ def transform_job_data(raw_job_json: Dict[str, Any]) -> Dict[str, Any]:
             logger.error(f"Missing required fields in job data: {raw_job_json.get('job_id', 'UNKNOWN')}")
             return None
 
-        # Generate embeddings
-        combined_text = f"{raw_job_json['title']} {raw_job_json['description']}"
-        
         # Infer job details using both title and description
         job_details = infer_job_details(raw_job_json['description'], raw_job_json['title'])
         
@@ -274,7 +228,7 @@ def transform_job_data(raw_job_json: Dict[str, Any]) -> Dict[str, Any]:
         normalized_title = normalize_title(raw_job_json['title'])
         
         # Normalize company name for GSI1PK
-        normalized_company = raw_job_json['company'].upper().replace(' ', '_')
+        normalized_company = normalize_company(raw_job_json['company'])
         
         # Construct transformed item
         transformed_item = {
@@ -288,14 +242,16 @@ def transform_job_data(raw_job_json: Dict[str, Any]) -> Dict[str, Any]:
             "description": validate_text_length(raw_job_json['description']),
             "posted_date": raw_job_json['date'],
             "job_id": raw_job_json['job_id'],
-            "search_embedding": [],
+            # Top-level keyword fields, so JobQuery can filter on each of them
             "job_type": job_details['job_type'],
             "exp_level": job_details['exp_level'],
+            "industry": job_details['industry'],
             "company_link": raw_job_json.get('company_link', ''),
             "company_img_link": raw_job_json.get('company_img_link', ''),
             "link": raw_job_json.get('link', ''),
             "processed_at": datetime.now().isoformat()
         }
+        # search_embedding is left out until embed_jobs fills it; knn_vector rejects an empty array
         
         return transformed_item
         
@@ -0,0 +1,107 @@
+import logging
+import os
+import re
+import threading
+import zlib
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Off by default: scores are still logged so a threshold can be calibrated per
+# resume before any job is rejected without an LLM call. 0 disables rejection.
+PREFILTER_THRESHOLD = float(os.getenv('PREFILTER_THRESHOLD', '0'))
+PREFILTER_MARGIN = float(os.getenv('PREFILTER_MARGIN', '0.02'))  # band reported as near-threshold
+PREFILTER_MIN_DOCS = int(os.getenv('PREFILTER_MIN_DOCS', '20'))  # warm-up before IDF is trusted
+HASH_DIM = 2 ** 18
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with "
+    "you your we our they their us".split()
+)
+
+
+def flatten_text(value: Any) -> str:
+    """Join every string inside a (possibly nested) resume structure"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return ' '.join(flatten_text(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return ' '.join(flatten_text(v) for v in value)
+    return ''
+
+
+def hashed_terms(text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted unique hashed term ids and their counts"""
+    ids = [zlib.crc32(token.encode('utf-8')) & (HASH_DIM - 1)
+           for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+    if not ids:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    unique, counts = np.unique(np.asarray(ids, dtype=np.int64), return_counts=True)
+    return unique, counts.astype(np.float32)
+
+
+class LexicalPrefilter:
+    """TF-IDF cosine similarity between the resume and each job, ahead of the LLM.
+
+    Document frequencies are learned online from the jobs seen in the run, so
+    nothing is rejected until PREFILTER_MIN_DOCS jobs have been observed. With
+    a threshold of 0 jobs are only scored, never rejected.
+    """
+
+    def __init__(self, resume: Any, threshold: float = PREFILTER_THRESHOLD,
+                 margin: float = PREFILTER_MARGIN, min_docs: int = PREFILTER_MIN_DOCS):
+        self.threshold = threshold
+        self.margin = margin
+        self.min_docs = min_docs
+        self.resume_ids, self.resume_tf = hashed_terms(flatten_text(resume))
+        self.doc_freq = np.zeros(HASH_DIM, dtype=np.float32)
+        self.num_docs = 0
+        self._lock = threading.Lock()
+        self.stats = {"seen": 0, "rejected": 0, "near_threshold": 0}
+
+    def _idf(self, ids: np.ndarray) -> np.ndarray:
+        return np.log((1 + self.num_docs) / (1 + self.doc_freq[ids])) + 1
+
+    def score(self, job: Dict[str, Any]) -> float:
+        """Cosine similarity of the job's title and description to the resume"""
+        ids, tf = hashed_terms(f"{job.get('title', '')} {job.get('description', '')}")
+        with self._lock:
+            self.doc_freq[ids] += 1
+            self.num_docs += 1
+            job_weights = (1 + np.log(tf)) * self._idf(ids)
+            resume_weights = (1 + np.log(self.resume_tf)) * self._idf(self.resume_ids)
+
+        norm = np.linalg.norm(job_weights) * np.linalg.norm(resume_weights)
+        if norm == 0:
+            return 0.0
+        _, job_idx, resume_idx = np.intersect1d(ids, self.resume_ids, assume_unique=True, return_indices=True)
+        return float(job_weights[job_idx] @ resume_weights[resume_idx] / norm)
+
+    def rejects(self, score: float) -> bool:
+        """Record a scored job and decide whether it is a clear miss"""
+        with self._lock:
+            self.stats["seen"] += 1
+            if self.threshold <= 0:
+                return False
+            if abs(score - self.threshold) <= self.margin:
+                self.stats["near_threshold"] += 1
+            reject = self.num_docs >= self.min_docs and score < self.threshold
+            if reject:
+                self.stats["rejected"] += 1
+        return reject
+
+    def score_many(self, jobs: List[Dict[str, Any]]) -> np.ndarray:
+        return np.array([self.score(job) for job in jobs], dtype=np.float32)
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            report = dict(self.stats)
+        report["llm_calls_avoided"] = report["rejected"]
+        report["threshold"] = self.threshold
+        return report
@@ -0,0 +1,100 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from botocore.exceptions import ClientError
+
+from embeddings import embed_texts, job_text
+from lexical_prefilter import flatten_text
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Cosine similarity treated as a 100% match; hashed embeddings rarely exceed this
+MATCH_FULL_SCALE = float(os.getenv('MATCH_FULL_SCALE', '0.5'))
+RESCORE_WORKERS = int(os.getenv('RESCORE_WORKERS', '8'))  # concurrent update_item calls
+
+
+class MatchScorer:
+    """Scores jobs against a resume embedded once, as one matrix-vector product"""
+
+    def __init__(self, resume: Any, full_scale: float = MATCH_FULL_SCALE):
+        self.full_scale = full_scale
+        self.resume_vector = embed_texts([flatten_text(resume)])[0]
+
+    def score_vectors(self, job_vectors: np.ndarray) -> np.ndarray:
+        """match_percentage (0-100) for each row of an (n, dim) matrix of L2-normalized job vectors"""
+        similarity = job_vectors @ self.resume_vector
+        return np.clip(np.rint(similarity / self.full_scale * 100), 0, 100).astype(np.int32)
+
+    def score_jobs(self, jobs: List[Dict[str, Any]],
+                   vectors: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return match percentages and the job order from best to worst match"""
+        if vectors is None:
+            vectors = embed_texts([job_text(job) for job in jobs])
+        scores = self.score_vectors(vectors)
+        # Stable sort so equal scores keep their original (e.g. date) order
+        order = np.argsort(-scores, kind='stable')
+        return scores, order
+
+    def score_job(self, job: Dict[str, Any]) -> int:
+        return int(self.score_jobs([job])[0][0])
+
+
+def update_vector_score(table, job_id: str, score: int, resume_key: str) -> bool:
+    """Set vector_match_percentage and the resume it was scored against on an existing job.
+
+    Returns False if the job was saved or deleted meanwhile.
+    """
+    try:
+        table.update_item(
+            Key={'job_id': job_id},
+            UpdateExpression='SET vector_match_percentage = :score, vector_resume_hash = :resume_hash',
+            ConditionExpression='attribute_exists(job_id)',
+            ExpressionAttributeValues={':score': score, ':resume_hash': resume_key}
+        )
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
+        raise
+
+
+def rescore_jobs(table, resume: Any, resume_key: str) -> int:
+    """Recompute vector_match_percentage, without Bedrock, for every job scored against another resume.
+
+    Each item records the resume hash its score was computed for, so jobs
+    written by any run or machine with an older resume are found by the scan
+    filter, and a run with the same resume rewrites nothing. match_percentage
+    is the model's verdict and is left alone. Only the fields the embedding
+    reads are returned, and each score is a conditional update, so jobs
+    removed during the run are not written back.
+    """
+    start = time.perf_counter()
+    items = []
+    scan_kwargs = {
+        'ProjectionExpression': '#job_id, #title, #description',
+        'FilterExpression': 'attribute_not_exists(#resume_hash) OR #resume_hash <> :resume_hash',
+        'ExpressionAttributeNames': {'#job_id': 'job_id', '#title': 'title', '#description': 'description',
+                                     '#resume_hash': 'vector_resume_hash'},
+        'ExpressionAttributeValues': {':resume_hash': resume_key}
+    }
+    while True:
+        response = table.scan(**scan_kwargs)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    if not items:
+        return 0
+
+    scores, _ = MatchScorer(resume).score_jobs(items)
+    with ThreadPoolExecutor(max_workers=RESCORE_WORKERS, thread_name_prefix='rescore') as executor:
+        updated = sum(executor.map(
+            lambda pair: update_vector_score(table, pair[0]['job_id'], int(pair[1]), resume_key), zip(items, scores)))
+    logger.info(f"Re-scored {updated} of {len(items)} jobs in {time.perf_counter() - start:.2f}s")
+    return updated
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import time
+
+from opensearchpy import AsyncHttpConnection, AsyncOpenSearch, AWSV4SignerAsyncAuth
+
+from embeddings import EMBEDDING_DIM
+from opensearch_client import (
+    BULK_MAX_RETRIES, BULK_MAX_WORKERS, OPENSEARCH_HTTP_COMPRESS, OPENSEARCH_POOL_MAXSIZE, OPENSEARCH_TIMEOUT,
+    build_credentials, bulk_backoff, chunk_bulk_actions, index_actions, job_index_body, new_chunk_result,
+    record_bulk_response, record_request_failure, summarize_bulk
+)
+from search_query import JobQuery
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class AsyncOpenSearchClient:
+    """AsyncOpenSearch counterpart of OpenSearchClient for code running on an event loop"""
+
+    def __init__(self, host, region='us-west-2'):
+        self.host = host
+        self.region = region
+        self.client = self._create_client()
+
+    def _create_client(self):
+        """Create a pooled, compressed async client signed with refreshable AWS credentials"""
+        return AsyncOpenSearch(
+            hosts=[{'host': self.host, 'port': 443}],
+            http_auth=AWSV4SignerAsyncAuth(build_credentials(self.region), self.region, 'es'),
+            use_ssl=True,
+            verify_certs=True,
+            connection_class=AsyncHttpConnection,
+            maxsize=OPENSEARCH_POOL_MAXSIZE,
+            http_compress=OPENSEARCH_HTTP_COMPRESS,
+            timeout=OPENSEARCH_TIMEOUT,
+            max_retries=2,
+            retry_on_timeout=True
+        )
+
+    async def close(self):
+        await self.client.close()
+
+    async def create_index(self, index_name, embedding_dim=EMBEDDING_DIM, alias=None):
+        """Create an index with mappings for job data, optionally as the write index of an alias"""
+        if not await self.client.indices.exists(index=index_name):
+            mappings = job_index_body(embedding_dim)
+            if alias:
+                mappings["aliases"] = {alias: {"is_write_index": True}}
+
+            try:
+                await self.client.indices.create(index=index_name, body=mappings)
+                logger.info(f"Created index: {index_name}")
+            except Exception as e:
+                logger.error(f"Error creating index {index_name}: {str(e)}")
+                raise
+
+    async def refresh(self, index_name):
+        await self.client.indices.refresh(index=index_name)
+
+    async def bulk_index_jobs(self, index_name, jobs_data, refresh=True):
+        """Bulk index job documents with up to BULK_MAX_WORKERS chunks in flight"""
+        if not jobs_data:
+            return None
+
+        start = time.perf_counter()
+        actions = index_actions(index_name, jobs_data)
+        chunks = chunk_bulk_actions(actions)
+        semaphore = asyncio.Semaphore(BULK_MAX_WORKERS)
+
+        async def send(chunk):
+            async with semaphore:
+                return await self._send_chunk(chunk)
+
+        results = await asyncio.gather(*(send(chunk) for chunk in chunks))
+        summary = summarize_bulk(len(actions), results, time.perf_counter() - start)
+        if refresh:
+            await self.refresh(index_name)
+        if summary['failed']:
+            logger.error(f"Bulk indexing finished with failures: {summary}")
+        else:
+            logger.info(f"Successfully bulk indexed {summary['succeeded']} jobs: {summary}")
+        return summary
+
+    async def _send_chunk(self, chunk):
+        """Send one bulk request, re-sending only the items that failed with a retryable status"""
+        result = new_chunk_result()
+        pending = chunk
+        for attempt in range(BULK_MAX_RETRIES + 1):
+            if attempt:
+                await asyncio.sleep(bulk_backoff(attempt))
+                result["retried"] += len(pending)
+            final = attempt == BULK_MAX_RETRIES
+            try:
+                response = await self.client.bulk(body=''.join(lines for _, lines in pending))
+            except Exception as e:
+                logger.warning(f"Bulk request for {len(pending)} items failed: {str(e)}")
+                if final:
+                    record_request_failure(pending, e, result)
+                continue
+            pending = record_bulk_response(pending, response, result, final)
+            if not pending:
+                break
+        return result
+
+    async def search_jobs(self, index_name, query):
+        """Search for jobs using a raw query body or a JobQuery; the body sets the page size"""
+        if isinstance(query, JobQuery):
+            query = query.to_body()
+        try:
+            return await self.client.search(index=index_name, body=query)
+        except Exception as e:
+            logger.error(f"Error searching jobs: {str(e)}")
+            raise
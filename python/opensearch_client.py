@@ -1,11 +1,16 @@
 import boto3
 import logging
-from opensearchpy import OpenSearch, RequestsHttpConnection
-from requests_aws4auth import AWS4Auth
+from opensearchpy import OpenSearch, RequestsAWSV4SignerAuth, RequestsHttpConnection
 import json
 import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from pathlib import Path
+from embeddings import EMBEDDING_DIM
+from search_query import JobQuery
 
 # Get the path to the parent directory (where .env is located)
 parent_dir = Path(__file__).parent.parent
@@ -18,6 +23,168 @@ load_dotenv(dotenv_path=env_path)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+OPENSEARCH_POOL_MAXSIZE = int(os.getenv('OPENSEARCH_POOL_MAXSIZE', '16'))
+OPENSEARCH_HTTP_COMPRESS = os.getenv('OPENSEARCH_HTTP_COMPRESS', 'true').lower() == 'true'
+OPENSEARCH_TIMEOUT = int(os.getenv('OPENSEARCH_TIMEOUT', '30'))  # seconds
+BULK_CHUNK_DOCS = int(os.getenv('OPENSEARCH_BULK_CHUNK_DOCS', '500'))
+BULK_CHUNK_BYTES = int(os.getenv('OPENSEARCH_BULK_CHUNK_BYTES', str(5 * 1024 * 1024)))
+BULK_MAX_WORKERS = int(os.getenv('OPENSEARCH_BULK_MAX_WORKERS', '4'))
+BULK_MAX_RETRIES = 3
+BULK_RETRY_DELAY = 1  # seconds, base of the jittered exponential backoff
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+MAX_REPORTED_FAILURES = 20  # failed ids listed in a summary
+PIT_KEEP_ALIVE = '2m'  # how long a point in time survives between pages
+INDEX_VERSION = int(os.getenv('OPENSEARCH_INDEX_VERSION', '1'))  # physical index behind the alias
+REINDEX_TIMEOUT = 3600  # seconds
+
+def versioned_index_name(alias, version):
+    return f"{alias}_v{version}"
+
+def job_index_body(embedding_dim=EMBEDDING_DIM):
+    """Settings and mappings for a physical jobs index"""
+    not_searched = {"type": "keyword", "index": False, "doc_values": False}
+    return {
+        "settings": {
+            "index": {
+                "knn": True,
+                # Results are read newest first, so matching segments can stop early
+                "sort.field": "posted_date",
+                "sort.order": "desc",
+                # Ingest refreshes explicitly once per run
+                "refresh_interval": "30s"
+            }
+        },
+        "mappings": {
+            "properties": {
+                "title": {
+                    "type": "text",
+                    "analyzer": "standard",
+                    "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}
+                },
+                "company": {"type": "keyword"},
+                "location": {"type": "keyword"},
+                # Matched but never ranked on its own, so length norms are wasted heap
+                "description": {"type": "text", "analyzer": "standard", "norms": False},
+                "posted_date": {"type": "date"},
+                "job_id": {"type": "keyword"},
+                "job_type": {"type": "keyword"},
+                "exp_level": {"type": "keyword"},
+                "industry": {"type": "keyword"},
+                "company_link": not_searched,
+                "company_img_link": not_searched,
+                "link": not_searched,
+                "processed_at": {"type": "date", "doc_values": False},
+                "variants": {
+                    "properties": {
+                        "job_id": {"type": "keyword", "doc_values": False},
+                        "place": {"type": "keyword", "doc_values": False},
+                        "date": {"type": "date", "doc_values": False},
+                        "link": not_searched
+                    }
+                },
+                "search_embedding": {
+                    "type": "knn_vector",
+                    "dimension": embedding_dim,
+                    "method": {
+                        "name": "hnsw",
+                        "space_type": "cosinesimil",
+                        "engine": "nmslib"
+                    }
+                }
+            }
+        }
+    }
+
+def build_credentials(region):
+    """AWS credentials from the default chain; role, SSO and container credentials refresh themselves"""
+    credentials = boto3.Session(region_name=region).get_credentials()
+    if credentials is None:
+        raise ValueError("AWS credentials not found in environment variables")
+    return credentials
+
+def index_actions(index_name, jobs_data):
+    return [
+        (job['job_id'], {"index": {"_index": index_name, "_id": job['job_id']}}, job)
+        for job in jobs_data
+    ]
+
+# Idempotent, since a timed-out bulk request that actually applied is sent again
+VARIANT_APPEND_SCRIPT = (
+    "if (ctx._source.variants == null) { ctx._source.variants = []; } "
+    "boolean seen = false; "
+    "for (def v : ctx._source.variants) { if (v.job_id == params.variant.job_id) { seen = true; } } "
+    "if (seen) { ctx.op = 'none'; } else { ctx._source.variants.add(params.variant); }"
+)
+
+def variant_actions(index_name, variants):
+    return [
+        (item['variant_of'], {"update": {"_index": index_name, "_id": item['variant_of']}}, {
+            "script": {
+                "source": VARIANT_APPEND_SCRIPT,
+                "params": {"variant": item['variant']}
+            }
+        })
+        for item in variants
+    ]
+
+def chunk_bulk_actions(actions):
+    """Serialize each action once and group them into chunks bounded by count and bytes"""
+    chunks, chunk, chunk_bytes = [], [], 0
+    for doc_id, action, source in actions:
+        lines = f"{json.dumps(action)}\n{json.dumps(source, default=str)}\n"
+        size = len(lines.encode('utf-8'))
+        if chunk and (len(chunk) >= BULK_CHUNK_DOCS or chunk_bytes + size > BULK_CHUNK_BYTES):
+            chunks.append(chunk)
+            chunk, chunk_bytes = [], 0
+        chunk.append((doc_id, lines))
+        chunk_bytes += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+def bulk_backoff(attempt):
+    return random.uniform(0, BULK_RETRY_DELAY * (2 ** (attempt - 1)))
+
+def new_chunk_result():
+    return {"succeeded": 0, "failed": 0, "retried": 0, "errors": Counter(), "failed_ids": []}
+
+def record_request_failure(pending, error, result):
+    result["errors"][type(error).__name__] += len(pending)
+    result["failed"] += len(pending)
+    result["failed_ids"].extend(doc_id for doc_id, _ in pending)
+
+def record_bulk_response(pending, response, result, final):
+    """Count a bulk response's outcomes and return the items worth retrying"""
+    retry = []
+    for (doc_id, lines), item in zip(pending, response['items']):
+        outcome = next(iter(item.values()))
+        status = outcome.get('status', 500)
+        if status < 300:
+            result["succeeded"] += 1
+        elif status in RETRYABLE_STATUSES and not final:
+            retry.append((doc_id, lines))
+        else:
+            error = outcome.get('error', {})
+            result["errors"][error.get('type', str(status)) if isinstance(error, dict) else str(status)] += 1
+            result["failed"] += 1
+            result["failed_ids"].append(doc_id)
+    return retry
+
+def summarize_bulk(total, results, seconds):
+    summary = {
+        "total": total, "succeeded": 0, "failed": 0, "retried": 0,
+        "chunks": len(results), "errors": Counter(), "failed_ids": []
+    }
+    for result in results:
+        for key in ("succeeded", "failed", "retried"):
+            summary[key] += result[key]
+        summary["errors"].update(result["errors"])
+        summary["failed_ids"].extend(result["failed_ids"])
+    summary["errors"] = dict(summary["errors"])
+    summary["failed_ids"] = summary["failed_ids"][:MAX_REPORTED_FAILURES]
+    summary["seconds"] = round(seconds, 3)
+    return summary
+
 class OpenSearchClient:
     def __init__(self, host, region='us-west-2'):
         self.host = host
@@ -25,54 +192,28 @@ class OpenSearchClient:
         self.client = self._create_client()
 
     def _create_client(self):
-        """Create an OpenSearch client with AWS authentication"""
-        # Get credentials from environment variables
-        access_key = os.getenv('AWS_ACCESS_KEY_ID')
-        secret_key = os.getenv('AWS_SECRET_ACCESS_KEY')
-        session_token = os.getenv('AWS_SESSION_TOKEN')
-
-        if not access_key or not secret_key:
-            raise ValueError("AWS credentials not found in environment variables")
-
-        awsauth = AWS4Auth(
-            access_key,
-            secret_key,
-            self.region,
-            'es',
-            session_token=session_token
-        )
-
+        """Create a pooled, compressed OpenSearch client signed with refreshable AWS credentials"""
         return OpenSearch(
             hosts=[{'host': self.host, 'port': 443}],
-            http_auth=awsauth,
+            http_auth=RequestsAWSV4SignerAuth(build_credentials(self.region), self.region, 'es'),
             use_ssl=True,
             verify_certs=True,
-            connection_class=RequestsHttpConnection
+            connection_class=RequestsHttpConnection,
+            # Pooled connections stay open between requests, so bulk chunks reuse them
+            pool_maxsize=OPENSEARCH_POOL_MAXSIZE,
+            http_compress=OPENSEARCH_HTTP_COMPRESS,
+            timeout=OPENSEARCH_TIMEOUT,
+            max_retries=2,
+            retry_on_timeout=True
         )
 
-    def create_index(self, index_name):
-        """Create an index with mappings for job data"""
+    def create_index(self, index_name, embedding_dim=EMBEDDING_DIM, alias=None):
+        """Create an index with mappings for job data, optionally as the write index of an alias"""
         if not self.client.indices.exists(index=index_name):
-            mappings = {
-                "mappings": {
-                    "properties": {
-                        "title": {"type": "text", "analyzer": "standard"},
-                        "company": {"type": "keyword"},
-                        "location": {"type": "keyword"},
-                        "description": {"type": "text", "analyzer": "standard"},
-                        "posted_date": {"type": "date"},
-                        "job_id": {"type": "keyword"},
-                        "job_type": {"type": "keyword"},
-                        "exp_level": {"type": "keyword"},
-                        "industry": {"type": "keyword"},
-                        "company_link": {"type": "keyword"},
-                        "company_img_link": {"type": "keyword"},
-                        "link": {"type": "keyword"},
-                        "processed_at": {"type": "date"}
-                    }
-                }
-            }
-            
+            mappings = job_index_body(embedding_dim)
+            if alias:
+                mappings["aliases"] = {alias: {"is_write_index": True}}
+
             try:
                 self.client.indices.create(index=index_name, body=mappings)
                 logger.info(f"Created index: {index_name}")
@@ -80,14 +221,70 @@ class OpenSearchClient:
                 logger.error(f"Error creating index {index_name}: {str(e)}")
                 raise
 
-    def index_job(self, index_name, job_data):
+    def alias_targets(self, alias):
+        """Physical indices an alias currently points to"""
+        if not self.client.indices.exists_alias(name=alias):
+            return []
+        return list(self.client.indices.get_alias(name=alias).keys())
+
+    def ensure_index(self, alias, version=INDEX_VERSION, embedding_dim=EMBEDDING_DIM):
+        """Make sure the alias exists, creating its first versioned index if needed"""
+        if self.alias_targets(alias):
+            return
+        if self.client.indices.exists(index=alias):
+            # Pre-alias deployments wrote to a concrete index; reindex_to_version migrates it
+            logger.warning(f"{alias} is a concrete index, run the reindex command to move it behind an alias")
+            return
+        self.create_index(versioned_index_name(alias, version), embedding_dim, alias=alias)
+
+    def reindex_to_version(self, alias, version, embedding_dim=EMBEDDING_DIM, delete_old=False):
+        """Copy the alias's documents into a new versioned index and swap the alias to it atomically.
+
+        Writes made while the copy runs are not carried over, so run this between scrapes.
+        """
+        new_index = versioned_index_name(alias, version)
+        old_indices = self.alias_targets(alias)
+        legacy = not old_indices and self.client.indices.exists(index=alias)
+        if not old_indices and not legacy:
+            raise ValueError(f"Nothing to reindex: {alias} does not exist")
+        if new_index in old_indices:
+            raise ValueError(f"{alias} already points to {new_index}")
+
+        self.create_index(new_index, embedding_dim)
+        start = time.perf_counter()
+        response = self.client.reindex(
+            body={"source": {"index": alias}, "dest": {"index": new_index}},
+            refresh=True,
+            wait_for_completion=True,
+            request_timeout=REINDEX_TIMEOUT
+        )
+        if response.get('failures'):
+            raise RuntimeError(f"Reindex into {new_index} had {len(response['failures'])} failures")
+        logger.info(f"Copied {response.get('total', 0)} documents into {new_index} in {time.perf_counter() - start:.1f}s")
+
+        if legacy:
+            # The old concrete index holds the alias's name, so it is dropped in the same atomic call
+            actions = [{"remove_index": {"index": alias}}]
+        else:
+            actions = [{"remove": {"index": index, "alias": alias}} for index in old_indices]
+        actions.append({"add": {"index": new_index, "alias": alias, "is_write_index": True}})
+        self.client.indices.update_aliases(body={"actions": actions})
+        logger.info(f"Alias {alias} now points to {new_index}")
+
+        if delete_old and not legacy:
+            for index in old_indices:
+                self.client.indices.delete(index=index)
+                logger.info(f"Deleted old index {index}")
+        return new_index
+
+    def index_job(self, index_name, job_data, refresh=False):
         """Index a single job document"""
         try:
             response = self.client.index(
                 index=index_name,
                 body=job_data,
                 id=job_data['job_id'],
-                refresh=True
+                refresh=refresh
             )
             logger.info(f"Indexed job {job_data['job_id']} successfully")
             return response
@@ -95,38 +292,108 @@ class OpenSearchClient:
             logger.error(f"Error indexing job {job_data.get('job_id', 'UNKNOWN')}: {str(e)}")
             raise
 
-    def bulk_index_jobs(self, index_name, jobs_data):
-        """Bulk index multiple job documents"""
+    def refresh(self, index_name):
+        """Make everything indexed so far searchable"""
+        self.client.indices.refresh(index=index_name)
+
+    def bulk_index_jobs(self, index_name, jobs_data, refresh=True):
+        """Bulk index job documents in concurrent chunks; returns a summary of the load"""
         if not jobs_data:
-            return
+            return None
 
-        bulk_data = []
-        for job in jobs_data:
-            # Add index action
-            bulk_data.append({"index": {"_index": index_name, "_id": job['job_id']}})
-            # Add document
-            bulk_data.append(job)
+        summary = self._run_bulk(index_actions(index_name, jobs_data))
+        if refresh:
+            self.refresh(index_name)
+        if summary['failed']:
+            logger.error(f"Bulk indexing finished with failures: {summary}")
+        else:
+            logger.info(f"Successfully bulk indexed {summary['succeeded']} jobs: {summary}")
+        return summary
 
-        try:
-            response = self.client.bulk(body=bulk_data, refresh=True)
-            if response.get('errors'):
-                logger.error(f"Bulk indexing had errors: {json.dumps(response, indent=2)}")
-            else:
-                logger.info(f"Successfully bulk indexed {len(jobs_data)} jobs")
-            return response
-        except Exception as e:
-            logger.error(f"Error in bulk indexing: {str(e)}")
-            raise
+    def append_variants(self, index_name, variants):
+        """Append duplicate postings to already indexed jobs ({"variant_of": job_id, "variant": {...}})"""
+        if not variants:
+            return None
+
+        summary = self._run_bulk(variant_actions(index_name, variants))
+        if summary['failed']:
+            logger.error(f"Appending variants finished with failures: {summary}")
+        return summary
 
-    def search_jobs(self, index_name, query, size=10):
-        """Search for jobs using a query"""
+    def _run_bulk(self, actions):
+        """Send (doc_id, action, source) triples in chunks bounded by count and bytes, concurrently"""
+        start = time.perf_counter()
+        chunks = chunk_bulk_actions(actions)
+        with ThreadPoolExecutor(max_workers=min(BULK_MAX_WORKERS, len(chunks))) as executor:
+            results = list(executor.map(self._send_chunk, chunks))
+        return summarize_bulk(len(actions), results, time.perf_counter() - start)
+
+    def _send_chunk(self, chunk):
+        """Send one bulk request, re-sending only the items that failed with a retryable status"""
+        result = new_chunk_result()
+        pending = chunk
+        for attempt in range(BULK_MAX_RETRIES + 1):
+            if attempt:
+                time.sleep(bulk_backoff(attempt))
+                result["retried"] += len(pending)
+            final = attempt == BULK_MAX_RETRIES
+            try:
+                response = self.client.bulk(body=''.join(lines for _, lines in pending))
+            except Exception as e:
+                logger.warning(f"Bulk request for {len(pending)} items failed: {str(e)}")
+                if final:
+                    record_request_failure(pending, e, result)
+                continue
+            pending = record_bulk_response(pending, response, result, final)
+            if not pending:
+                break
+        return result
+
+    def search_jobs(self, index_name, query):
+        """Search for jobs using a raw query body or a JobQuery; the body sets the page size"""
+        if isinstance(query, JobQuery):
+            query = query.to_body()
         try:
             response = self.client.search(
                 index=index_name,
-                body=query,
-                size=size
+                body=query
             )
             return response
         except Exception as e:
             logger.error(f"Error searching jobs: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+    def search_page(self, index_name, job_query, search_after=None, pit_id=None):
+        """Fetch one page of a JobQuery; returns (jobs, search_after for the next page, response)"""
+        body = job_query.to_body(search_after)
+        try:
+            if pit_id:
+                # A point in time already names the index and must not be repeated in the path
+                body["pit"] = {"id": pit_id, "keep_alive": PIT_KEEP_ALIVE}
+                response = self.client.search(body=body)
+            else:
+                response = self.client.search(index=index_name, body=body)
+        except Exception as e:
+            logger.error(f"Error searching jobs: {str(e)}")
+            raise
+        hits = response['hits']['hits']
+        next_search_after = hits[-1]['sort'] if len(hits) == job_query.page_size else None
+        return [hit.get('_source', {}) for hit in hits], next_search_after, response
+
+    def iter_jobs(self, index_name, job_query):
+        """Yield every job matching a JobQuery, paging with search_after over a point in time"""
+        pit_id = self.client.create_pit(index=index_name, keep_alive=PIT_KEEP_ALIVE)['pit_id']
+        try:
+            search_after = None
+            while True:
+                jobs, search_after, response = self.search_page(index_name, job_query, search_after, pit_id)
+                # The PIT id can change between pages; always continue with the latest
+                pit_id = response.get('pit_id', pit_id)
+                yield from jobs
+                if search_after is None:
+                    return
+        finally:
+            try:
+                self.client.delete_pit(body={"pit_id": [pit_id]})
+            except Exception as e:
+                logger.warning(f"Error closing point in time: {str(e)}")
@@ -4,15 +4,30 @@ import os
 from datetime import datetime, timedelta
 import re
 import boto3
+from botocore.exceptions import ClientError
 from linkedin_jobs_scraper import LinkedinScraper
 from linkedin_jobs_scraper.events import Events, EventData, EventMetrics
 from linkedin_jobs_scraper.query import Query, QueryOptions, QueryFilters
-from job_llm import keep_or_reject
+from job_llm import request_verdict, request_verdicts, usage_stats, validate_verdict, KEEP_OR_REJECT_BATCH_SIZE, KEEP_OR_REJECT_MODEL_ID, REJECT_VERDICT
+from concurrent_scoring import ConcurrentScorer
+from ingest_progress import IngestProgress
+from verdict_cache import VerdictCache, resume_hash
+from lexical_prefilter import LexicalPrefilter
+from bedrock_gateway import gateway
+from match_scoring import MatchScorer, rescore_jobs
+from job_dedup import DuplicateDetector, variant_summary
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 resume = None
+resume_key = None
+progress = IngestProgress()
+scorer = ConcurrentScorer(request_verdict, batch_fn=request_verdicts, batch_size=KEEP_OR_REJECT_BATCH_SIZE)
+verdict_cache = VerdictCache()
+dedup = DuplicateDetector()
+prefilter = None
+match_scorer = None
 
 # Set LinkedIn authentication cookie
 os.environ['LI_AT_COOKIE'] = 'AQEDAVqjf7EDx21DAAABlrurz3oAAAGW37hTek0AoJ3BSxqtwLOA9nfjVW2gam06X4VDyDoX6lKN2nwx3yyQBvwskqi9Ez8Vb5CgTtGAXHBS97kfz9kLejV7o6Iadt0z2yAfgM87_IOKmTbCAecBMf65'
@@ -97,22 +112,113 @@ def on_data(data: EventData):
         "company_img_link": data.company_img_link,
         "link": data.link
     }
-    
-    result = keep_or_reject(raw_job_data, resume['output'])
-    if result['keep']:
-        try:
-            # Add to DynamoDB
-            raw_job_data['key_requirements'] = result['key_requirements']
-            raw_job_data['key_descriptions'] = result['key_descriptions']
-            raw_job_data['match_percentage'] = result['match_percentage']
-            table.put_item(Item=raw_job_data)
-            logger.info(f"[ON_DATA] Added to DynamoDB: {data.title} | {data.company} | {data.place} | {actual_date.isoformat()}")
-        except Exception as e:
-            logger.error(f"Error adding to DynamoDB: {str(e)}")
+    progress.increment('jobs_scraped')
+
+    # Score every job so the prefilter's document frequencies see the whole run
+    lexical_score = prefilter.score(raw_job_data)
+
+    # Reposts of a role already seen share its verdict and are stored on its item
+    rep_id, verdict = dedup.assign(raw_job_data)
+    if rep_id != raw_job_data['job_id']:
+        progress.increment('jobs_deduplicated')
+        if verdict is not None:
+            store_variants(rep_id, [raw_job_data], verdict)
+        return
+
+    # Postings seen before with this resume and model skip Bedrock entirely.
+    # Re-validated so entries cached before match_percentage was coerced to int still store.
+    cached_verdict = verdict_cache.get(raw_job_data, resume_key, KEEP_OR_REJECT_MODEL_ID)
+    if cached_verdict is not None:
+        cached_verdict = validate_verdict(cached_verdict)
+    if cached_verdict is not None:
+        store_verdict(raw_job_data, cached_verdict)
+        return
+
+    # Clear lexical misses are rejected locally instead of spending a Bedrock call
+    if prefilter.rejects(lexical_score):
+        progress.increment('jobs_prefiltered')
+        store_verdict(raw_job_data, dict(REJECT_VERDICT))
+        return
+
+    # Score on the worker pool so the scraper never waits on Bedrock
+    scorer.submit(raw_job_data, resume['output'], callback=cache_and_store_verdict)
+
+def cache_and_store_verdict(raw_job_data, result):
+    if not result.get('scoring_failed'):
+        verdict_cache.put(raw_job_data, resume_key, KEEP_OR_REJECT_MODEL_ID, result)
+    store_verdict(raw_job_data, result)
+
+def put_job(raw_job_data, result):
+    """Write a kept job to DynamoDB; False if the put failed"""
+    try:
+        # Add to DynamoDB
+        raw_job_data['key_requirements'] = result['key_requirements']
+        raw_job_data['key_descriptions'] = result['key_descriptions']
+        raw_job_data['match_percentage'] = result['match_percentage']
+        # Embedding similarity, comparable across jobs and recomputable without Bedrock
+        raw_job_data['vector_match_percentage'] = match_scorer.score_job(raw_job_data)
+        raw_job_data['vector_resume_hash'] = resume_key
+        # Partition key of the date-sorted GSI the backend pages /api/jobs from
+        raw_job_data['feed'] = 'JOBS'
+        raw_job_data['variants'] = []
+        table.put_item(Item=raw_job_data)
+        progress.increment('jobs_kept')
+        logger.info(f"[ON_DATA] Added to DynamoDB: {raw_job_data['title']} | {raw_job_data['company']} | {raw_job_data['place']} | {raw_job_data['date']}")
+        return True
+    except Exception as e:
+        logger.error(f"Error adding to DynamoDB: {str(e)}")
+        return False
+
+# Called on a scoring worker once a job has a verdict
+def store_verdict(raw_job_data, result):
+    progress.increment('jobs_scored')
+    job = raw_job_data
+    # A kept representative that could not be written hands the verdict to the
+    # next duplicate waiting on it, which near-identical content shares
+    while job is not None and result['keep'] and not put_job(job, result):
+        job = dedup.promote_next(job['job_id'])
+    if job is None:
+        return
+    # Resolve only after the put so no duplicate can be appended to an item that is not written yet
+    store_variants(job['job_id'], dedup.resolve(job['job_id'], result), result)
+
+def store_variants(rep_id, variants, result):
+    """Append duplicates of a kept job to its item instead of storing them separately"""
+    if not variants or not result['keep']:
+        return
+    try:
+        table.update_item(
+            Key={'job_id': rep_id},
+            UpdateExpression='SET variants = list_append(if_not_exists(variants, :empty), :variants)',
+            ConditionExpression='attribute_exists(job_id)',
+            ExpressionAttributeValues={
+                ':empty': [],
+                ':variants': [variant_summary(variant) for variant in variants]
+            }
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            logger.error(f"Error attaching variants to job {rep_id}: {str(e)}")
+            return
+        # Saved or deleted from the feed since; its reposts go with it rather than recreating it
+        logger.info(f"Job {rep_id} is gone, dropping {len(variants)} duplicate(s)")
+    except Exception as e:
+        logger.error(f"Error attaching variants to job {rep_id}: {str(e)}")
+
+# Callback after each query location finishes
+def on_metrics(metrics: EventMetrics):
+    progress.increment('queries_done')
 
 # Callback for when scraping is done
 def on_end():
-    pass
+    # Wait for in-flight scoring before reporting the run as complete
+    scorer.shutdown()
+    logger.info(f"Bedrock usage for this run: {usage_stats.report()}")
+    logger.info(f"Bedrock gateway: {gateway.stats()}")
+    logger.info(f"Verdict cache: {verdict_cache.stats()}")
+    logger.info(f"Lexical prefilter: {prefilter.report()}")
+    logger.info(f"Duplicate detection: {dedup.report()}")
+    progress.finish()
 
 # Main scraping function
 def scrape_jobs():
@@ -123,14 +229,25 @@ def scrape_jobs():
     )
 
     # Get the latest resume
-    global resume
+    global resume, resume_key, prefilter, match_scorer
     resume = get_latest_resume()
     if not resume:
         logger.error("Could not load resume, skipping job scraping")
         return
 
+    prefilter = LexicalPrefilter(resume['output'])
+    match_scorer = MatchScorer(resume['output'])
+
+    # Verdicts scored against an older resume no longer apply
+    resume_key = resume_hash(resume['output'])
+    verdict_cache.invalidate_other_resumes(resume_key)
+    # Decided per item rather than from the local verdict cache, which may be
+    # empty, evicted or on another machine when the resume changed
+    rescore_jobs(table, resume['output'], resume_key)
+
     # Add event listeners
     scraper.on(Events.DATA, on_data)
+    scraper.on(Events.METRICS, on_metrics)
     scraper.on(Events.END, on_end)
 
     # Get search queries from resume data
@@ -154,8 +271,15 @@ def scrape_jobs():
     for query in queries:
         logger.info(f"Query: {query.query}, Locations: {query.options.locations}")
 
+    # One METRICS event is emitted per query location
+    progress.reset(queries_total=sum(len(query.options.locations) for query in queries))
+
     # Run the scraper
-    scraper.run(queries)
+    try:
+        scraper.run(queries)
+    except Exception:
+        progress.finish("failed")
+        raise
 
 if __name__ == "__main__":
     scrape_jobs()
\ No newline at end of file
@@ -1,13 +1,17 @@
 import logging
 import json
 import os
+import sys
 from datetime import datetime, timedelta
 import re
 from linkedin_jobs_scraper import LinkedinScraper
 from linkedin_jobs_scraper.events import Events, EventData, EventMetrics
 from linkedin_jobs_scraper.query import Query, QueryOptions, QueryFilters
-from job_transformer import transform_job_data
+from job_transformer import transform_job_data, embed_jobs, classification_cache
 from opensearch_client import OpenSearchClient
+from bedrock_gateway import gateway
+from job_dedup import DuplicateDetector, variant_summary
+from ingest_pipeline import StreamingPipeline
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -22,14 +26,14 @@ OPENSEARCH_HOST = 'search-jobs-search-zl6crmr4fd77xvf75tji65sxxe.us-west-2.es.am
 INDEX_NAME = 'jobs'
 opensearch_client = OpenSearchClient(OPENSEARCH_HOST)
 
-# Create index if it doesn't exist
+# Create the alias and its first versioned index if they don't exist
 try:
-    opensearch_client.create_index(INDEX_NAME)
+    opensearch_client.ensure_index(INDEX_NAME)
 except Exception as e:
     logger.error(f"Error creating index: {str(e)}")
 
-# List to store all job data
-jobs_data = []
+dedup = DuplicateDetector()
+pipeline = None
 
 def parse_relative_time(time_str):
     """Convert relative time string to actual datetime"""
@@ -76,25 +80,65 @@ def on_data(data: EventData):
         "company_img_link": data.company_img_link,
         "link": data.link
     }
-    
-    # Transform the job data
-    transformed_job = transform_job_data(raw_job_data)
-    if transformed_job:
-        jobs_data.append(transformed_job)
-        logger.info(f"[ON_DATA] {data.title} | {data.company} | {data.place} | {actual_date.isoformat()}")
 
-# Callback for when scraping is done
-def on_end():
-    if jobs_data:
+    # Reposts are attached to the first copy instead of being classified and indexed again
+    rep_id, verdict = dedup.assign(raw_job_data)
+    if rep_id != raw_job_data['job_id']:
+        if verdict is not None:
+            # The first copy is already on its way to the index, so append to it there
+            pipeline.submit_transformed({"variant_of": rep_id, "variant": variant_summary(raw_job_data)})
+        return
+
+    # Blocks while transformation or indexing is behind
+    pipeline.submit(raw_job_data)
+    logger.info(f"[ON_DATA] {data.title} | {data.company} | {data.place} | {actual_date.isoformat()}")
+
+def transform_representative(raw_job_data):
+    """Pipeline transform; a representative that cannot be indexed hands its cluster to the next waiting copy"""
+    job = raw_job_data
+    while job is not None:
         try:
-            # Bulk index all jobs
-            opensearch_client.bulk_index_jobs(INDEX_NAME, jobs_data)
-            logger.info(f"Successfully indexed {len(jobs_data)} jobs")
+            transformed = transform_job_data(job)
         except Exception as e:
-            logger.error(f"Error indexing jobs: {str(e)}")
+            logger.error(f"Error transforming job {job.get('job_id', 'UNKNOWN')}: {str(e)}")
+            transformed = None
+        if transformed is not None:
+            return transformed
+        job = dedup.promote_next(job['job_id'])
+        if job is not None:
+            logger.info(f"Promoted duplicate {job['job_id']} to stand in for {raw_job_data['job_id']}")
+    return None
+
+def index_batch(batch):
+    """Pipeline sink: index new jobs and append late-arriving variants"""
+    jobs = [item for item in batch if 'variant_of' not in item]
+    late_variants = [item for item in batch if 'variant_of' in item]
+    if jobs:
+        for job in jobs:
+            # Variants seen from here on are sent as updates through the pipeline
+            job['variants'] = [variant_summary(v) for v in dedup.resolve(job['job_id'], {"indexed": True})]
+        embed_jobs(jobs)
+        # One refresh at the end of the run instead of one per flush
+        opensearch_client.bulk_index_jobs(INDEX_NAME, jobs, refresh=False)
+    if late_variants:
+        opensearch_client.append_variants(INDEX_NAME, late_variants)
+
+# Callback for when scraping is done
+def on_end():
+    logger.info(f"Ingest pipeline: {pipeline.close()}")
+    try:
+        opensearch_client.refresh(INDEX_NAME)
+    except Exception as e:
+        logger.error(f"Error refreshing index: {str(e)}")
+    logger.info(f"Bedrock gateway: {gateway.stats()}")
+    logger.info(f"Classification cache: {classification_cache.stats()}")
+    logger.info(f"Duplicate detection: {dedup.report()}")
 
 # Main scraping function
 def scrape_jobs():
+    global pipeline
+    pipeline = StreamingPipeline(transform_representative, index_batch)
+
     scraper = LinkedinScraper(
         headless=True,
         max_workers=1,
@@ -120,4 +164,8 @@ def scrape_jobs():
     scraper.run(queries)
 
 if __name__ == "__main__":
-    scrape_jobs()
\ No newline at end of file
+    if len(sys.argv) > 2 and sys.argv[1] == 'reindex':
+        # Usage: python scraper.py reindex <version> [--delete-old]
+        opensearch_client.reindex_to_version(INDEX_NAME, int(sys.argv[2]), delete_old='--delete-old' in sys.argv)
+    else:
+        scrape_jobs()
\ No newline at end of file
@@ -0,0 +1,66 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Everything a result list needs; descriptions and embeddings stay on the server
+SUMMARY_FIELDS = [
+    'job_id', 'title', 'company', 'location', 'posted_date', 'job_type', 'exp_level',
+    'industry', 'link', 'company_link', 'company_img_link'
+]
+
+KEYWORD_FILTERS = ('company', 'location', 'job_type', 'exp_level', 'industry')
+
+
+@dataclass
+class JobQuery:
+    """Typed filters over the mapped job fields, rendered to an OpenSearch request body"""
+    text: Optional[str] = None
+    company: List[str] = field(default_factory=list)
+    location: List[str] = field(default_factory=list)
+    job_type: List[str] = field(default_factory=list)
+    exp_level: List[str] = field(default_factory=list)
+    industry: List[str] = field(default_factory=list)
+    posted_from: Optional[str] = None  # ISO date, inclusive
+    posted_to: Optional[str] = None  # ISO date, inclusive
+    source_fields: Optional[List[str]] = field(default_factory=lambda: list(SUMMARY_FIELDS))
+    page_size: int = 50
+    newest_first: bool = True
+
+    def query(self) -> Dict[str, Any]:
+        filters: List[Dict[str, Any]] = []
+        for name in KEYWORD_FILTERS:
+            values = getattr(self, name)
+            if values:
+                filters.append({"terms": {name: list(values)}})
+        if self.posted_from or self.posted_to:
+            date_range = {}
+            if self.posted_from:
+                date_range["gte"] = self.posted_from
+            if self.posted_to:
+                date_range["lte"] = self.posted_to
+            filters.append({"range": {"posted_date": date_range}})
+
+        must = []
+        if self.text:
+            must.append({"multi_match": {"query": self.text, "fields": ["title^2", "description"]}})
+        if not filters and not must:
+            return {"match_all": {}}
+        # Filters are cached and unscored; only the free text contributes to relevance
+        return {"bool": {"filter": filters, "must": must}}
+
+    def sort(self) -> List[Dict[str, Any]]:
+        # job_id breaks ties so search_after never skips or repeats a document
+        order = "desc" if self.newest_first else "asc"
+        return [{"posted_date": {"order": order}}, {"job_id": {"order": "asc"}}]
+
+    def to_body(self, search_after: Optional[List[Any]] = None) -> Dict[str, Any]:
+        body: Dict[str, Any] = {
+            "query": self.query(),
+            "sort": self.sort(),
+            "size": self.page_size,
+            "track_total_hits": search_after is None
+        }
+        if self.source_fields is not None:
+            body["_source"] = self.source_fields
+        if search_after is not None:
+            body["search_after"] = search_after
+        return body
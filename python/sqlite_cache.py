@@ -0,0 +1,124 @@
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+EVICTION_CHECK_EVERY = 100  # puts between size checks
+EVICTION_TARGET = 0.9  # evict down to this fraction of max_entries
+BUSY_TIMEOUT_SECONDS = 30  # how long a writer waits on another process's lock
+
+EVICTION_ORDER = {'lru': 'last_used', 'fifo': 'created_at'}
+
+
+def normalize_text(value: Any) -> str:
+    return re.sub(r'\s+', ' ', str(value or '')).strip().lower()
+
+
+class SQLiteStore:
+    """Bounded key -> JSON table in a SQLite file, shared by the persistent caches.
+
+    WAL mode lets several scraper processes read and write the same file and
+    the busy timeout makes concurrent writers wait instead of failing. Once the
+    table grows past max_entries it is trimmed by last use (lru) or by
+    insertion order (fifo). extra_columns are stored alongside each entry so
+    callers can delete by them.
+    """
+
+    def __init__(self, path: str, table: str, value_column: str, max_entries: int,
+                 eviction: str = 'lru', extra_columns=()):
+        if eviction not in EVICTION_ORDER:
+            raise ValueError(f"Unknown eviction policy: {eviction}")
+        self.path = path
+        self.table = table
+        self.value_column = value_column
+        self.max_entries = max_entries
+        self.eviction = eviction
+        self.extra_columns = tuple(extra_columns)
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS,
+                                     check_same_thread=False, isolation_level=None)
+        self._conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_SECONDS * 1000}')
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        extra = ''.join(f' {column} TEXT NOT NULL,' for column in self.extra_columns)
+        self._conn.execute(
+            f'CREATE TABLE IF NOT EXISTS {table} ('
+            f' key TEXT PRIMARY KEY,{extra}'
+            f' {value_column} TEXT NOT NULL,'
+            f' created_at REAL NOT NULL DEFAULT 0,'
+            f' last_used REAL NOT NULL)'
+        )
+        # Files written before created_at existed only lack that column
+        columns = {row[1] for row in self._conn.execute(f'PRAGMA table_info({table})')}
+        if 'created_at' not in columns:
+            self._conn.execute(f'ALTER TABLE {table} ADD COLUMN created_at REAL NOT NULL DEFAULT 0')
+        for column in ('last_used', 'created_at') + self.extra_columns:
+            self._conn.execute(f'CREATE INDEX IF NOT EXISTS {table}_{column} ON {table} ({column})')
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT {self.value_column} FROM {self.table} WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if self.eviction == 'lru':
+                self._conn.execute(f'UPDATE {self.table} SET last_used = ? WHERE key = ?', (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any, **extra: str) -> None:
+        columns = ('key',) + self.extra_columns + (self.value_column, 'created_at', 'last_used')
+        now = time.time()
+        values = (key,) + tuple(extra[column] for column in self.extra_columns) + (json.dumps(value), now, now)
+        with self._lock:
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} ({", ".join(columns)}) '
+                f'VALUES ({", ".join("?" * len(columns))})',
+                values
+            )
+            self._puts += 1
+            if self._puts % EVICTION_CHECK_EVERY == 0:
+                self._evict_locked()
+
+    def delete_where(self, condition: str, params=()) -> int:
+        """Delete entries matching a WHERE clause over the extra columns; returns how many"""
+        with self._lock:
+            return self._conn.execute(f'DELETE FROM {self.table} WHERE {condition}', params).rowcount
+
+    def _evict_locked(self) -> None:
+        count = self._conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+        if count <= self.max_entries:
+            return
+        excess = count - int(self.max_entries * EVICTION_TARGET)
+        column = EVICTION_ORDER[self.eviction]
+        self._conn.execute(
+            f'DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} ORDER BY {column} LIMIT ?)',
+            (excess,)
+        )
+        logger.info(f"Evicted {excess} entries from {self.table} ({self.eviction})")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
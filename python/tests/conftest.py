@@ -0,0 +1,43 @@
+import os
+import sys
+import threading
+import time
+
+from botocore.exceptions import ClientError
+
+# The pipeline modules import each other as top-level modules from python/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def throttling_error():
+    return ClientError({'Error': {'Code': 'ThrottlingException', 'Message': 'Rate exceeded'}}, 'InvokeModel')
+
+
+class FakeBedrock:
+    """Stand-in for a Bedrock invoke that takes `latency` seconds per call and
+    throttles any call made while `capacity` others are already in flight.
+    """
+
+    def __init__(self, capacity, latency=0.005):
+        self.capacity = capacity
+        self.latency = latency
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, payload):
+        with self._lock:
+            self.calls += 1
+            if self.in_flight >= self.capacity:
+                self.throttled += 1
+                raise throttling_error()
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            return payload
+        finally:
+            with self._lock:
+                self.in_flight -= 1
@@ -0,0 +1,182 @@
+import threading
+
+import pytest
+
+from concurrent_scoring import FAILED_VERDICT, ConcurrentScorer
+from conftest import FakeBedrock
+
+
+def make_jobs(count):
+    return [{'job_id': f'job-{i:03d}'} for i in range(count)]
+
+
+def score_with(bedrock, broken=()):
+    def score(job, resume):
+        if job['job_id'] in broken:
+            raise ValueError('malformed verdict')
+        bedrock.invoke(job)
+        return {'keep': True, 'match_percentage': 80, 'job_id': job['job_id']}
+    return score
+
+
+class Collector:
+    """Callback that records every delivered verdict, by job id"""
+
+    def __init__(self, limiter=None):
+        self.verdicts = {}
+        self.deliveries = 0
+        self.limits = []
+        self.limiter = limiter
+        self._lock = threading.Lock()
+
+    def __call__(self, job, verdict):
+        with self._lock:
+            self.deliveries += 1
+            self.verdicts[job['job_id']] = verdict
+            if self.limiter:
+                self.limits.append(self.limiter.limit)
+
+
+@pytest.fixture
+def scorers():
+    created = []
+
+    def build(*args, **kwargs):
+        kwargs.setdefault('retry_delay', 0.001)
+        scorer = ConcurrentScorer(*args, **kwargs)
+        created.append(scorer)
+        return scorer
+
+    yield build
+    for scorer in created:
+        scorer.shutdown()
+
+
+def test_limit_backs_off_under_throttling_and_recovers(scorers):
+    bedrock = FakeBedrock(capacity=2)
+    scorer = scorers(score_with(bedrock), max_concurrency=8, initial_concurrency=8, max_retries=50)
+    collector = Collector(scorer.limiter)
+
+    for job in make_jobs(60):
+        scorer.submit(job, {}, collector)
+    scorer.drain()
+
+    assert bedrock.throttled > 0
+    assert scorer.stats['throttled'] == bedrock.throttled
+    # Halved at least once on the way down from the ceiling
+    assert min(collector.limits) <= 4
+    assert scorer.limiter.limit < 8
+
+    # Capacity comes back: additive increase climbs to the ceiling again
+    bedrock.capacity = 100
+    throttled = bedrock.throttled
+    for job in make_jobs(200):
+        scorer.submit(job, {}, collector)
+    scorer.drain()
+
+    assert bedrock.throttled == throttled
+    assert scorer.limiter.limit == 8
+    assert bedrock.peak > 2
+    assert all(not verdict.get('scoring_failed') for verdict in collector.verdicts.values())
+
+
+def test_every_submitted_job_reaches_its_callback(scorers):
+    bedrock = FakeBedrock(capacity=6)
+    broken = {'job-007', 'job-042'}
+    scorer = scorers(score_with(bedrock, broken), max_concurrency=6, initial_concurrency=6, max_retries=3)
+    collector = Collector()
+
+    def callback(job, verdict):
+        collector(job, verdict)
+        if job['job_id'] == 'job-013':
+            raise RuntimeError('store failed')
+
+    for job in make_jobs(100):
+        scorer.submit(job, {}, callback)
+    scorer.drain()
+
+    assert collector.deliveries == 100
+    assert set(collector.verdicts) == {job['job_id'] for job in make_jobs(100)}
+    for job_id in broken:
+        assert collector.verdicts[job_id] == FAILED_VERDICT
+    assert scorer.stats['submitted'] == 100
+    assert scorer.stats['scored'] == 98
+
+
+def test_exhausted_throttling_delivers_a_failed_verdict(scorers):
+    bedrock = FakeBedrock(capacity=0)
+    scorer = scorers(score_with(bedrock), max_retries=3)
+    collector = Collector()
+
+    scorer.submit({'job_id': 'job-000'}, {}, collector)
+    scorer.drain()
+
+    assert collector.verdicts == {'job-000': FAILED_VERDICT}
+    assert bedrock.calls == 3
+    assert scorer.limiter.limit == 1
+
+
+def test_batch_falls_back_to_single_calls_for_missing_verdicts(scorers):
+    bedrock = FakeBedrock(capacity=2)
+    batches, singles = [], []
+
+    def score_batch(jobs, resume):
+        batches.append([job['job_id'] for job in jobs])
+        bedrock.invoke(jobs)
+        # The model answers for all but the last job of each batch
+        return {job['job_id']: {'keep': True, 'match_percentage': 70} for job in jobs[:-1]}
+
+    def score(job, resume):
+        singles.append(job['job_id'])
+        bedrock.invoke(job)
+        return {'keep': False, 'match_percentage': 10}
+
+    scorer = scorers(score, batch_fn=score_batch, batch_size=4, max_concurrency=4,
+                     initial_concurrency=4, max_retries=50)
+    collector = Collector()
+    resume = {}
+    for job in make_jobs(10):
+        scorer.submit(job, resume, collector)
+    scorer.drain()
+
+    # Throttled batches are retried whole, so count each distinct batch once
+    answered = {tuple(batch) for batch in batches}
+    assert sorted(len(batch) for batch in answered) == [2, 4, 4]
+    assert set(singles) == {batch[-1] for batch in answered}
+    assert collector.deliveries == 10
+    assert sum(verdict['keep'] for verdict in collector.verdicts.values()) == 7
+
+
+def test_failed_batch_scores_each_job_on_its_own(scorers):
+    def score_batch(jobs, resume):
+        raise ValueError('unparseable batch reply')
+
+    scorer = scorers(lambda job, resume: {'keep': True, 'match_percentage': 90},
+                     batch_fn=score_batch, batch_size=5, max_retries=2)
+    collector = Collector()
+    resume = {}
+    for job in make_jobs(5):
+        scorer.submit(job, resume, collector)
+    scorer.drain()
+
+    assert {verdict['match_percentage'] for verdict in collector.verdicts.values()} == {90}
+    assert scorer.stats['errors'] == 2
+    assert collector.deliveries == 5
+
+
+def test_new_resume_flushes_the_open_batch(scorers):
+    batches = []
+
+    def score_batch(jobs, resume):
+        batches.append((resume['name'], [job['job_id'] for job in jobs]))
+        return {job['job_id']: {'keep': True, 'match_percentage': 50} for job in jobs}
+
+    scorer = scorers(lambda job, resume: {}, batch_fn=score_batch, batch_size=10)
+    first, second = {'name': 'first'}, {'name': 'second'}
+    jobs = make_jobs(3)
+    scorer.submit(jobs[0], first)
+    scorer.submit(jobs[1], first)
+    scorer.submit(jobs[2], second)
+    scorer.drain()
+
+    assert sorted(batches) == [('first', ['job-000', 'job-001']), ('second', ['job-002'])]
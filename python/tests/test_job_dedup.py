@@ -0,0 +1,55 @@
+from job_dedup import DuplicateDetector
+
+DESCRIPTION = 'Build and operate distributed backend services in Python on Kubernetes with a small team'
+
+
+def posting(job_id, place='Remote'):
+    return {'job_id': job_id, 'title': 'Backend Engineer', 'company': 'Acme', 'place': place,
+            'description': DESCRIPTION}
+
+
+def test_duplicates_wait_for_the_verdict_then_share_it():
+    dedup = DuplicateDetector()
+    assert dedup.assign(posting('a')) == ('a', None)
+    assert dedup.assign(posting('b', 'Austin')) == ('a', None)
+
+    verdict = {'keep': True, 'match_percentage': 80}
+    assert [job['job_id'] for job in dedup.resolve('a', verdict)] == ['b']
+    assert dedup.assign(posting('c', 'Boston')) == ('a', verdict)
+
+    report = dedup.report()
+    assert report['clusters'] == 1
+    assert report['duplicates'] == 2
+
+
+def test_resolved_clusters_hold_no_jobs():
+    dedup = DuplicateDetector()
+    dedup.assign(posting('a'))
+    dedup.resolve('a', {'keep': False, 'match_percentage': 0})
+    for i in range(100):
+        dedup.assign(posting(f'copy-{i}'))
+
+    assert not any(dedup._pending.values())
+
+
+def test_failed_representative_promotes_the_next_waiting_duplicate():
+    dedup = DuplicateDetector()
+    dedup.assign(posting('a'))
+    dedup.assign(posting('b'))
+    dedup.assign(posting('c'))
+
+    promoted = dedup.promote_next('a')
+    assert promoted['job_id'] == 'b'
+    # Later copies join the promoted representative
+    assert dedup.assign(posting('d')) == ('b', None)
+    assert [job['job_id'] for job in dedup.resolve('b', {'keep': True})] == ['c', 'd']
+    assert dedup.report()['duplicates'] == 2
+
+
+def test_cluster_without_waiting_duplicates_is_dissolved():
+    dedup = DuplicateDetector()
+    dedup.assign(posting('a'))
+
+    assert dedup.promote_next('a') is None
+    assert dedup.assign(posting('b')) == ('b', None)
+    assert dedup.report()['clusters'] == 1
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+import job_llm
+from concurrent_scoring import FAILED_VERDICT, ConcurrentScorer
+
+
+@pytest.fixture
+def reply(monkeypatch):
+    """Set the text the keep/reject model answers with"""
+    replies = []
+    monkeypatch.setattr(job_llm, 'invoke_claude', lambda prompt, max_tokens, client=None: (replies[-1], {}))
+    return replies.append
+
+
+@pytest.mark.parametrize('content', [
+    'I cannot decide on this one.',
+    '',
+    '{"keep": "maybe"}',
+    '{"keep": true, "match_percentage": 80',
+])
+def test_unusable_reply_raises(reply, content):
+    reply(content)
+    with pytest.raises(ValueError):
+        job_llm.request_verdict({'job_id': 'job-1'}, {})
+
+
+def test_valid_reply_is_normalized(reply):
+    reply('Sure: ' + json.dumps({'keep': False, 'match_percentage': 12.6}))
+    assert job_llm.request_verdict({'job_id': 'job-1'}, {}) == {'keep': False, 'match_percentage': 13}
+
+
+def test_reply_without_json_is_retried_then_flagged(reply):
+    reply('No JSON here')
+    verdicts = []
+    scorer = ConcurrentScorer(job_llm.request_verdict, max_retries=2, retry_delay=0.001)
+    scorer.submit({'job_id': 'job-1'}, {}, lambda job, verdict: verdicts.append(verdict))
+    scorer.shutdown()
+
+    assert verdicts == [FAILED_VERDICT]
+    assert scorer.stats['errors'] == 2
@@ -0,0 +1,54 @@
+import pytest
+
+import job_rules
+from job_rules import classify_with_rules
+
+
+def details(title, description=''):
+    return classify_with_rules(description, title).details
+
+
+@pytest.mark.parametrize('title, field, label', [
+    ('Senior-Level Software-Engineer', 'exp_level', 'SENIOR'),
+    ('Senior-Level Software-Engineer', 'industry', 'TECH'),
+    ('Data-Driven Growth Marketer', 'industry', 'TECH'),
+    ('Cloud-Native Platform Lead', 'industry', 'TECH'),
+    ('Entry-Level Bank Teller', 'exp_level', 'ENTRY'),
+    ('Mid-Level Nurse', 'exp_level', 'MID'),
+    ('Full-Time Retail Associate', 'job_type', 'FULL_TIME'),
+])
+def test_hyphens_separate_words(title, field, label):
+    assert details(title)[field] == label
+
+
+def test_hyphenated_keywords_match_whole():
+    assert details('Program Manager', 'A non-profit serving families')['industry'] == 'SOCIAL'
+    # Longest keyword first: the whole phrase counts as CONTRACT, not a stray 'contract' plus 'hire'
+    result = classify_with_rules('', 'Analyst (contract-to-hire)')
+    assert result.details['job_type'] == 'CONTRACT'
+    assert result.confidence['job_type'] == 1.0
+
+
+@pytest.mark.parametrize('title, description', [
+    ('Office Manager', 'Keep it tidy and submit it weekly'),
+    ('PR Coordinator', 'Write PR pitches for our clients'),
+    ('Internal Auditor', 'Review internal controls'),
+])
+def test_short_and_partial_words_do_not_misfire(title, description):
+    result = details(title, description)
+    assert result['industry'] != 'TECH'
+    assert result['job_type'] != 'INTERNSHIP'
+    assert result['exp_level'] != 'ENTRY'
+
+
+def test_medical_staff_is_not_a_seniority_signal():
+    assert details('Medical Staff Coordinator', 'Support our medical staff')['exp_level'] == 'UNKNOWN'
+
+
+def test_labeled_fixture_benchmark_runs_without_bedrock():
+    samples = job_rules.load_labeled()
+    report = job_rules.benchmark(samples, llm=False)
+
+    assert report['samples'] == len(samples) >= 10
+    assert report['rules_accuracy'] >= 0.9
+    assert 'llm_accuracy' not in report
@@ -0,0 +1,70 @@
+import pytest
+
+from lexical_prefilter import LexicalPrefilter
+
+RESUME = {'skills': ['Python', 'Kubernetes', 'PostgreSQL'], 'summary': 'Backend engineer building data pipelines'}
+
+
+def job(title, description=''):
+    return {'title': title, 'description': description}
+
+
+def warmed_up(threshold, min_docs=3, margin=0.02):
+    prefilter = LexicalPrefilter(RESUME, threshold=threshold, margin=margin, min_docs=min_docs)
+    for i in range(min_docs):
+        prefilter.score(job(f'Filler posting {i}', 'unrelated words only'))
+    return prefilter
+
+
+def test_score_orders_overlap_with_the_resume():
+    prefilter = LexicalPrefilter(RESUME)
+    same = prefilter.score(job('Backend engineer', 'Python Kubernetes PostgreSQL building data pipelines'))
+    partial = prefilter.score(job('Backend engineer', 'Java and Oracle'))
+    disjoint = prefilter.score(job('Pastry chef', 'Laminated dough and croissants'))
+
+    assert same == pytest.approx(1.0, abs=0.05)
+    assert 0 < partial < same
+    assert disjoint == 0.0
+
+
+def test_stop_words_and_empty_jobs_score_zero():
+    prefilter = LexicalPrefilter(RESUME)
+    assert prefilter.score(job('The', 'and of with the for')) == 0.0
+    assert prefilter.score({}) == 0.0
+
+
+def test_rejection_is_off_by_default():
+    prefilter = LexicalPrefilter(RESUME, min_docs=0)
+    assert prefilter.threshold == 0
+    assert not prefilter.rejects(0.0)
+    assert prefilter.report()['rejected'] == 0
+
+
+@pytest.mark.parametrize('score, rejected', [
+    (0.0, True),
+    (0.0999, True),
+    (0.1, False),
+    (0.5, False),
+])
+def test_reject_boundary(score, rejected):
+    assert warmed_up(threshold=0.1).rejects(score) is rejected
+
+
+def test_nothing_is_rejected_before_warm_up():
+    prefilter = LexicalPrefilter(RESUME, threshold=0.1, min_docs=3)
+    prefilter.score(job('Pastry chef'))
+    assert not prefilter.rejects(0.0)
+    prefilter.score(job('Pastry chef'))
+    prefilter.score(job('Pastry chef'))
+    assert prefilter.rejects(0.0)
+
+
+def test_report_counts_rejections_and_near_misses():
+    prefilter = warmed_up(threshold=0.1, margin=0.02)
+    for score in (0.0, 0.09, 0.11, 0.5):
+        prefilter.rejects(score)
+
+    report = prefilter.report()
+    assert report['seen'] == 4
+    assert report['rejected'] == report['llm_calls_avoided'] == 2
+    assert report['near_threshold'] == 2
@@ -0,0 +1,70 @@
+from botocore.exceptions import ClientError
+
+from match_scoring import rescore_jobs
+
+
+class ScoreTable:
+    """Jobs table stand-in for rescore_jobs: the scan applies its resume-hash filter"""
+
+    def __init__(self, items):
+        self.items = {item['job_id']: dict(item) for item in items}
+        self.updates = []
+
+    def scan(self, ProjectionExpression, FilterExpression, ExpressionAttributeNames,
+             ExpressionAttributeValues, ExclusiveStartKey=None):
+        current = ExpressionAttributeValues[':resume_hash']
+        stale = [{'job_id': item['job_id'], 'title': item['title'], 'description': item['description']}
+                 for item in self.items.values() if item.get('vector_resume_hash') != current]
+        return {'Items': stale}
+
+    def update_item(self, Key, UpdateExpression, ConditionExpression, ExpressionAttributeValues):
+        self.updates.append(Key['job_id'])
+        item = self.items.get(Key['job_id'])
+        if item is None:
+            raise ClientError({'Error': {'Code': 'ConditionalCheckFailedException', 'Message': ''}}, 'UpdateItem')
+        item['vector_match_percentage'] = ExpressionAttributeValues[':score']
+        item['vector_resume_hash'] = ExpressionAttributeValues[':resume_hash']
+
+
+RESUME = {'skills': ['Python', 'Kubernetes'], 'summary': 'Backend engineer'}
+
+
+def make_items():
+    return [
+        {'job_id': 'fresh', 'title': 'Backend engineer', 'description': 'Python and Kubernetes',
+         'vector_match_percentage': 3, 'vector_resume_hash': 'new'},
+        {'job_id': 'old', 'title': 'Backend engineer', 'description': 'Python and Kubernetes',
+         'vector_match_percentage': 3, 'vector_resume_hash': 'old'},
+        {'job_id': 'legacy', 'title': 'Pastry chef', 'description': 'Croissants'},
+    ]
+
+
+def test_rescores_only_jobs_scored_against_another_resume():
+    table = ScoreTable(make_items())
+
+    assert rescore_jobs(table, RESUME, 'new') == 2
+
+    assert sorted(table.updates) == ['legacy', 'old']
+    assert table.items['fresh']['vector_match_percentage'] == 3
+    assert table.items['old']['vector_match_percentage'] > 3
+    assert table.items['legacy']['vector_resume_hash'] == 'new'
+
+    # A second run with the same resume has nothing to do
+    table.updates.clear()
+    assert rescore_jobs(table, RESUME, 'new') == 0
+    assert table.updates == []
+
+
+def test_jobs_removed_during_the_rescore_are_not_recreated():
+    table = ScoreTable(make_items())
+    scan = table.scan
+
+    def scan_then_delete(**kwargs):
+        response = scan(**kwargs)
+        del table.items['old']
+        return response
+
+    table.scan = scan_then_delete
+
+    assert rescore_jobs(table, RESUME, 'new') == 1
+    assert 'old' not in table.items
@@ -0,0 +1,90 @@
+import pytest
+
+import job_transformer
+from job_transformer import transform_job_data
+from opensearch_client import OpenSearchClient
+from search_query import JobQuery
+
+
+class FakeOpenSearch:
+    """Serves sorted pages of `docs` for a point in time, rotating the PIT id per page"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = []
+        self.open_pits = set()
+
+    def create_pit(self, index, keep_alive):
+        self.calls.append(('create_pit', index))
+        self.open_pits.add('pit-0')
+        return {'pit_id': 'pit-0'}
+
+    def delete_pit(self, body):
+        self.calls.append(('delete_pit', body['pit_id']))
+        self.open_pits.difference_update(body['pit_id'])
+
+    def search(self, body, index=None, **kwargs):
+        self.calls.append(('search', index, tuple(kwargs)))
+        pit_id = body['pit']['id'] if 'pit' in body else None
+        start = 0
+        if body.get('search_after'):
+            start = next(i for i, doc in enumerate(self.docs) if doc['job_id'] == body['search_after'][1]) + 1
+        page = self.docs[start:start + body['size']]
+        response = {'hits': {'hits': [{'_source': doc, 'sort': [doc['posted_date'], doc['job_id']]} for doc in page]}}
+        if pit_id:
+            response['pit_id'] = f"pit-{int(pit_id.split('-')[1]) + 1}"
+            self.open_pits = {response['pit_id']}
+        return response
+
+
+@pytest.fixture
+def opensearch(monkeypatch):
+    docs = [{'job_id': f'job-{i:02d}', 'posted_date': '2024-01-01'} for i in range(7)]
+    fake = FakeOpenSearch(docs)
+    monkeypatch.setattr(OpenSearchClient, '_create_client', lambda self: fake)
+    return OpenSearchClient('search.example.com'), fake
+
+
+def test_iter_jobs_pages_over_a_pit_and_closes_it(opensearch):
+    client, fake = opensearch
+
+    jobs = list(client.iter_jobs('jobs', JobQuery(page_size=3)))
+
+    assert [job['job_id'] for job in jobs] == [f'job-{i:02d}' for i in range(7)]
+    assert fake.calls[0] == ('create_pit', 'jobs')
+    # The latest PIT id is the one deleted, and nothing is left open
+    assert fake.calls[-1] == ('delete_pit', ['pit-3'])
+    assert not fake.open_pits
+
+
+def test_abandoned_iteration_still_closes_the_pit(opensearch):
+    client, fake = opensearch
+
+    jobs = client.iter_jobs('jobs', JobQuery(page_size=3))
+    next(jobs)
+    jobs.close()
+
+    assert fake.calls[-1][0] == 'delete_pit'
+    assert not fake.open_pits
+
+
+def test_search_jobs_takes_the_page_size_from_the_query(opensearch):
+    client, fake = opensearch
+
+    response = client.search_jobs('jobs', JobQuery(page_size=5))
+
+    assert len(response['hits']['hits']) == 5
+    # No size argument overriding the body's
+    assert fake.calls == [('search', 'jobs', ())]
+
+
+def test_transformed_job_carries_every_keyword_filter_field(monkeypatch):
+    monkeypatch.setattr(job_transformer, 'infer_job_details',
+                        lambda description, title: {'job_type': 'FULL_TIME', 'exp_level': 'SENIOR',
+                                                    'industry': 'TECH'})
+    item = transform_job_data({'job_id': 'job-1', 'title': 'Senior Engineer', 'company': 'Acme',
+                               'description': 'Build things', 'date': '2024-01-01', 'place': 'Remote'})
+
+    assert {field: item[field] for field in ('job_type', 'exp_level', 'industry')} == {
+        'job_type': 'FULL_TIME', 'exp_level': 'SENIOR', 'industry': 'TECH'}
+    assert 'search_embedding' not in item
@@ -0,0 +1,62 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from sqlite_cache import SQLiteStore, normalize_text
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+VERDICT_CACHE_PATH = os.getenv('VERDICT_CACHE_PATH', str(Path(__file__).parent / 'verdict_cache.sqlite3'))
+VERDICT_CACHE_MAX_ENTRIES = int(os.getenv('VERDICT_CACHE_MAX_ENTRIES', '50000'))
+
+# Fields that describe the posting itself; ids, dates and links change on reposts
+JOB_CONTENT_FIELDS = ('title', 'company', 'place', 'description')
+
+
+def job_content_hash(job: Dict[str, Any]) -> str:
+    content = '\x1f'.join(normalize_text(job.get(field)) for field in JOB_CONTENT_FIELDS)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def resume_hash(resume: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(resume, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class VerdictCache:
+    """Persistent keep/reject verdicts keyed on job content, resume and model.
+
+    Backed by SQLite so verdicts survive across runs; entries are evicted
+    least-recently-used once the table grows past max_entries.
+    """
+
+    def __init__(self, path: str = VERDICT_CACHE_PATH, max_entries: int = VERDICT_CACHE_MAX_ENTRIES):
+        self.store = SQLiteStore(path, 'verdicts', 'verdict', max_entries,
+                                 eviction='lru', extra_columns=('resume_hash', 'model_id'))
+
+    @staticmethod
+    def make_key(job: Dict[str, Any], resume_key: str, model_id: str) -> str:
+        return f"{job_content_hash(job)}:{resume_key}:{model_id}"
+
+    def get(self, job: Dict[str, Any], resume_key: str, model_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(self.make_key(job, resume_key, model_id))
+
+    def put(self, job: Dict[str, Any], resume_key: str, model_id: str, verdict: Dict[str, Any]) -> None:
+        self.store.put(self.make_key(job, resume_key, model_id), verdict, resume_hash=resume_key, model_id=model_id)
+
+    def invalidate_other_resumes(self, resume_key: str) -> int:
+        """Drop verdicts scored against any resume other than the current one"""
+        deleted = self.store.delete_where('resume_hash != ?', (resume_key,))
+        if deleted:
+            logger.info(f"Resume changed, invalidated {deleted} cached verdicts")
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        return self.store.stats()
+
+    def close(self) -> None:
+        self.store.close()
@@ -4,6 +4,7 @@ import { motion, PanInfo } from 'framer-motion';
 import { AnimatePresence } from 'framer-motion';
 import { HeartIcon, XMarkIcon } from '@heroicons/react/24/solid';
 import { Link } from 'react-router-dom';
+import { fetchAllPages } from '../services/jobFeed';
 
 interface Job {
   job_id: string;
@@ -48,23 +49,27 @@ const JobSwipe: React.FC = () => {
   const accumulatedDelta = useRef<number>(0);
 
   useEffect(() => {
+    // Aborted on unmount so a remount never appends the same pages twice
+    const controller = new AbortController();
     const fetchJobs = async () => {
       try {
-        const response = await fetch('http://localhost:8000/api/jobs');
-        if (!response.ok) {
-          throw new Error('Failed to fetch jobs');
-        }
-        const data = await response.json();
-        setJobs(data);
-        setHasMoreJobs(data.length > 0);
+        // Show the first page right away and append the rest as they arrive
+        await fetchAllPages<Job>('http://localhost:8000/api/jobs', page => {
+          setJobs(prev => [...prev, ...page]);
+          setIsLoading(false);
+        }, undefined, controller.signal);
         setIsLoading(false);
       } catch (err) {
+        if (controller.signal.aborted) {
+          return;
+        }
         setError(err instanceof Error ? err.message : 'An error occurred');
         setIsLoading(false);
       }
     };
 
     fetchJobs();
+    return () => controller.abort();
   }, []);
 
   useEffect(() => {
@@ -104,18 +109,19 @@ const JobSwipe: React.FC = () => {
     return locMatch && dateMatch;
   });
 
+  // Past the last loaded job the index waits at the end, so pages that are
+  // still loading pick up where the user left off
   const moveToNextJob = () => {
-    if (currentIndex < filteredJobs.length - 1) {
-      setCurrentIndex(i => i + 1);
-    } else {
-      setHasMoreJobs(false);
-    }
+    setCurrentIndex(i => i + 1);
   };
 
   useEffect(() => {
     setCurrentIndex(0);
-    setHasMoreJobs(filteredJobs.length > 0);
-  }, [locationFilter, dateFilter, filteredJobs.length]);
+  }, [locationFilter, dateFilter]);
+
+  useEffect(() => {
+    setHasMoreJobs(currentIndex < filteredJobs.length);
+  }, [currentIndex, filteredJobs.length]);
 
   const handleSwipeRight = async () => {
     setWaveColor('green');
@@ -70,28 +70,44 @@ const Profile = () => {
     });
   };
 
-  const checkJobProcessingStatus = async () => {
-    try {
-      const response = await fetch(`http://localhost:8000/api/jobs_status`);
-      const data = await response.json();
-      console.log(data);
-      
+  const checkJobProcessingStatus = () => {
+    // The backend pushes scrape progress as server-sent events
+    const events = new EventSource('http://localhost:8000/api/jobs_status/stream');
+
+    events.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+
       if (data.status === 'completed') {
+        events.close();
         setIsProcessing(false);
         setProcessingStatus('');
         navigate('/swipe');
       } else if (data.status === 'processing') {
-        setProcessingStatus(data.message || 'Processing your resume and finding matching jobs...');
-        // Check again after 5 seconds
-        setTimeout(() => checkJobProcessingStatus(), 5000);
+        setProcessingStatus(
+          data.jobs_scraped !== undefined
+            ? `Finding matching jobs... ${data.queries_done}/${data.queries_total} searches done, ` +
+              `${data.jobs_scored} of ${data.jobs_scraped} jobs scored, ${data.jobs_kept} kept`
+            : data.message || 'Processing your resume and finding matching jobs...'
+        );
       } else {
-        throw new Error('Unknown processing status');
+        events.close();
+        console.error('Job processing failed:', data);
+        setError('Failed to check job processing status. Please try again.');
+        setIsProcessing(false);
+      }
+    };
+
+    events.onerror = (err) => {
+      // While CONNECTING the browser is already retrying a dropped stream;
+      // only a CLOSED source (e.g. a non-200 response) has given up
+      if (events.readyState !== EventSource.CLOSED) {
+        console.warn('Job processing status stream interrupted, reconnecting:', err);
+        return;
       }
-    } catch (err) {
       console.error('Error checking job processing status:', err);
       setError('Failed to check job processing status. Please try again.');
       setIsProcessing(false);
-    }
+    };
   };
 
   const handleSaveProfile = async () => {
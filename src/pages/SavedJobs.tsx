@@ -3,6 +3,7 @@ import { motion } from 'framer-motion';
 import { Link } from 'react-router-dom';
 import { HeartIcon, MapPinIcon, ChartBarIcon, TrashIcon } from '@heroicons/react/24/outline';
 import Confetti from 'react-confetti';
+import { fetchAllPages } from '../services/jobFeed';
 
 interface SavedJob {
   job_id: string;
@@ -28,27 +29,31 @@ const SavedJobs = () => {
   const [confettiPosition, setConfettiPosition] = useState({ x: 0, y: 0 });
 
   useEffect(() => {
+    // Aborted on unmount so a remount never appends the same pages twice
+    const controller = new AbortController();
     const fetchSavedJobs = async () => {
       try {
-        const response = await fetch('http://localhost:8000/api/saved-jobs');
-        if (!response.ok) {
-          throw new Error('Failed to fetch saved jobs');
-        }
-        const data = await response.json();
-        // Ensure every job has a status, default to 'saved' if missing
-        const jobsWithStatus = data.map((job: any) => ({
-          ...job,
-          status: job.status || 'saved',
-        }));
-        setSavedJobs(jobsWithStatus);
+        await fetchAllPages<any>('http://localhost:8000/api/saved-jobs', page => {
+          // Ensure every job has a status, default to 'saved' if missing
+          const jobsWithStatus = page.map((job: any) => ({
+            ...job,
+            status: job.status || 'saved',
+          }));
+          setSavedJobs(prev => [...prev, ...jobsWithStatus]);
+          setIsLoading(false);
+        }, 'Failed to fetch saved jobs', controller.signal);
         setIsLoading(false);
       } catch (err) {
+        if (controller.signal.aborted) {
+          return;
+        }
         setError(err instanceof Error ? err.message : 'An error occurred');
         setIsLoading(false);
       }
     };
 
     fetchSavedJobs();
+    return () => controller.abort();
   }, []);
 
   const handleDeleteJob = async (jobId: string) => {
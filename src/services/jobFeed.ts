@@ -0,0 +1,28 @@
+const NEXT_CURSOR_HEADER = 'X-Next-Cursor';
+
+// Fetches every page of a paged list endpoint (/api/jobs, /api/saved-jobs),
+// following the X-Next-Cursor header and handing each page over as it arrives.
+export const fetchAllPages = async <T,>(
+  url: string,
+  onPage: (items: T[]) => void,
+  errorMessage = 'Failed to fetch jobs',
+  signal?: AbortSignal
+): Promise<void> => {
+  let cursor: string | null = null;
+  do {
+    const pageUrl = new URL(url);
+    if (cursor) {
+      pageUrl.searchParams.set('cursor', cursor);
+    }
+    const response = await fetch(pageUrl.toString(), { signal });
+    if (!response.ok) {
+      throw new Error(errorMessage);
+    }
+    const items: T[] = await response.json();
+    if (signal?.aborted) {
+      return;
+    }
+    onPage(items);
+    cursor = response.headers.get(NEXT_CURSOR_HEADER);
+  } while (cursor);
+};